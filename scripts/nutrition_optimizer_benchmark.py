@@ -0,0 +1,244 @@
+from dataclasses import replace
+from time import perf_counter
+
+from pulp import listSolvers
+
+from diet.nutrition_optimizer.food_catalog import get_food_catalog
+from diet.nutrition_optimizer.meal_plan_optimizer import MealPlanOptimizer
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    validate_food_names_are_unique,
+)
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+
+FOOD_COUNTS = (10, 100, 500, 1000, 2500)
+REPEAT = 3
+VALIDATION_FOOD_COUNT = 10_000
+SOLVER_NAMES = ("PULP_CBC_CMD", "HiGHS")
+THROUGHPUT_FOOD_COUNTS = (10, 100, 500)
+THROUGHPUT_SECONDS = 3.0
+MAXIMUM_INTAKE_GRAMS = 300
+MEAL_PLAN_DAYS = 7
+MEAL_PLAN_FOOD_COUNT = 200
+MEAL_PLAN_MAX_FOOD_OCCURRENCES = 3
+SWEEP_FOOD_COUNT = 500
+CATALOG_MAX_FOOD_COUNTS = (None, 10, 5, 3)
+SWEEP_ENERGY_VALUES = [1000.0 + 40 * index for index in range(50)]
+BUILD_PHASES = ("variable_setup", "objective_setup", "constraint_setup")
+
+OBJECTIVE = Objective(sense="maximize", nutrient="protein")
+CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=2000),
+    Constraint(min_max="min", nutrient="fat", unit="pfc_ratio", value=20),
+    Constraint(min_max="max", nutrient="fat", unit="pfc_ratio", value=30),
+]
+PFC_RATIO_CONSTRAINTS = [
+    Constraint(
+        min_max=min_max,
+        nutrient=nutrient,
+        unit="pfc_ratio",
+        value=value,
+    )
+    for nutrient in ("protein", "fat", "carbohydrates")
+    for min_max, value in (("min", 10), ("max", 70))
+    for _ in range(3)
+]
+MEAL_PLAN_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=13000),
+]
+SCENARIOS = {
+    "build_ms": CONSTRAINTS,
+    "pfc18_build_ms": PFC_RATIO_CONSTRAINTS,
+}
+
+
+def load_food_information() -> list[FoodInformation]:
+    return get_food_catalog().to_food_information(MAXIMUM_INTAKE_GRAMS)
+
+
+def measure_build_seconds(
+    food_information: list[FoodInformation], constraints: list[Constraint]
+) -> float:
+    best_seconds = float("inf")
+    for _ in range(REPEAT):
+        result = NutritionOptimizer(
+            food_information, OBJECTIVE, constraints
+        ).solve()
+        phase_seconds = result["solve_metrics"]["phase_seconds"]
+        best_seconds = min(
+            best_seconds,
+            sum(phase_seconds.get(phase, 0.0) for phase in BUILD_PHASES),
+        )
+    return best_seconds
+
+
+def measure_validation_seconds(food_count: int) -> float:
+    food_names = [f"food_{index}" for index in range(food_count)]
+    best_seconds = float("inf")
+    for _ in range(REPEAT):
+        started_at = perf_counter()
+        validate_food_names_are_unique(food_names)
+        best_seconds = min(best_seconds, perf_counter() - started_at)
+    return best_seconds
+
+
+def measure_solves_per_second(
+    food_information: list[FoodInformation], solver_name: str
+) -> float:
+    solve_count = 0
+    started_at = perf_counter()
+    while perf_counter() - started_at < THROUGHPUT_SECONDS:
+        NutritionOptimizer(
+            food_information,
+            OBJECTIVE,
+            CONSTRAINTS,
+            solver_name=solver_name,
+        ).solve()
+        solve_count += 1
+    return solve_count / (perf_counter() - started_at)
+
+
+def print_solver_throughput(food_information: list[FoodInformation]) -> None:
+    available_solver_names = [
+        solver_name
+        for solver_name in SOLVER_NAMES
+        if solver_name in listSolvers(onlyAvailable=True)
+    ]
+
+    print(
+        f"{'foods':>6}"
+        + "".join(f" {name + '_rps':>15}" for name in available_solver_names)
+    )
+    for food_count in THROUGHPUT_FOOD_COUNTS:
+        solves_per_second = [
+            measure_solves_per_second(
+                food_information[:food_count], solver_name
+            )
+            for solver_name in available_solver_names
+        ]
+        print(
+            f"{food_count:>6}"
+            + "".join(f" {value:>15.1f}" for value in solves_per_second)
+        )
+
+
+def measure_meal_plan_seconds(
+    food_information: list[FoodInformation],
+) -> float:
+    started_at = perf_counter()
+    MealPlanOptimizer(
+        food_information,
+        OBJECTIVE,
+        CONSTRAINTS,
+        MEAL_PLAN_CONSTRAINTS,
+        MEAL_PLAN_DAYS,
+        MEAL_PLAN_MAX_FOOD_OCCURRENCES,
+    ).solve()
+    return perf_counter() - started_at
+
+
+def measure_sweep_seconds(
+    food_information: list[FoodInformation],
+) -> tuple[float, float]:
+    started_at = perf_counter()
+    NutritionOptimizer(food_information, OBJECTIVE, CONSTRAINTS).sweep(
+        0, SWEEP_ENERGY_VALUES
+    )
+    sweep_seconds = perf_counter() - started_at
+
+    started_at = perf_counter()
+    for value in SWEEP_ENERGY_VALUES:
+        NutritionOptimizer(
+            food_information,
+            OBJECTIVE,
+            [replace(CONSTRAINTS[0], value=value), *CONSTRAINTS[1:]],
+        ).solve()
+    rebuild_seconds = perf_counter() - started_at
+
+    return sweep_seconds, rebuild_seconds
+
+
+def print_solve_metrics(result: NutritionOptimizerResult) -> None:
+    if "solve_metrics" not in result:
+        return
+
+    solve_metrics = result["solve_metrics"]
+    print(
+        "  "
+        + " ".join(
+            f"{phase}={seconds * 1000:.1f}ms"
+            for phase, seconds in solve_metrics["phase_seconds"].items()
+        )
+        + " "
+        + " ".join(
+            f"{key}={count}"
+            for key, count in solve_metrics["model_size"].items()
+        )
+    )
+
+
+def print_catalog_seconds(food_information: list[FoodInformation]) -> None:
+    for max_food_count in CATALOG_MAX_FOOD_COUNTS:
+        started_at = perf_counter()
+        result = NutritionOptimizer(
+            food_information,
+            OBJECTIVE,
+            CONSTRAINTS,
+            max_food_count=max_food_count,
+        ).solve()
+        print(
+            f"catalog ({len(food_information)} foods,"
+            f" max foods {max_food_count}):"
+            f" {perf_counter() - started_at:.2f} s"
+        )
+        print_solve_metrics(result)
+
+
+def main() -> None:
+    food_information = load_food_information()
+
+    print(f"{'foods':>6}" + "".join(f" {name:>15}" for name in SCENARIOS))
+    for food_count in FOOD_COUNTS:
+        build_milliseconds = [
+            measure_build_seconds(food_information[:food_count], constraints)
+            * 1000
+            for constraints in SCENARIOS.values()
+        ]
+        print(
+            f"{food_count:>6}"
+            + "".join(f" {value:>15.1f}" for value in build_milliseconds)
+        )
+
+    validation_seconds = measure_validation_seconds(VALIDATION_FOOD_COUNT)
+    print(
+        f"food name validation ({VALIDATION_FOOD_COUNT} foods):"
+        f" {validation_seconds * 1000:.1f} ms"
+    )
+
+    meal_plan_seconds = measure_meal_plan_seconds(
+        food_information[:MEAL_PLAN_FOOD_COUNT]
+    )
+    print(
+        f"meal plan ({MEAL_PLAN_DAYS} days x {MEAL_PLAN_FOOD_COUNT} foods):"
+        f" {meal_plan_seconds:.2f} s"
+    )
+
+    print_catalog_seconds(food_information)
+
+    sweep_seconds, rebuild_seconds = measure_sweep_seconds(
+        food_information[:SWEEP_FOOD_COUNT]
+    )
+    print(
+        f"energy sweep ({len(SWEEP_ENERGY_VALUES)} points x"
+        f" {SWEEP_FOOD_COUNT} foods): {sweep_seconds:.2f} s"
+        f" (rebuilding each point: {rebuild_seconds:.2f} s)"
+    )
+
+    print_solver_throughput(food_information)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from random import Random
+from statistics import median
+from time import perf_counter
+from typing import cast
+
+from diet.nutrition_optimizer.food_catalog import get_food_catalog
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    OptimalNutritionOptimizerResult,
+    OptimizationProblem,
+)
+from diet.nutrition_optimizer.nutrients import NUTRIENT_KEYS
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+
+SEED = 20250101
+FOOD_COUNTS = (10, 100, 500, 1000, 2500)
+CONSTRAINT_COUNTS = (0, 5, 10, 20)
+PROBLEMS_PER_SCALE = 3
+MAXIMUM_INTAKE_GRAMS_CHOICES = (100, 200, 300, 500)
+MINIMUM_INTAKE_FOOD_COUNT = 3
+ENERGY_RANGE = (1000.0, 3000.0)
+AMOUNT_RANGES = {
+    "protein": (40.0, 150.0),
+    "fat": (20.0, 90.0),
+    "carbohydrates": (100.0, 350.0),
+}
+PFC_RATIO_RANGE = (10.0, 65.0)
+BUILD_PHASES = ("variable_setup", "objective_setup", "constraint_setup")
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_MILLISECONDS = 20.0
+
+
+@dataclass(frozen=True)
+class ScaleReport:
+    food_count: int
+    constraint_count: int
+    build_milliseconds: float
+    solve_milliseconds: float
+    max_solve_milliseconds: float
+    peak_memory_mebibytes: float
+    statuses: dict[str, int]
+
+    @property
+    def key(self) -> str:
+        return f"{self.food_count}x{self.constraint_count}"
+
+
+def generate_constraint(rng: Random) -> Constraint:
+    unit = rng.choice(Constraint.UNITS)
+    min_max = rng.choice(Constraint.MIN_MAX)
+    if unit == "energy":
+        nutrient = "energy"
+        low, high = ENERGY_RANGE
+    elif unit == "amount":
+        nutrient = rng.choice(list(AMOUNT_RANGES))
+        low, high = AMOUNT_RANGES[nutrient]
+    else:
+        nutrient = rng.choice(list(AMOUNT_RANGES))
+        low, high = PFC_RATIO_RANGE
+
+    middle = (low + high) / 2
+    value = (
+        rng.uniform(low, middle)
+        if min_max == "min"
+        else rng.uniform(middle, high)
+    )
+    return Constraint(
+        min_max=min_max, nutrient=nutrient, unit=unit, value=round(value)
+    )
+
+
+def generate_food_information(
+    catalog_foods: list[FoodInformation], food_count: int, rng: Random
+) -> list[FoodInformation]:
+    food_information = []
+    for index, item in enumerate(rng.sample(catalog_foods, food_count)):
+        maximum_intake_grams = rng.choice(MAXIMUM_INTAKE_GRAMS_CHOICES)
+        minimum_intake_grams = (
+            rng.randrange(10, maximum_intake_grams // 2, 10)
+            if index < MINIMUM_INTAKE_FOOD_COUNT
+            else 0
+        )
+        food_information.append(
+            FoodInformation(
+                name=item.name,
+                energy=item.energy,
+                protein=item.protein,
+                fat=item.fat,
+                carbohydrates=item.carbohydrates,
+                minimum_intake_grams=minimum_intake_grams,
+                maximum_intake_grams=maximum_intake_grams,
+            )
+        )
+    return food_information
+
+
+def generate_problems(
+    catalog_foods: list[FoodInformation],
+    food_count: int,
+    constraint_count: int,
+) -> list[OptimizationProblem]:
+    rng = Random(f"{SEED}-{food_count}-{constraint_count}")
+    return [
+        OptimizationProblem(
+            food_information=generate_food_information(
+                catalog_foods, food_count, rng
+            ),
+            objective=Objective(
+                sense=rng.choice(Objective.SENSES),
+                nutrient=rng.choice(NUTRIENT_KEYS),
+            ),
+            constraints=[
+                generate_constraint(rng) for _ in range(constraint_count)
+            ],
+        )
+        for _ in range(PROBLEMS_PER_SCALE)
+    ]
+
+
+def measure_peak_memory_mebibytes(problem: OptimizationProblem) -> float:
+    tracemalloc.start()
+    try:
+        NutritionOptimizer(
+            problem.food_information, problem.objective, problem.constraints
+        ).solve()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_bytes / 2**20
+
+
+def get_status_label(result: NutritionOptimizerResult) -> str:
+    if result["status"] != "Optimal":
+        return result["status"]
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    if not optimal_result["is_proven_optimal"]:
+        return "NotProvenOptimal"
+    return "Optimal"
+
+
+def measure_scale(
+    catalog_foods: list[FoodInformation],
+    food_count: int,
+    constraint_count: int,
+) -> ScaleReport:
+    build_milliseconds = []
+    solve_milliseconds = []
+    statuses: Counter[str] = Counter()
+    for problem in generate_problems(
+        catalog_foods, food_count, constraint_count
+    ):
+        result = NutritionOptimizer(
+            problem.food_information, problem.objective, problem.constraints
+        ).solve()
+        phase_seconds = result["solve_metrics"]["phase_seconds"]
+        build_milliseconds.append(
+            sum(phase_seconds.get(phase, 0.0) for phase in BUILD_PHASES) * 1000
+        )
+        solve_milliseconds.append(phase_seconds["solve"] * 1000)
+        statuses[get_status_label(result)] += 1
+
+    return ScaleReport(
+        food_count=food_count,
+        constraint_count=constraint_count,
+        build_milliseconds=round(median(build_milliseconds), 1),
+        solve_milliseconds=round(median(solve_milliseconds), 1),
+        max_solve_milliseconds=round(max(solve_milliseconds), 1),
+        peak_memory_mebibytes=round(
+            max(
+                measure_peak_memory_mebibytes(problem)
+                for problem in generate_problems(
+                    catalog_foods, food_count, constraint_count
+                )
+            ),
+            2,
+        ),
+        statuses=dict(sorted(statuses.items())),
+    )
+
+
+def print_report(report: ScaleReport) -> None:
+    statuses = ",".join(
+        f"{status}:{count}" for status, count in report.statuses.items()
+    )
+    print(
+        f"{report.food_count:>6} {report.constraint_count:>11}"
+        f" {report.build_milliseconds:>10.1f}"
+        f" {report.solve_milliseconds:>10.1f}"
+        f" {report.max_solve_milliseconds:>10.1f}"
+        f" {report.peak_memory_mebibytes:>9.2f}"
+        f"  {statuses}"
+    )
+
+
+def is_slower(current: float, baseline: float) -> bool:
+    return (
+        current > baseline * REGRESSION_RATIO
+        and current - baseline > REGRESSION_MIN_MILLISECONDS
+    )
+
+
+def count_solved_problems(statuses: dict[str, int]) -> int:
+    return statuses.get("Optimal", 0) + statuses.get("NotProvenOptimal", 0)
+
+
+def find_regressions(
+    reports: list[ScaleReport], baseline_path: Path
+) -> list[str]:
+    baseline = {
+        item["key"]: item
+        for item in json.loads(baseline_path.read_text(encoding="utf-8"))
+    }
+    regressions = []
+    for report in reports:
+        baseline_report = baseline.get(report.key)
+        if baseline_report is None:
+            continue
+        for metric in ("build_milliseconds", "solve_milliseconds"):
+            if is_slower(getattr(report, metric), baseline_report[metric]):
+                regressions.append(
+                    f"{report.key} {metric}: {getattr(report, metric)}"
+                    f" (baseline {baseline_report[metric]})"
+                )
+        if count_solved_problems(report.statuses) != count_solved_problems(
+            baseline_report["statuses"]
+        ):
+            regressions.append(
+                f"{report.key} statuses: {report.statuses}"
+                f" (baseline {baseline_report['statuses']})"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(
+        description="Benchmark the nutrition optimizer on generated problems."
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    arguments = parser.parse_args()
+
+    catalog_foods = get_food_catalog().to_food_information(0)
+    print(
+        f"{'foods':>6} {'constraints':>11} {'build_ms':>10} {'solve_ms':>10}"
+        f" {'max_solve':>10} {'peak_mib':>9}  statuses"
+    )
+    reports = []
+    for food_count in FOOD_COUNTS:
+        for constraint_count in CONSTRAINT_COUNTS:
+            report = measure_scale(catalog_foods, food_count, constraint_count)
+            print_report(report)
+            reports.append(report)
+
+    if arguments.output is not None:
+        arguments.output.write_text(
+            json.dumps(
+                [{"key": report.key, **asdict(report)} for report in reports],
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    if arguments.baseline is None:
+        return 0
+
+    regressions = find_regressions(reports, arguments.baseline)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    started_at = perf_counter()
+    exit_code = main()
+    print(f"total: {perf_counter() - started_at:.1f} s")
+    sys.exit(exit_code)
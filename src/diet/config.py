@@ -65,7 +65,40 @@ class LogSettings(BaseSettings):
     log_backup: int = 3
 
 
+class NutritionOptimizerSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_prefix="NUTRITION_OPTIMIZER_",
+        extra="ignore",
+    )
+
+    result_cache_size: int = Field(default=256, ge=0)
+    result_cache_ttl_seconds: float = Field(default=600, gt=0)
+    solver_name: str = "PULP_CBC_CMD"
+    solver_threads: int | None = Field(default=None, ge=1)
+    solver_time_limit_seconds: float | None = Field(default=10, gt=0)
+    solver_relative_gap: float | None = Field(default=None, ge=0)
+    solver_message: bool = False
+    job_workers: int = Field(default=2, ge=1)
+    job_max_queue_depth: int = Field(default=32, ge=1)
+    job_result_ttl_seconds: float = Field(default=300, gt=0)
+    batch_workers: int = Field(default=2, ge=1)
+    batch_max_size: int = Field(default=100, ge=1)
+    session_max_count: int = Field(default=64, ge=0)
+    session_ttl_seconds: float = Field(default=900, gt=0)
+    meal_plan_max_days: int = Field(default=31, ge=1)
+    meal_plan_relative_gap: float | None = Field(default=0.01, ge=0)
+    sweep_max_points: int = Field(default=100, ge=2)
+    diagnose_infeasibility: bool = True
+    catalog_max_food_count: int = Field(default=30, ge=1)
+    food_count_relative_gap: float | None = Field(default=0.01, ge=0)
+    food_search_page_size: int = Field(default=50, ge=1)
+    food_master_cache_dir: Path | None = _BASE_DIR / "cache" / "food_master"
+
+
 _log_settings = LogSettings()
+_nutrition_optimizer_settings = NutritionOptimizerSettings()
 
 
 def get_config(config_key: str) -> dict[str, object]:
@@ -81,3 +114,7 @@ def get_config(config_key: str) -> dict[str, object]:
 
 def get_log_settings() -> LogSettings:
     return _log_settings
+
+
+def get_nutrition_optimizer_settings() -> NutritionOptimizerSettings:
+    return _nutrition_optimizer_settings
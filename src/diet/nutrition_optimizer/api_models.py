@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from typing import Literal, Self
 
 from pydantic import (
@@ -8,12 +9,32 @@ from pydantic import (
 )
 
 from diet.api_models import ApiModel
+from diet.config import get_nutrition_optimizer_settings
+from diet.nutrition_optimizer.food_search import (
+    FOOD_SEARCH_SORT_KEYS,
+    FoodSearchPage,
+    SortOrder,
+)
+from diet.nutrition_optimizer.jobs import JobStatus, OptimizationJob
 from diet.nutrition_optimizer.models import (
+    CatalogOptimizationProblem,
     Constraint,
     FoodInformation,
+    MealPlanProblem,
+    MealPlanResult,
     NutritionOptimizerResult,
     Objective,
+    OptimizationProblem,
+    SolutionMethod,
+    SolveMode,
+    SweepPoint,
+    SweepProblem,
+    validate_food_names_are_unique,
 )
+from diet.nutrition_optimizer.result_cache import ResultCacheStatistics
+from diet.nutrition_optimizer.solve_metrics import SolveMetricsStatistics
+
+_settings = get_nutrition_optimizer_settings()
 
 
 class FoodSelectionInput(ApiModel):
@@ -24,6 +45,7 @@ class FoodSelectionInput(ApiModel):
     carbohydrates: float
     minimum_intake_grams: int
     maximum_intake_grams: int
+    grams_per_unit: int = Field(default=1, ge=1)
 
     @field_validator("food_name")
     @classmethod
@@ -42,6 +64,7 @@ class FoodSelectionInput(ApiModel):
             carbohydrates=self.carbohydrates,
             minimum_intake_grams=self.minimum_intake_grams,
             maximum_intake_grams=self.maximum_intake_grams,
+            grams_per_unit=self.grams_per_unit,
         )
 
 
@@ -67,15 +90,17 @@ class OptimizeRequest(ApiModel):
     food_selections: list[FoodSelectionInput] = Field(min_length=1)
     objective: ObjectiveInput
     constraints: list[ConstraintInput]
+    solve_mode: SolveMode = "exact"
+    include_sensitivity: bool = False
 
     @field_validator("food_selections")
     @classmethod
     def validate_food_names_are_unique(
         cls, food_selections: list[FoodSelectionInput]
     ) -> list[FoodSelectionInput]:
-        food_names = [selection.food_name for selection in food_selections]
-        if len(food_names) != len(set(food_names)):
-            raise ValueError("Food names must be unique.")
+        validate_food_names_are_unique(
+            selection.food_name for selection in food_selections
+        )
         return food_selections
 
     def to_domain(
@@ -87,39 +112,214 @@ class OptimizeRequest(ApiModel):
             [item.to_domain() for item in self.constraints],
         )
 
+    def to_problem(self) -> OptimizationProblem:
+        return OptimizationProblem(
+            *self.to_domain(), self.solve_mode, self.include_sensitivity
+        )
+
+
+class OptimizeBatchRequest(ApiModel):
+    requests: list[OptimizeRequest] = Field(
+        min_length=1,
+        max_length=_settings.batch_max_size,
+    )
+
+    def to_problems(self) -> list[OptimizationProblem]:
+        return [item.to_problem() for item in self.requests]
+
+
+class CatalogOptimizeRequest(ApiModel):
+    objective: ObjectiveInput
+    constraints: list[ConstraintInput]
+    max_food_count: int | None = Field(
+        default=None, ge=1, le=_settings.catalog_max_food_count
+    )
+    maximum_intake_grams: int = Field(default=300, ge=1)
+    grams_per_unit: int = Field(default=1, ge=1)
+
+    def to_domain(self) -> CatalogOptimizationProblem:
+        return CatalogOptimizationProblem(
+            objective=self.objective.to_domain(),
+            constraints=[item.to_domain() for item in self.constraints],
+            maximum_intake_grams=self.maximum_intake_grams,
+            max_food_count=self.max_food_count,
+            grams_per_unit=self.grams_per_unit,
+        )
+
+
+class FoodSearchRequest(ApiModel):
+    query: str = Field(default="", max_length=100)
+    sort_by: str = "name"
+    order: SortOrder = "asc"
+    page: int = Field(default=1, ge=1)
+
+    @field_validator("sort_by")
+    @classmethod
+    def validate_sort_by(cls, sort_by: str) -> str:
+        if sort_by not in FOOD_SEARCH_SORT_KEYS:
+            raise ValueError(
+                f"Sort key must be one of {list(FOOD_SEARCH_SORT_KEYS)}."
+            )
+        return sort_by
+
+
+class SweepRequest(OptimizeRequest):
+    constraint_index: int = Field(ge=0)
+    start: float
+    stop: float
+    points: int = Field(ge=2, le=_settings.sweep_max_points)
+
+    @model_validator(mode="after")
+    def validate_constraint_index(self) -> Self:
+        if self.constraint_index >= len(self.constraints):
+            raise ValueError(
+                "Constraint index must refer to one of the constraints."
+            )
+        return self
+
+    def to_sweep_problem(self) -> SweepProblem:
+        step = (self.stop - self.start) / (self.points - 1)
+        return SweepProblem(
+            *self.to_domain(),
+            constraint_index=self.constraint_index,
+            constraint_values=[
+                self.start + step * index for index in range(self.points)
+            ],
+            solve_mode=self.solve_mode,
+            include_sensitivity=self.include_sensitivity,
+        )
+
+
+class MealPlanRequest(ApiModel):
+    food_selections: list[FoodSelectionInput] = Field(min_length=1)
+    objective: ObjectiveInput
+    daily_constraints: list[ConstraintInput]
+    plan_constraints: list[ConstraintInput] = []
+    days: int = Field(ge=1, le=_settings.meal_plan_max_days)
+    max_food_occurrences: int | None = Field(default=None, ge=1)
+
+    @field_validator("food_selections")
+    @classmethod
+    def validate_food_names_are_unique(
+        cls, food_selections: list[FoodSelectionInput]
+    ) -> list[FoodSelectionInput]:
+        validate_food_names_are_unique(
+            selection.food_name for selection in food_selections
+        )
+        return food_selections
+
+    def to_domain(self) -> MealPlanProblem:
+        return MealPlanProblem(
+            food_information=[
+                item.to_domain() for item in self.food_selections
+            ],
+            objective=self.objective.to_domain(),
+            daily_constraints=[
+                item.to_domain() for item in self.daily_constraints
+            ],
+            plan_constraints=[
+                item.to_domain() for item in self.plan_constraints
+            ],
+            days=self.days,
+            max_food_occurrences=self.max_food_occurrences,
+        )
+
+
+class ConstraintSensitivityResponse(ApiModel):
+    min_max: str
+    nutrient: str
+    unit: str
+    value: float
+    slack: float
+    shadow_price: float
+
+
+class SensitivityResponse(ApiModel):
+    constraints: list[ConstraintSensitivityResponse]
+    food_reduced_costs: dict[str, float]
+
+
+class ConstraintViolationResponse(ApiModel):
+    min_max: str
+    nutrient: str
+    unit: str
+    value: float
+    violation: float
+
+
+class FoodBoundViolationResponse(ApiModel):
+    food_name: str
+    bound: Literal["minimum", "maximum"]
+    value: int
+    violation: int
+
+
+class FoodCountViolationResponse(ApiModel):
+    value: int
+    violation: int
+
+
+class InfeasibilityDiagnosisResponse(ApiModel):
+    constraint_violations: list[ConstraintViolationResponse]
+    food_bound_violations: list[FoodBoundViolationResponse]
+    food_count_violation: FoodCountViolationResponse | None = None
+
+
+class PhaseSecondsResponse(ApiModel):
+    variable_setup: float | None = None
+    objective_setup: float | None = None
+    constraint_setup: float | None = None
+    solve: float | None = None
+    result_extraction: float | None = None
+
+
+class ModelSizeResponse(ApiModel):
+    variables: int
+    constraints: int
+    nonzeros: int
+    presolve_fixed_foods: int
+    presolve_zero_nutrient_foods: int
+
+
+class SolveMetricsResponse(ApiModel):
+    phase_seconds: PhaseSecondsResponse
+    model_size: ModelSizeResponse
+
 
 class OptimizeResponse(ApiModel):
     status: str
+    is_proven_optimal: bool | None = None
+    solution_method: SolutionMethod | None = None
     food_intake_grams: dict[str, int] | None = None
     total_nutrient_values: dict[str, float] | None = None
     pfc_composition_ratio: dict[str, float] | None = None
+    sensitivity: SensitivityResponse | None = None
     error_code: str | None = None
+    infeasibility_diagnosis: InfeasibilityDiagnosisResponse | None = None
+    solve_metrics: SolveMetricsResponse | None = None
 
     @model_validator(mode="after")
     def validate_result_matches_status(self) -> Self:
         result_values = (
+            self.is_proven_optimal,
+            self.solution_method,
             self.food_intake_grams,
             self.total_nutrient_values,
             self.pfc_composition_ratio,
         )
 
-        if self.status == "Optimal":
-            if any(value is None for value in result_values):
-                raise ValueError(
-                    "An optimal response must include all result values."
-                )
-            if self.error_code is not None:
-                raise ValueError(
-                    "An optimal response must not include an error code."
-                )
-            return self
-
-        if self.error_code is None:
-            raise ValueError("A failed response must include an error code.")
-        if any(value is not None for value in result_values):
+        _validate_result_matches_status(
+            self.status, result_values, self.error_code
+        )
+        if self.status != "Optimal" and self.sensitivity is not None:
             raise ValueError(
                 "A failed response must not include result values."
             )
+        if self.status == "Optimal" and self.infeasibility_diagnosis:
+            raise ValueError(
+                "An optimal response must not include"
+                " an infeasibility diagnosis."
+            )
         return self
 
     @classmethod
@@ -129,10 +329,130 @@ class OptimizeResponse(ApiModel):
         return cls.model_validate(result)
 
 
+class SweepPointResponse(ApiModel):
+    constraint_value: float
+    objective_value: float | None
+    result: OptimizeResponse
+
+
+class SweepResponse(ApiModel):
+    points: list[SweepPointResponse]
+
+    @classmethod
+    def from_domain_result(
+        cls, sweep_points: list[SweepPoint]
+    ) -> "SweepResponse":
+        return cls.model_validate({"points": sweep_points})
+
+
+class DailyMealPlanResponse(ApiModel):
+    food_intake_grams: dict[str, int]
+    total_nutrient_values: dict[str, float]
+    pfc_composition_ratio: dict[str, float]
+
+
+class MealPlanResponse(ApiModel):
+    status: str
+    is_proven_optimal: bool | None = None
+    daily_plans: list[DailyMealPlanResponse] | None = None
+    total_nutrient_values: dict[str, float] | None = None
+    pfc_composition_ratio: dict[str, float] | None = None
+    error_code: str | None = None
+
+    @model_validator(mode="after")
+    def validate_result_matches_status(self) -> Self:
+        result_values = (
+            self.is_proven_optimal,
+            self.daily_plans,
+            self.total_nutrient_values,
+            self.pfc_composition_ratio,
+        )
+        _validate_result_matches_status(
+            self.status, result_values, self.error_code
+        )
+        return self
+
+    @classmethod
+    def from_domain_result(cls, result: MealPlanResult) -> "MealPlanResponse":
+        return cls.model_validate(result)
+
+
+class OptimizationJobResponse(ApiModel):
+    job_id: str
+    status: JobStatus
+    result: OptimizeResponse | None = None
+
+    @classmethod
+    def from_domain_job(
+        cls, job: OptimizationJob
+    ) -> "OptimizationJobResponse":
+        return cls(
+            job_id=job.job_id,
+            status=job.status,
+            result=(
+                None
+                if job.result is None
+                else OptimizeResponse.from_domain_result(job.result)
+            ),
+        )
+
+
+class FoodSearchItemResponse(ApiModel):
+    name: str
+    values: list[str]
+
+
+class FoodSearchResponse(ApiModel):
+    nutrient_identifiers: list[str]
+    foods: list[FoodSearchItemResponse]
+    total_count: int
+    page: int
+    total_pages: int
+
+    @classmethod
+    def from_domain_page(cls, page: FoodSearchPage) -> "FoodSearchResponse":
+        return cls.model_validate(asdict(page))
+
+
+class ResultCacheStatisticsResponse(ApiModel):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+class SolveMetricsStatisticsResponse(ApiModel):
+    solve_count: int
+    total_phase_seconds: PhaseSecondsResponse
+    max_phase_seconds: PhaseSecondsResponse
+    max_model_size: ModelSizeResponse
+
+
+class MetricsResponse(ApiModel):
+    result_cache: ResultCacheStatisticsResponse
+    solves: SolveMetricsStatisticsResponse
+
+    @classmethod
+    def from_domain_statistics(
+        cls,
+        result_cache_statistics: ResultCacheStatistics,
+        solve_metrics_statistics: SolveMetricsStatistics,
+    ) -> "MetricsResponse":
+        return cls.model_validate(
+            {
+                "result_cache": asdict(result_cache_statistics),
+                "solves": asdict(solve_metrics_statistics),
+            }
+        )
+
+
 ErrorCode = Literal[
     "request_verification_failed",
     "invalid_input",
     "unexpected_response",
+    "job_queue_full",
+    "job_not_found",
 ]
 
 
@@ -148,6 +468,63 @@ def validate_optimize_request(payload: object) -> OptimizeRequest:
         raise ValueError(_format_validation_error(e)) from e
 
 
+def validate_optimize_batch_request(payload: object) -> OptimizeBatchRequest:
+    try:
+        return OptimizeBatchRequest.model_validate(payload)
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e)) from e
+
+
+def validate_catalog_optimize_request(
+    payload: object,
+) -> CatalogOptimizeRequest:
+    try:
+        return CatalogOptimizeRequest.model_validate(payload)
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e)) from e
+
+
+def validate_food_search_request(payload: object) -> FoodSearchRequest:
+    try:
+        return FoodSearchRequest.model_validate(payload)
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e)) from e
+
+
+def validate_sweep_request(payload: object) -> SweepRequest:
+    try:
+        return SweepRequest.model_validate(payload)
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e)) from e
+
+
+def validate_meal_plan_request(payload: object) -> MealPlanRequest:
+    try:
+        return MealPlanRequest.model_validate(payload)
+    except ValidationError as e:
+        raise ValueError(_format_validation_error(e)) from e
+
+
+def _validate_result_matches_status(
+    status: str, result_values: tuple[object, ...], error_code: str | None
+) -> None:
+    if status == "Optimal":
+        if any(value is None for value in result_values):
+            raise ValueError(
+                "An optimal response must include all result values."
+            )
+        if error_code is not None:
+            raise ValueError(
+                "An optimal response must not include an error code."
+            )
+        return
+
+    if error_code is None:
+        raise ValueError("A failed response must include an error code.")
+    if any(value is not None for value in result_values):
+        raise ValueError("A failed response must not include result values.")
+
+
 def _format_validation_error(error: ValidationError) -> str:
     error_details = []
     for item in error.errors():
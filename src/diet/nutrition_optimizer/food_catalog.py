@@ -0,0 +1,81 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from diet.nutrition_optimizer.food_master import (
+    FOOD_MASTER_PATH,
+    FoodMaster,
+    get_food_master,
+    load_food_master,
+    parse_food_master_value,
+)
+from diet.nutrition_optimizer.models import FoodInformation
+from diet.nutrition_optimizer.nutrients import NUTRIENT_KEYS, NUTRIENTS
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+
+
+@dataclass(frozen=True)
+class FoodCatalog:
+    names: Sequence[str]
+    nutrient_values: dict[str, tuple[float, ...]]
+    display_values: dict[str, tuple[str, ...]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_food_information(
+        self, maximum_intake_grams: int, grams_per_unit: int = 1
+    ) -> list[FoodInformation]:
+        return [
+            FoodInformation(
+                name=name,
+                **dict(zip(NUTRIENT_KEYS, values, strict=True)),
+                minimum_intake_grams=0,
+                maximum_intake_grams=maximum_intake_grams,
+                grams_per_unit=grams_per_unit,
+            )
+            for name, *values in zip(
+                self.names,
+                *(self.nutrient_values[key] for key in NUTRIENT_KEYS),
+                strict=True,
+            )
+        ]
+
+
+def parse_nutrient_value(value: str) -> float:
+    return parse_food_master_value(value).value
+
+
+def create_food_catalog(food_master: FoodMaster) -> FoodCatalog:
+    return FoodCatalog(
+        names=food_master.names,
+        nutrient_values={
+            nutrient.key: food_master.exact_column(
+                nutrient.food_master_identifier
+            )
+            for nutrient in NUTRIENTS
+        },
+        display_values={
+            nutrient.key: food_master.display_column(
+                nutrient.food_master_identifier
+            )
+            for nutrient in NUTRIENTS
+        },
+    )
+
+
+def load_food_catalog(path: Path = FOOD_MASTER_PATH) -> FoodCatalog:
+    return create_food_catalog(load_food_master(path))
+
+
+@cache
+def get_food_catalog() -> FoodCatalog:
+    _logger.info("Start: create food catalog")
+
+    food_catalog = create_food_catalog(get_food_master())
+
+    _logger.info(f"End: create food catalog with {len(food_catalog)} foods")
+    return food_catalog
@@ -0,0 +1,302 @@
+import json
+import shutil
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from enum import IntFlag
+from functools import cache
+from hashlib import file_digest
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Any, overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from diet.config import get_nutrition_optimizer_settings
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+FOOD_MASTER_PATH = (
+    Path(__file__).parent / "static" / "data" / "food_master.min.json"
+)
+MAX_DECIMAL_PLACES = 2
+_CACHE_FORMAT_VERSION = 2
+_MISSING_VALUES = ("", "-", "*")
+_TRACE_VALUE = "Tr"
+_FOOTNOTE_MARKERS = "†"
+_ARRAY_NAMES = (
+    "encoded_names",
+    "name_offsets",
+    "nutrient_identifiers",
+    "values",
+    "flags",
+    "decimal_places",
+)
+
+
+class NutrientFlag(IntFlag):
+    ESTIMATED = 1
+    TRACE = 2
+    MISSING = 4
+
+
+@dataclass(frozen=True)
+class ParsedNutrientValue:
+    value: float
+    flags: NutrientFlag
+    decimal_places: int
+
+
+class FoodNames(Sequence[str]):
+    def __init__(
+        self,
+        encoded_names: NDArray[np.uint8],
+        name_offsets: NDArray[np.int64],
+    ) -> None:
+        self.encoded_names = encoded_names
+        self.name_offsets = name_offsets
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> "FoodNames":
+        encoded_names = [name.encode("utf-8") for name in names]
+        name_offsets = np.zeros(len(encoded_names) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded_names], out=name_offsets[1:])
+        return cls(
+            np.frombuffer(b"".join(encoded_names), dtype=np.uint8),
+            name_offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.name_offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[item] for item in range(len(self))[index]]
+
+        food_index = range(len(self))[index]
+        start, end = self.name_offsets[food_index : food_index + 2]
+        return self.encoded_names[start:end].tobytes().decode("utf-8")
+
+
+@dataclass(frozen=True, eq=False)
+class FoodMaster:
+    names: FoodNames
+    nutrient_identifiers: tuple[str, ...]
+    values: NDArray[np.float32]
+    flags: NDArray[np.uint8]
+    decimal_places: NDArray[np.uint8]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def nutrient_index(self, identifier: str) -> int:
+        try:
+            return self.nutrient_identifiers.index(identifier)
+        except ValueError as e:
+            raise KeyError(identifier) from e
+
+    def column(self, identifier: str) -> NDArray[np.float32]:
+        return self.values[self.nutrient_index(identifier)]
+
+    def flag_column(self, identifier: str) -> NDArray[np.uint8]:
+        return self.flags[self.nutrient_index(identifier)]
+
+    def exact_column(self, identifier: str) -> tuple[float, ...]:
+        return tuple(
+            np.round(
+                self.column(identifier).astype(np.float64), MAX_DECIMAL_PLACES
+            ).tolist()
+        )
+
+    def display_rows(
+        self, nutrient_indexes: Sequence[int], food_indexes: Sequence[int]
+    ) -> list[tuple[str, ...]]:
+        cells = np.ix_(nutrient_indexes, food_indexes)
+        return [
+            tuple(
+                format_nutrient_value(value, NutrientFlag(flags), places)
+                for value, flags, places in zip(*food_cells, strict=True)
+            )
+            for food_cells in zip(
+                self.values[cells].T.tolist(),
+                self.flags[cells].T.tolist(),
+                self.decimal_places[cells].T.tolist(),
+                strict=True,
+            )
+        ]
+
+    def display_column(self, identifier: str) -> tuple[str, ...]:
+        nutrient_index = self.nutrient_index(identifier)
+        return tuple(
+            format_nutrient_value(float(value), NutrientFlag(flags), places)
+            for value, flags, places in zip(
+                self.values[nutrient_index].tolist(),
+                self.flags[nutrient_index].tolist(),
+                self.decimal_places[nutrient_index].tolist(),
+                strict=True,
+            )
+        )
+
+
+def parse_food_master_value(value: str) -> ParsedNutrientValue:
+    normalized_value = value.strip().rstrip(_FOOTNOTE_MARKERS)
+    flags = NutrientFlag(0)
+    if normalized_value.startswith("(") and normalized_value.endswith(")"):
+        normalized_value = normalized_value[1:-1]
+        flags |= NutrientFlag.ESTIMATED
+
+    if normalized_value in _MISSING_VALUES:
+        return ParsedNutrientValue(0.0, flags | NutrientFlag.MISSING, 0)
+    if normalized_value == _TRACE_VALUE:
+        return ParsedNutrientValue(0.0, flags | NutrientFlag.TRACE, 0)
+
+    _, _, fraction = normalized_value.partition(".")
+    if len(fraction) > MAX_DECIMAL_PLACES:
+        raise ValueError(
+            f"Nutrient value {value!r} has more than"
+            f" {MAX_DECIMAL_PLACES} decimal places."
+        )
+    return ParsedNutrientValue(float(normalized_value), flags, len(fraction))
+
+
+def format_nutrient_value(
+    value: float, flags: NutrientFlag, decimal_places: int
+) -> str:
+    if NutrientFlag.MISSING in flags:
+        text = "-"
+    elif NutrientFlag.TRACE in flags:
+        text = _TRACE_VALUE
+    else:
+        text = f"{value:.{decimal_places}f}"
+
+    if NutrientFlag.ESTIMATED in flags:
+        return f"({text})"
+    return text
+
+
+def parse_food_master(source: bytes) -> FoodMaster:
+    food_master = json.loads(source)
+    foods = food_master["foods"]
+    nutrient_identifiers = tuple(food_master["nutrientIdentifiers"])
+    shape = (len(nutrient_identifiers), len(foods))
+    values = np.zeros(shape, dtype=np.float32)
+    flags = np.zeros(shape, dtype=np.uint8)
+    decimal_places = np.zeros(shape, dtype=np.uint8)
+    for food_index, food in enumerate(foods):
+        for nutrient_index, value in enumerate(food["values"]):
+            parsed_value = parse_food_master_value(value)
+            values[nutrient_index, food_index] = parsed_value.value
+            flags[nutrient_index, food_index] = parsed_value.flags
+            decimal_places[nutrient_index, food_index] = (
+                parsed_value.decimal_places
+            )
+
+    return FoodMaster(
+        names=FoodNames.from_names(food["name"] for food in foods),
+        nutrient_identifiers=nutrient_identifiers,
+        values=values,
+        flags=flags,
+        decimal_places=decimal_places,
+    )
+
+
+def get_food_master_cache_path(
+    cache_dir: Path, path: Path = FOOD_MASTER_PATH, suffix: str = ""
+) -> Path:
+    with path.open("rb") as file:
+        digest = file_digest(file, "sha256").hexdigest()
+    return cache_dir / f"v{_CACHE_FORMAT_VERSION}-{digest[:16]}{suffix}"
+
+
+def read_cached_arrays(
+    cache_path: Path, names: Iterable[str]
+) -> dict[str, NDArray[Any]]:
+    return {
+        name: np.load(cache_path / f"{name}.npy", mmap_mode="r")
+        for name in names
+    }
+
+
+def write_cached_arrays(
+    arrays: Mapping[str, NDArray[Any]], cache_path: Path
+) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = Path(mkdtemp(dir=cache_path.parent))
+    try:
+        temporary_path.chmod(0o755)
+        for name, array in arrays.items():
+            np.save(temporary_path / f"{name}.npy", array)
+        temporary_path.rename(cache_path)
+    finally:
+        shutil.rmtree(temporary_path, ignore_errors=True)
+
+
+def _read_cached_food_master(cache_path: Path) -> FoodMaster:
+    arrays = read_cached_arrays(cache_path, _ARRAY_NAMES)
+    return FoodMaster(
+        names=FoodNames(arrays["encoded_names"], arrays["name_offsets"]),
+        nutrient_identifiers=tuple(arrays["nutrient_identifiers"].tolist()),
+        values=arrays["values"],
+        flags=arrays["flags"],
+        decimal_places=arrays["decimal_places"],
+    )
+
+
+def _write_cached_food_master(
+    food_master: FoodMaster, cache_path: Path
+) -> None:
+    write_cached_arrays(
+        {
+            "encoded_names": food_master.names.encoded_names,
+            "name_offsets": food_master.names.name_offsets,
+            "nutrient_identifiers": np.array(food_master.nutrient_identifiers),
+            "values": food_master.values,
+            "flags": food_master.flags,
+            "decimal_places": food_master.decimal_places,
+        },
+        cache_path,
+    )
+
+
+def load_food_master(
+    path: Path = FOOD_MASTER_PATH, cache_dir: Path | None = None
+) -> FoodMaster:
+    _logger.info(f"Start: load food master from {path}")
+
+    cache_path = (
+        None
+        if cache_dir is None
+        else get_food_master_cache_path(cache_dir, path)
+    )
+    if cache_path is not None and cache_path.is_dir():
+        try:
+            food_master = _read_cached_food_master(cache_path)
+        except (EOFError, OSError, ValueError) as e:
+            _logger.warning(f"Failed to read cached food master: {e}")
+            shutil.rmtree(cache_path, ignore_errors=True)
+        else:
+            _logger.info(f"End: load food master from cache {cache_path}")
+            return food_master
+
+    food_master = parse_food_master(path.read_bytes())
+    if cache_path is not None:
+        try:
+            _write_cached_food_master(food_master, cache_path)
+        except OSError as e:
+            _logger.warning(f"Failed to cache food master: {e}")
+
+    _logger.info(f"End: load food master with {len(food_master)} foods")
+    return food_master
+
+
+@cache
+def get_food_master() -> FoodMaster:
+    return load_food_master(cache_dir=_settings.food_master_cache_dir)
@@ -0,0 +1,160 @@
+import gzip
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from hashlib import file_digest
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+
+import numpy as np
+
+from diet.config import get_nutrition_optimizer_settings
+from diet.nutrition_optimizer.food_master import (
+    FOOD_MASTER_PATH,
+    FoodMaster,
+    get_food_master,
+    get_food_master_cache_path,
+)
+from diet.nutrition_optimizer.food_search import build_name_order
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+FOOD_MASTER_BINARY_MAGIC = b"FCAT"
+FOOD_MASTER_BINARY_VERSION = 2
+_DIGEST_LENGTH = 16
+_GZIP_COMPRESS_LEVEL = 9
+_CACHE_SUFFIX = "-assets"
+_IDENTIFIER_SEPARATOR = "\n"
+
+
+@dataclass(frozen=True)
+class FoodMasterAsset:
+    digest: str
+    mimetype: str
+    path: Path
+    gzip_path: Path
+
+
+def _write_file(path: Path, content: bytes) -> None:
+    with NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(content)
+    temporary_path = Path(file.name)
+    temporary_path.chmod(0o644)
+    temporary_path.replace(path)
+
+
+def _load_food_master_asset(
+    path: Path, mimetype: str, build_content: Callable[[], bytes]
+) -> FoodMasterAsset:
+    gzip_path = path.with_name(f"{path.name}.gz")
+    if not gzip_path.is_file():
+        content = build_content()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file(path, content)
+        _write_file(
+            gzip_path,
+            gzip.compress(
+                content, compresslevel=_GZIP_COMPRESS_LEVEL, mtime=0
+            ),
+        )
+
+    with path.open("rb") as file:
+        digest = file_digest(file, "sha256").hexdigest()
+    food_master_asset = FoodMasterAsset(
+        digest=digest[:_DIGEST_LENGTH],
+        mimetype=mimetype,
+        path=path,
+        gzip_path=gzip_path,
+    )
+
+    _logger.info(
+        f"End: load food master asset {food_master_asset.digest}"
+        f" ({path.stat().st_size} bytes,"
+        f" {gzip_path.stat().st_size} bytes gzipped)"
+    )
+    return food_master_asset
+
+
+def build_food_master_asset(
+    asset_dir: Path, path: Path = FOOD_MASTER_PATH
+) -> FoodMasterAsset:
+    _logger.info(f"Start: load food master asset from {path}")
+
+    return _load_food_master_asset(
+        asset_dir / "food_master.json", "application/json", path.read_bytes
+    )
+
+
+def encode_food_master_binary(food_master: FoodMaster) -> bytes:
+    encoded_identifiers = _IDENTIFIER_SEPARATOR.join(
+        food_master.nutrient_identifiers
+    ).encode("utf-8")
+    encoded_names = food_master.names.encoded_names
+    header = np.array(
+        [
+            FOOD_MASTER_BINARY_VERSION,
+            len(food_master),
+            len(food_master.nutrient_identifiers),
+            len(encoded_identifiers),
+            len(encoded_names),
+        ],
+        dtype="<u4",
+    )
+    return b"".join(
+        [
+            FOOD_MASTER_BINARY_MAGIC,
+            header.tobytes(),
+            food_master.names.name_offsets.astype("<u4").tobytes(),
+            np.array(build_name_order(food_master), dtype="<u4").tobytes(),
+            food_master.values.astype("<f4").tobytes(),
+            food_master.flags.tobytes(),
+            food_master.decimal_places.tobytes(),
+            encoded_identifiers,
+            encoded_names.tobytes(),
+        ]
+    )
+
+
+def build_food_master_binary_asset(
+    asset_dir: Path, food_master: FoodMaster
+) -> FoodMasterAsset:
+    _logger.info("Start: load binary food master asset")
+
+    return _load_food_master_asset(
+        asset_dir / f"food_master.v{FOOD_MASTER_BINARY_VERSION}.bin",
+        "application/octet-stream",
+        lambda: encode_food_master_binary(food_master),
+    )
+
+
+@cache
+def _get_temporary_asset_dir() -> TemporaryDirectory[str]:
+    return TemporaryDirectory(prefix="food_master_assets_")
+
+
+@cache
+def _get_asset_dir() -> Path:
+    cache_dir = _settings.food_master_cache_dir
+    if cache_dir is not None:
+        asset_dir = get_food_master_cache_path(
+            cache_dir.resolve(), suffix=_CACHE_SUFFIX
+        )
+        try:
+            asset_dir.mkdir(parents=True, exist_ok=True)
+            return asset_dir
+        except OSError as e:
+            _logger.warning(f"Failed to cache food master assets: {e}")
+
+    return Path(_get_temporary_asset_dir().name)
+
+
+@cache
+def get_food_master_asset() -> FoodMasterAsset:
+    return build_food_master_asset(_get_asset_dir())
+
+
+@cache
+def get_food_master_binary_asset() -> FoodMasterAsset:
+    return build_food_master_binary_asset(_get_asset_dir(), get_food_master())
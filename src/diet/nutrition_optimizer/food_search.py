@@ -0,0 +1,356 @@
+import shutil
+import unicodedata
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cache
+from itertools import chain
+from math import ceil
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+
+from diet.config import get_nutrition_optimizer_settings
+from diet.nutrition_optimizer.food_master import (
+    FoodMaster,
+    FoodNames,
+    get_food_master,
+    get_food_master_cache_path,
+    read_cached_arrays,
+    write_cached_arrays,
+)
+from diet.nutrition_optimizer.nutrients import NUTRIENTS
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+SortOrder = Literal["asc", "desc"]
+
+NAME_SORT_KEY = "name"
+FOOD_SEARCH_SORT_KEYS = (
+    NAME_SORT_KEY,
+    *(nutrient.food_master_identifier for nutrient in NUTRIENTS),
+)
+_SORT_ORDERS: tuple[SortOrder, ...] = ("asc", "desc")
+_MAX_NGRAM_SIZE = 2
+_CACHE_SUFFIX = "-search-v2"
+_SYMBOL, _DIGIT, _LATIN, _KANA, _KANJI, _OTHER = range(6)
+_KATAKANA_OFFSET = ord("ア") - ord("あ")
+_LONG_VOWEL_MARK = "ー"
+_SMALL_KANA = str.maketrans(
+    "ぁぃぅぇぉっゃゅょゎゕゖ", "あいうえおつやゆよわかけ"
+)
+_VOICING_MARKS = {"\u3099": 1, "\u309a": 2}
+_KANA_VOWELS = {"A": "あ", "I": "い", "U": "う", "E": "え", "O": "お"}
+_ARRAY_NAMES = (
+    "encoded_names",
+    "name_offsets",
+    "ngrams",
+    "posting_offsets",
+    "posting_indexes",
+    "sort_orders",
+)
+
+
+@dataclass(frozen=True)
+class FoodSearchItem:
+    name: str
+    values: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class FoodSearchPage:
+    nutrient_identifiers: tuple[str, ...]
+    foods: list[FoodSearchItem]
+    total_count: int
+    page: int
+    total_pages: int
+
+
+def normalize_search_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).strip().casefold()
+
+
+def _get_kana_vowel(kana: str) -> str:
+    return _KANA_VOWELS.get(unicodedata.name(kana)[-1], kana)
+
+
+def _get_kana_collation_weights(
+    character: str, previous_weight: tuple[int, int] | None
+) -> tuple[tuple[int, int], int, int] | None:
+    if character == _LONG_VOWEL_MARK:
+        if previous_weight is None or previous_weight[0] != _KANA:
+            return None
+        vowel = _get_kana_vowel(chr(previous_weight[1]))
+        return (_KANA, ord(vowel)), 0, 0
+
+    is_katakana = "ァ" <= character <= "ヶ"
+    if is_katakana:
+        character = chr(ord(character) - _KATAKANA_OFFSET)
+    if not "ぁ" <= character <= "ゖ":
+        return None
+
+    large_character = character.translate(_SMALL_KANA)
+    decomposed_character = unicodedata.normalize("NFD", large_character)
+    return (
+        (_KANA, ord(decomposed_character[0])),
+        _VOICING_MARKS.get(decomposed_character[1:], 0),
+        (large_character == character) * 2 + is_katakana,
+    )
+
+
+def _get_collation_weights(
+    character: str, previous_weight: tuple[int, int] | None
+) -> tuple[tuple[int, int], int, int]:
+    kana_weights = _get_kana_collation_weights(character, previous_weight)
+    if kana_weights is not None:
+        return kana_weights
+
+    category = unicodedata.category(character)
+    if category == "Nd":
+        return (_DIGIT, unicodedata.digit(character)), 0, 0
+    if character.isascii() and character.isalpha():
+        return (_LATIN, ord(character.casefold())), 0, character.isupper()
+    if category == "Lo" and "\u4e00" <= character <= "\u9fff":
+        try:
+            jis_code = int.from_bytes(character.encode("cp932"))
+        except UnicodeEncodeError:
+            jis_code = 0x10000 + ord(character)
+        return (_KANJI, jis_code), 0, 0
+    if category[0] in "PSZ" or category == "Lm":
+        return (_SYMBOL, ord(character)), 0, 0
+    return (_OTHER, ord(character)), 0, 0
+
+
+def create_food_name_sort_key(name: str) -> tuple[Any, ...]:
+    primary_weights: list[tuple[int, int]] = []
+    secondary_weights: list[int] = []
+    tertiary_weights: list[int] = []
+    for character in unicodedata.normalize("NFKC", name):
+        primary_weight, secondary_weight, tertiary_weight = (
+            _get_collation_weights(
+                character, primary_weights[-1] if primary_weights else None
+            )
+        )
+        primary_weights.append(primary_weight)
+        secondary_weights.append(secondary_weight)
+        tertiary_weights.append(tertiary_weight)
+    return primary_weights, secondary_weights, tertiary_weights, name
+
+
+def build_name_order(food_master: FoodMaster) -> list[int]:
+    return sorted(
+        range(len(food_master)),
+        key=lambda food_index: create_food_name_sort_key(
+            food_master.names[food_index]
+        ),
+    )
+
+
+def _create_ngrams(text: str, size: int) -> set[str]:
+    return {
+        text[index : index + size] for index in range(len(text) - size + 1)
+    }
+
+
+def _build_postings(
+    normalized_names: FoodNames,
+) -> dict[str, NDArray[Any]]:
+    postings: dict[str, list[int]] = {}
+    for food_index, name in enumerate(normalized_names):
+        for size in range(1, _MAX_NGRAM_SIZE + 1):
+            for ngram in _create_ngrams(name, size):
+                postings.setdefault(ngram, []).append(food_index)
+
+    ngrams = sorted(postings)
+    posting_offsets = np.zeros(len(ngrams) + 1, dtype=np.int64)
+    np.cumsum(
+        [len(postings[ngram]) for ngram in ngrams], out=posting_offsets[1:]
+    )
+    return {
+        "ngrams": np.array(ngrams, dtype=f"<U{_MAX_NGRAM_SIZE}"),
+        "posting_offsets": posting_offsets,
+        "posting_indexes": np.fromiter(
+            chain.from_iterable(postings[ngram] for ngram in ngrams),
+            dtype=np.uint32,
+            count=int(posting_offsets[-1]),
+        ),
+    }
+
+
+def _build_sort_orders(food_master: FoodMaster) -> NDArray[np.uint32]:
+    name_order = build_name_order(food_master)
+    sort_orders = [name_order, name_order[::-1]]
+    for identifier in FOOD_SEARCH_SORT_KEYS[1:]:
+        values = food_master.exact_column(identifier)
+        sort_orders.append(sorted(name_order, key=values.__getitem__))
+        sort_orders.append(
+            sorted(name_order, key=values.__getitem__, reverse=True)
+        )
+    return np.array(sort_orders, dtype=np.uint32).reshape(
+        len(FOOD_SEARCH_SORT_KEYS), len(_SORT_ORDERS), len(food_master)
+    )
+
+
+def build_food_search_arrays(
+    food_master: FoodMaster,
+) -> dict[str, NDArray[Any]]:
+    normalized_names = FoodNames.from_names(
+        normalize_search_text(name) for name in food_master.names
+    )
+    return {
+        "encoded_names": normalized_names.encoded_names,
+        "name_offsets": normalized_names.name_offsets,
+        **_build_postings(normalized_names),
+        "sort_orders": _build_sort_orders(food_master),
+    }
+
+
+class FoodSearchIndex:
+    def __init__(
+        self, food_master: FoodMaster, arrays: Mapping[str, NDArray[Any]]
+    ) -> None:
+        self.nutrient_identifiers = FOOD_SEARCH_SORT_KEYS[1:]
+        self._food_master = food_master
+        self._nutrient_indexes = tuple(
+            food_master.nutrient_index(identifier)
+            for identifier in self.nutrient_identifiers
+        )
+        self._normalized_names = FoodNames(
+            arrays["encoded_names"], arrays["name_offsets"]
+        )
+        self._ngrams = arrays["ngrams"]
+        self._posting_offsets = arrays["posting_offsets"]
+        self._posting_indexes = arrays["posting_indexes"]
+        self._sort_orders = arrays["sort_orders"]
+
+    @classmethod
+    def from_food_master(cls, food_master: FoodMaster) -> "FoodSearchIndex":
+        return cls(food_master, build_food_search_arrays(food_master))
+
+    def __len__(self) -> int:
+        return len(self._food_master)
+
+    def _get_posting(self, ngram: str) -> NDArray[np.uint32]:
+        position = int(np.searchsorted(self._ngrams, ngram))
+        if position == len(self._ngrams) or self._ngrams[position] != ngram:
+            return self._posting_indexes[:0]
+
+        start, end = self._posting_offsets[position : position + 2]
+        return self._posting_indexes[start:end]
+
+    def _find_matching_indexes(self, query: str) -> NDArray[np.uint32] | None:
+        normalized_query = normalize_search_text(query)
+        if not normalized_query:
+            return None
+
+        ngrams = _create_ngrams(
+            normalized_query, min(len(normalized_query), _MAX_NGRAM_SIZE)
+        )
+        postings = sorted(map(self._get_posting, ngrams), key=len)
+        matching_indexes = postings[0]
+        for posting in postings[1:]:
+            matching_indexes = np.intersect1d(
+                matching_indexes, posting, assume_unique=True
+            )
+        if len(normalized_query) <= _MAX_NGRAM_SIZE:
+            return matching_indexes
+
+        return np.array(
+            [
+                food_index
+                for food_index in matching_indexes.tolist()
+                if normalized_query in self._normalized_names[food_index]
+            ],
+            dtype=np.uint32,
+        )
+
+    def search(
+        self,
+        query: str,
+        sort_by: str,
+        order: SortOrder,
+        page: int,
+        page_size: int,
+    ) -> FoodSearchPage:
+        if sort_by not in FOOD_SEARCH_SORT_KEYS:
+            raise ValueError(
+                f"Invalid sort key: {sort_by}."
+                f" Valid keys are {list(FOOD_SEARCH_SORT_KEYS)}."
+            )
+
+        ordered_indexes = self._sort_orders[
+            FOOD_SEARCH_SORT_KEYS.index(sort_by), _SORT_ORDERS.index(order)
+        ]
+        matching_indexes = self._find_matching_indexes(query)
+        if matching_indexes is not None:
+            ordered_indexes = ordered_indexes[
+                np.isin(ordered_indexes, matching_indexes)
+            ]
+        total_count = len(ordered_indexes)
+        total_pages = ceil(total_count / page_size)
+        page = min(page, max(total_pages, 1))
+
+        page_start = (page - 1) * page_size
+        page_indexes = ordered_indexes[
+            page_start : page_start + page_size
+        ].tolist()
+        return FoodSearchPage(
+            nutrient_identifiers=self.nutrient_identifiers,
+            foods=[
+                FoodSearchItem(
+                    name=self._food_master.names[food_index], values=values
+                )
+                for food_index, values in zip(
+                    page_indexes,
+                    self._food_master.display_rows(
+                        self._nutrient_indexes, page_indexes
+                    ),
+                    strict=True,
+                )
+            ],
+            total_count=total_count,
+            page=page,
+            total_pages=total_pages,
+        )
+
+
+def load_food_search_index(
+    food_master: FoodMaster, cache_path: Path | None = None
+) -> FoodSearchIndex:
+    if cache_path is not None and cache_path.is_dir():
+        try:
+            return FoodSearchIndex(
+                food_master, read_cached_arrays(cache_path, _ARRAY_NAMES)
+            )
+        except (EOFError, OSError, ValueError) as e:
+            _logger.warning(f"Failed to read cached food search index: {e}")
+            shutil.rmtree(cache_path, ignore_errors=True)
+
+    arrays = build_food_search_arrays(food_master)
+    if cache_path is not None:
+        try:
+            write_cached_arrays(arrays, cache_path)
+        except OSError as e:
+            _logger.warning(f"Failed to cache food search index: {e}")
+    return FoodSearchIndex(food_master, arrays)
+
+
+@cache
+def get_food_search_index() -> FoodSearchIndex:
+    _logger.info("Start: build food search index")
+
+    cache_dir = _settings.food_master_cache_dir
+    food_search_index = load_food_search_index(
+        get_food_master(),
+        None
+        if cache_dir is None
+        else get_food_master_cache_path(cache_dir, suffix=_CACHE_SUFFIX),
+    )
+
+    _logger.info(
+        f"End: build food search index with {len(food_search_index)} foods"
+    )
+    return food_search_index
@@ -0,0 +1,181 @@
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Literal
+from uuid import uuid4
+
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    SolveMode,
+)
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class JobNotFoundError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class OptimizationJob:
+    job_id: str
+    status: JobStatus
+    result: NutritionOptimizerResult | None = None
+
+
+@dataclass
+class _JobEntry:
+    future: Future[NutritionOptimizerResult]
+    finished_at: float | None = None
+
+
+def solve_optimization_problem(
+    food_information: list[FoodInformation],
+    objective: Objective,
+    constraints: list[Constraint],
+    solve_mode: SolveMode = "exact",
+    include_sensitivity: bool = False,
+) -> NutritionOptimizerResult:
+    return NutritionOptimizer(
+        food_information, objective, constraints, solve_mode
+    ).solve(include_sensitivity)
+
+
+class OptimizationJobQueue:
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_depth: int,
+        result_ttl_seconds: float,
+        executor_factory: Callable[[int], Executor] = ProcessPoolExecutor,
+        clock: Callable[[], float] = monotonic,
+        on_result: Callable[[NutritionOptimizerResult], None] | None = None,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_queue_depth = max_queue_depth
+        self._result_ttl_seconds = result_ttl_seconds
+        self._executor_factory = executor_factory
+        self._clock = clock
+        self._on_result = on_result
+        self._executor: Executor | None = None
+        self._jobs: dict[str, _JobEntry] = {}
+        self._lock = Lock()
+
+    def submit(
+        self,
+        food_information: list[FoodInformation],
+        objective: Objective,
+        constraints: list[Constraint],
+        solve_mode: SolveMode = "exact",
+        include_sensitivity: bool = False,
+    ) -> OptimizationJob:
+        with self._lock:
+            self._remove_expired_jobs()
+            if self._count_unfinished_jobs() >= self._max_queue_depth:
+                raise JobQueueFullError(
+                    "Optimization job queue is full:"
+                    f" {self._max_queue_depth} jobs are pending."
+                )
+
+            job_id = uuid4().hex
+            future = self._get_executor().submit(
+                solve_optimization_problem,
+                food_information,
+                objective,
+                constraints,
+                solve_mode,
+                include_sensitivity,
+            )
+            entry = _JobEntry(future=future)
+            self._jobs[job_id] = entry
+            future.add_done_callback(
+                lambda _: self._mark_finished(job_id, entry)
+            )
+
+        _logger.info(f"Submitted optimization job: {job_id}")
+        return self._snapshot(job_id, entry)
+
+    def get(self, job_id: str) -> OptimizationJob:
+        with self._lock:
+            self._remove_expired_jobs()
+            entry = self._find_entry(job_id)
+        return self._snapshot(job_id, entry)
+
+    def cancel(self, job_id: str) -> OptimizationJob:
+        with self._lock:
+            self._remove_expired_jobs()
+            entry = self._find_entry(job_id)
+        if entry.future.cancel():
+            _logger.info(f"Cancelled optimization job: {job_id}")
+        return self._snapshot(job_id, entry)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._jobs.clear()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory(self._max_workers)
+        return self._executor
+
+    def _find_entry(self, job_id: str) -> _JobEntry:
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            raise JobNotFoundError(f"Optimization job not found: {job_id}")
+        return entry
+
+    def _mark_finished(self, job_id: str, entry: _JobEntry) -> None:
+        entry.finished_at = self._clock()
+        if entry.future.cancelled():
+            return
+        if entry.future.exception():
+            _logger.error(
+                f"Optimization job failed: {job_id}",
+                exc_info=entry.future.exception(),
+            )
+        elif self._on_result is not None:
+            self._on_result(entry.future.result())
+
+    def _count_unfinished_jobs(self) -> int:
+        return sum(not entry.future.done() for entry in self._jobs.values())
+
+    def _remove_expired_jobs(self) -> None:
+        expires_before = self._clock() - self._result_ttl_seconds
+        expired_job_ids = [
+            job_id
+            for job_id, entry in self._jobs.items()
+            if entry.finished_at is not None
+            and entry.finished_at <= expires_before
+        ]
+        for job_id in expired_job_ids:
+            del self._jobs[job_id]
+
+    def _snapshot(self, job_id: str, entry: _JobEntry) -> OptimizationJob:
+        future = entry.future
+        if future.cancelled():
+            return OptimizationJob(job_id=job_id, status="cancelled")
+        if not future.done():
+            status: JobStatus = "running" if future.running() else "queued"
+            return OptimizationJob(job_id=job_id, status=status)
+        if future.exception() is not None:
+            return OptimizationJob(job_id=job_id, status="failed")
+
+        return OptimizationJob(
+            job_id=job_id, status="completed", result=future.result()
+        )
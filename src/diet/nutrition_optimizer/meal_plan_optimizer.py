@@ -0,0 +1,355 @@
+from math import sumprod
+from operator import mul
+
+from pulp import (
+    LpAffineExpression,
+    LpBinary,
+    LpInteger,
+    LpMaximize,
+    LpMinimize,
+    LpProblem,
+    LpSolutionOptimal,
+    LpStatus,
+    LpVariable,
+    lpSum,
+)
+
+from diet.config import get_nutrition_optimizer_settings
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    DailyMealPlan,
+    FoodInformation,
+    MealPlanResult,
+    Objective,
+    OptimalMealPlanResult,
+    validate_food_names_are_unique,
+)
+from diet.nutrition_optimizer.nutrients import NUTRIENT_KEYS
+from diet.nutrition_optimizer.optimizer import (
+    add_nutrient_constraints,
+    build_nutrient_coefficient_matrix,
+    calculate_pfc_composition_ratio,
+    create_pfc_energy_expression,
+    create_solver,
+    is_solution_proven_optimal,
+)
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+
+class MealPlanOptimizer:
+    def __init__(
+        self,
+        food_information: list[FoodInformation],
+        objective: Objective,
+        daily_constraints: list[Constraint],
+        plan_constraints: list[Constraint],
+        days: int,
+        max_food_occurrences: int | None = None,
+    ) -> None:
+        self._food_information = food_information
+        self._objective = objective
+        self._daily_constraints = daily_constraints
+        self._plan_constraints = plan_constraints
+        self._days = days
+        self._max_food_occurrences = max_food_occurrences
+        validate_food_names_are_unique(
+            item.name for item in self._food_information
+        )
+        self._validate_days()
+        self._validate_max_food_occurrences()
+
+        self._food_intake_unit_variables: list[list[LpVariable]] = []
+        self._nutrient_coefficient_matrix: tuple[tuple[float, ...], ...] = ()
+        self._daily_nutrient_expressions: list[
+            dict[str, LpAffineExpression]
+        ] = []
+        self._plan_nutrient_expressions: dict[str, LpAffineExpression] = {}
+        self._problem: LpProblem = self._create_lp_problem()
+
+    def _validate_days(self) -> None:
+        if self._days < 1:
+            raise ValueError(
+                f"Number of days must be at least 1. Got {self._days}."
+            )
+
+    def _validate_max_food_occurrences(self) -> None:
+        if (
+            self._max_food_occurrences is not None
+            and self._max_food_occurrences < 1
+        ):
+            raise ValueError(
+                "Maximum food occurrences must be at least 1."
+                f" Got {self._max_food_occurrences}."
+            )
+
+    def _has_variety_limit(self) -> bool:
+        return (
+            self._max_food_occurrences is not None
+            and self._max_food_occurrences < self._days
+        )
+
+    def _create_lp_problem(self) -> LpProblem:
+        objective = (
+            LpMaximize if self._objective.sense == "maximize" else LpMinimize
+        )
+        objective_name = f"{self._objective.sense}_{self._objective.nutrient}"
+
+        return LpProblem(objective_name, objective)
+
+    def _setup_food_intake_unit_variables(self) -> None:
+        _logger.info("Setting up daily food intake unit variables.")
+
+        has_variety_limit = self._has_variety_limit()
+        for day in range(1, self._days + 1):
+            self._food_intake_unit_variables.append(
+                [
+                    self._problem.add_variable(
+                        f"day_{day}_food_{food_index}",
+                        lowBound=(
+                            0
+                            if has_variety_limit
+                            else food_information.minimum_intake_units
+                        ),
+                        upBound=food_information.maximum_intake_units,
+                        cat=LpInteger,
+                    )
+                    for food_index, food_information in enumerate(
+                        self._food_information
+                    )
+                ]
+            )
+
+        _logger.info("Completed setting up daily food intake unit variables.")
+
+    def _setup_nutrient_expressions(self) -> None:
+        _logger.info("Setting up nutrient expressions.")
+
+        self._nutrient_coefficient_matrix = build_nutrient_coefficient_matrix(
+            self._food_information
+        )
+        grams_per_unit = [
+            food_information.grams_per_unit
+            for food_information in self._food_information
+        ]
+        for daily_variables in self._food_intake_unit_variables:
+            self._daily_nutrient_expressions.append(
+                {
+                    nutrient: LpAffineExpression(
+                        zip(
+                            daily_variables,
+                            map(mul, coefficients, grams_per_unit),
+                            strict=True,
+                        )
+                    )
+                    for nutrient, coefficients in zip(
+                        NUTRIENT_KEYS,
+                        self._nutrient_coefficient_matrix,
+                        strict=True,
+                    )
+                }
+            )
+        self._plan_nutrient_expressions = {
+            nutrient: lpSum(
+                expressions[nutrient]
+                for expressions in self._daily_nutrient_expressions
+            )
+            for nutrient in NUTRIENT_KEYS
+        }
+
+        _logger.info("Completed setting up nutrient expressions.")
+
+    def _setup_objective(self) -> None:
+        _logger.info("Setting up objective.")
+
+        objective_name = f"{self._objective.sense}_{self._objective.nutrient}"
+        self._problem += (
+            self._plan_nutrient_expressions[self._objective.nutrient],
+            objective_name,
+        )
+
+        _logger.info("Completed setting up objective.")
+
+    def _apply_constraints(
+        self,
+        constraints: list[Constraint],
+        nutrient_expressions: dict[str, LpAffineExpression],
+        name_prefix: str,
+    ) -> None:
+        add_nutrient_constraints(
+            self._problem,
+            constraints,
+            nutrient_expressions,
+            create_pfc_energy_expression(nutrient_expressions),
+            f"{name_prefix}_",
+        )
+
+    def _setup_constraints(self) -> None:
+        _logger.info("Setting up daily and plan constraints.")
+
+        for day, nutrient_expressions in enumerate(
+            self._daily_nutrient_expressions, start=1
+        ):
+            self._apply_constraints(
+                self._daily_constraints, nutrient_expressions, f"day_{day}"
+            )
+        self._apply_constraints(
+            self._plan_constraints, self._plan_nutrient_expressions, "plan"
+        )
+
+        _logger.info("Completed setting up daily and plan constraints.")
+
+    def _setup_variety_constraints(self) -> None:
+        if not self._has_variety_limit():
+            return
+
+        _logger.info("Setting up variety constraints.")
+
+        for food_index, food_information in enumerate(self._food_information):
+            selection_variables = []
+            for day, daily_variables in enumerate(
+                self._food_intake_unit_variables, start=1
+            ):
+                food_intake_units = daily_variables[food_index]
+                is_selected = self._problem.add_variable(
+                    f"day_{day}_food_{food_index}_selected", cat=LpBinary
+                )
+                self._problem += (
+                    food_intake_units
+                    <= food_information.maximum_intake_units * is_selected,
+                    f"day_{day}_food_{food_index}_selected_maximum",
+                )
+                if food_information.minimum_intake_units > 0:
+                    self._problem += (
+                        food_intake_units
+                        >= food_information.minimum_intake_units * is_selected,
+                        f"day_{day}_food_{food_index}_selected_minimum",
+                    )
+                selection_variables.append(is_selected)
+
+            self._problem += (
+                lpSum(selection_variables) <= self._max_food_occurrences,
+                f"food_{food_index}_max_occurrences",
+            )
+
+        _logger.info("Completed setting up variety constraints.")
+
+    def _preparation(self) -> None:
+        _logger.info(f"Starting preparation for a {self._days}-day plan.")
+
+        self._setup_food_intake_unit_variables()
+        self._setup_nutrient_expressions()
+        self._setup_objective()
+        self._setup_constraints()
+        self._setup_variety_constraints()
+
+        _logger.info("Completed preparation for solve.")
+
+    def _get_food_intake_grams(
+        self, variable: LpVariable, food_information: FoodInformation
+    ) -> int:
+        food_intake_units = (
+            food_information.minimum_intake_units
+            if variable.varValue is None
+            else int(round(variable.varValue))
+        )
+        return food_intake_units * food_information.grams_per_unit
+
+    def _calculate_total_nutrient_values(
+        self, food_intake_grams: tuple[int, ...]
+    ) -> dict[str, float]:
+        return {
+            nutrient: sumprod(coefficients, food_intake_grams)
+            for nutrient, coefficients in zip(
+                NUTRIENT_KEYS, self._nutrient_coefficient_matrix, strict=True
+            )
+        }
+
+    def _round_nutrient_values(
+        self, nutrient_values: dict[str, float]
+    ) -> dict[str, float]:
+        return {
+            nutrient: round(value, 1)
+            for nutrient, value in nutrient_values.items()
+        }
+
+    def _extract_optimal_result(self) -> OptimalMealPlanResult:
+        daily_plans: list[DailyMealPlan] = []
+        plan_nutrient_values = dict.fromkeys(NUTRIENT_KEYS, 0.0)
+        for daily_variables in self._food_intake_unit_variables:
+            food_intake_grams = tuple(
+                self._get_food_intake_grams(variable, food_information)
+                for variable, food_information in zip(
+                    daily_variables, self._food_information, strict=True
+                )
+            )
+            total_nutrient_values = self._calculate_total_nutrient_values(
+                food_intake_grams
+            )
+            for nutrient, value in total_nutrient_values.items():
+                plan_nutrient_values[nutrient] += value
+
+            daily_plans.append(
+                {
+                    "food_intake_grams": {
+                        food_information.name: grams
+                        for food_information, grams in zip(
+                            self._food_information,
+                            food_intake_grams,
+                            strict=True,
+                        )
+                    },
+                    "total_nutrient_values": self._round_nutrient_values(
+                        total_nutrient_values
+                    ),
+                    "pfc_composition_ratio": calculate_pfc_composition_ratio(
+                        total_nutrient_values
+                    ),
+                }
+            )
+
+        return {
+            "status": "Optimal",
+            "is_proven_optimal": is_solution_proven_optimal(
+                self._problem, _settings.meal_plan_relative_gap
+            ),
+            "daily_plans": daily_plans,
+            "total_nutrient_values": self._round_nutrient_values(
+                plan_nutrient_values
+            ),
+            "pfc_composition_ratio": calculate_pfc_composition_ratio(
+                plan_nutrient_values
+            ),
+        }
+
+    def solve(self) -> MealPlanResult:
+        self._preparation()
+
+        _logger.info("Starting to solve the meal plan problem.")
+        self._problem.solve(
+            create_solver(relative_gap=_settings.meal_plan_relative_gap)
+        )
+
+        solution_result = LpStatus[self._problem.status]
+        if solution_result == "Optimal":
+            if self._problem.sol_status != LpSolutionOptimal:
+                _logger.warning(
+                    "Solver stopped at its limits before proving optimality."
+                )
+            _logger.info("Meal plan optimization completed successfully.")
+            return self._extract_optimal_result()
+
+        _logger.warning(
+            f"Meal plan optimization failed with status: {solution_result}"
+        )
+        error_code = (
+            "optimization_infeasible"
+            if solution_result == "Infeasible"
+            else "optimization_failed"
+        )
+        return {
+            "status": solution_result,
+            "error_code": error_code,
+        }
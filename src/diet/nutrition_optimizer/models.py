@@ -1,20 +1,91 @@
-from dataclasses import dataclass
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
 from math import isfinite
-from typing import ClassVar, Literal, TypedDict
+from typing import ClassVar, Literal, NotRequired, TypedDict
 
 from diet.nutrition_optimizer.nutrients import NUTRIENT_KEYS
 
+SolveMode = Literal["exact", "fast"]
+SolutionMethod = Literal["mip", "lp_rounding"]
+OptimizerPhase = Literal[
+    "variable_setup",
+    "objective_setup",
+    "constraint_setup",
+    "solve",
+    "result_extraction",
+]
+
+
+class ConstraintSensitivity(TypedDict):
+    min_max: str
+    nutrient: str
+    unit: str
+    value: float
+    slack: float
+    shadow_price: float
+
+
+class SensitivityAnalysis(TypedDict):
+    constraints: list[ConstraintSensitivity]
+    food_reduced_costs: dict[str, float]
+
+
+class ModelSize(TypedDict):
+    variables: int
+    constraints: int
+    nonzeros: int
+    presolve_fixed_foods: int
+    presolve_zero_nutrient_foods: int
+
+
+class SolveMetrics(TypedDict):
+    phase_seconds: dict[str, float]
+    model_size: ModelSize
+
 
 class OptimalNutritionOptimizerResult(TypedDict):
     status: Literal["Optimal"]
+    is_proven_optimal: bool
+    solution_method: SolutionMethod
     food_intake_grams: dict[str, int]
     total_nutrient_values: dict[str, float]
     pfc_composition_ratio: dict[str, float]
+    sensitivity: NotRequired[SensitivityAnalysis]
+    solve_metrics: NotRequired[SolveMetrics]
+
+
+class ConstraintViolation(TypedDict):
+    min_max: str
+    nutrient: str
+    unit: str
+    value: float
+    violation: float
+
+
+class FoodBoundViolation(TypedDict):
+    food_name: str
+    bound: Literal["minimum", "maximum"]
+    value: int
+    violation: int
+
+
+class FoodCountViolation(TypedDict):
+    value: int
+    violation: int
+
+
+class InfeasibilityDiagnosis(TypedDict):
+    constraint_violations: list[ConstraintViolation]
+    food_bound_violations: list[FoodBoundViolation]
+    food_count_violation: NotRequired[FoodCountViolation]
 
 
 class FailedNutritionOptimizerResult(TypedDict):
     status: str
     error_code: str
+    infeasibility_diagnosis: NotRequired[InfeasibilityDiagnosis]
+    solve_metrics: NotRequired[SolveMetrics]
 
 
 NutritionOptimizerResult = (
@@ -22,6 +93,29 @@ NutritionOptimizerResult = (
 )
 
 
+class SweepPoint(TypedDict):
+    constraint_value: float
+    objective_value: float | None
+    result: NutritionOptimizerResult
+
+
+class DailyMealPlan(TypedDict):
+    food_intake_grams: dict[str, int]
+    total_nutrient_values: dict[str, float]
+    pfc_composition_ratio: dict[str, float]
+
+
+class OptimalMealPlanResult(TypedDict):
+    status: Literal["Optimal"]
+    is_proven_optimal: bool
+    daily_plans: list[DailyMealPlan]
+    total_nutrient_values: dict[str, float]
+    pfc_composition_ratio: dict[str, float]
+
+
+MealPlanResult = OptimalMealPlanResult | FailedNutritionOptimizerResult
+
+
 @dataclass(frozen=True)
 class FoodInformation:
     name: str
@@ -31,12 +125,22 @@ class FoodInformation:
     carbohydrates: float
     minimum_intake_grams: int
     maximum_intake_grams: int
+    grams_per_unit: int = 1
 
     def __post_init__(self) -> None:
         self._validate_name_is_not_blank()
         self._validate_nutrient_values_are_finite_and_non_negative()
         self._validate_intake_grams_are_non_negative()
         self._validate_minimum_intake_grams_is_less_than_maximum_intake_grams()
+        self._validate_grams_per_unit()
+
+    @property
+    def minimum_intake_units(self) -> int:
+        return -(-self.minimum_intake_grams // self.grams_per_unit)
+
+    @property
+    def maximum_intake_units(self) -> int:
+        return self.maximum_intake_grams // self.grams_per_unit
 
     def _validate_name_is_not_blank(self) -> None:
         if not self.name.strip():
@@ -78,6 +182,18 @@ class FoodInformation:
                 " minimum_intake_grams."
             )
 
+    def _validate_grams_per_unit(self) -> None:
+        if self.grams_per_unit is None or self.grams_per_unit < 1:
+            raise ValueError(
+                f"Invalid grams_per_unit for {self.name}."
+                " Grams_per_unit must be a positive integer."
+            )
+        if self.minimum_intake_units > self.maximum_intake_units:
+            raise ValueError(
+                f"Invalid intake range for {self.name}. The intake range must"
+                " include at least one multiple of grams_per_unit."
+            )
+
 
 @dataclass(frozen=True)
 class Constraint:
@@ -173,3 +289,78 @@ class Objective:
                 f"Invalid nutrient: {self.nutrient}."
                 f" Valid nutrients are {list(NUTRIENT_KEYS)}."
             )
+
+
+@dataclass(frozen=True)
+class OptimizationProblem:
+    food_information: list[FoodInformation]
+    objective: Objective
+    constraints: list[Constraint]
+    solve_mode: SolveMode = "exact"
+    include_sensitivity: bool = False
+
+
+@dataclass(frozen=True)
+class CatalogOptimizationProblem:
+    objective: Objective
+    constraints: list[Constraint]
+    maximum_intake_grams: int
+    max_food_count: int | None = None
+    grams_per_unit: int = 1
+
+
+@dataclass(frozen=True)
+class SweepProblem:
+    food_information: list[FoodInformation]
+    objective: Objective
+    constraints: list[Constraint]
+    constraint_index: int
+    constraint_values: list[float]
+    solve_mode: SolveMode = "exact"
+    include_sensitivity: bool = False
+
+    def __post_init__(self) -> None:
+        self._validate_constraint_index()
+        self._validate_constraint_values()
+
+    def _validate_constraint_index(self) -> None:
+        if not 0 <= self.constraint_index < len(self.constraints):
+            raise ValueError(
+                f"Invalid constraint index: {self.constraint_index}."
+                f" The problem has {len(self.constraints)} constraints."
+            )
+
+    def _validate_constraint_values(self) -> None:
+        if not self.constraint_values:
+            raise ValueError("At least one constraint value must be provided.")
+
+        for value in self.constraint_values:
+            self.create_constraints(value)
+
+    def create_constraints(self, value: float) -> list[Constraint]:
+        constraints = [*self.constraints]
+        constraints[self.constraint_index] = replace(
+            constraints[self.constraint_index], value=value
+        )
+        return constraints
+
+
+@dataclass(frozen=True)
+class MealPlanProblem:
+    food_information: list[FoodInformation]
+    objective: Objective
+    daily_constraints: list[Constraint]
+    plan_constraints: list[Constraint]
+    days: int
+    max_food_occurrences: int | None = None
+
+
+def validate_food_names_are_unique(food_names: Iterable[str]) -> None:
+    duplicate_food_names = [
+        food_name
+        for food_name, count in Counter(food_names).items()
+        if count > 1
+    ]
+    if duplicate_food_names:
+        duplicate_names = ", ".join(sorted(duplicate_food_names))
+        raise ValueError(f"Food names must be unique: {duplicate_names}.")
@@ -1,75 +1,302 @@
+from collections.abc import Mapping
+from dataclasses import replace
+from itertools import product
+from math import floor, inf, sumprod
+from operator import mul
+from typing import cast
+
 from pulp import (
     LpAffineExpression,
+    LpBinary,
+    LpConstraint,
+    LpConstraintEQ,
     LpInteger,
     LpMaximize,
     LpMinimize,
     LpProblem,
+    LpSolutionOptimal,
+    LpSolver,
     LpStatus,
     LpVariable,
+    getSolver,
+    lpSum,
 )
 
+from diet.config import get_nutrition_optimizer_settings
 from diet.nutrition_optimizer.models import (
     Constraint,
+    ConstraintSensitivity,
+    ConstraintViolation,
+    FailedNutritionOptimizerResult,
+    FoodBoundViolation,
+    FoodCountViolation,
     FoodInformation,
+    InfeasibilityDiagnosis,
     NutritionOptimizerResult,
     Objective,
+    OptimalNutritionOptimizerResult,
+    SensitivityAnalysis,
+    SolutionMethod,
+    SolveMetrics,
+    SolveMode,
+    SweepPoint,
+    validate_food_names_are_unique,
 )
 from diet.nutrition_optimizer.nutrients import (
     NUTRIENT_KEYS,
     NUTRIENT_REFERENCE_GRAMS,
     NUTRIENTS_BY_KEY,
 )
+from diet.nutrition_optimizer.presolve import PresolvedFoods, presolve_foods
+from diet.nutrition_optimizer.solve_metrics import PhaseTimer, count_model_size
 from diet.utils.custom_logger import get_logger
 
 _logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+
+PERCENTAGE_FACTOR = 100
+PFC_ENERGY_EPSILON = 1e-5
+_WARM_START_SOLVER_NAMES = ("PULP_CBC_CMD", "COIN_CMD", "HiGHS_CMD")
+
+
+def get_nutrient_energy_per_gram(nutrient: str) -> int:
+    energy_per_gram = NUTRIENTS_BY_KEY[nutrient].energy_per_gram
+    if energy_per_gram is None:
+        raise RuntimeError(
+            f"Nutrient has no energy conversion factor: {nutrient}."
+        )
+    return energy_per_gram
+
+
+def build_nutrient_coefficient_matrix(
+    food_information: list[FoodInformation],
+) -> tuple[tuple[float, ...], ...]:
+    return tuple(
+        tuple(
+            getattr(item, nutrient) / NUTRIENT_REFERENCE_GRAMS
+            for item in food_information
+        )
+        for nutrient in NUTRIENT_KEYS
+    )
+
+
+def calculate_pfc_composition_ratio(
+    total_nutrient_values: dict[str, float],
+) -> dict[str, float]:
+    nutrient_energies = {
+        nutrient: total_nutrient_values[nutrient]
+        * get_nutrient_energy_per_gram(nutrient)
+        for nutrient in NUTRIENT_KEYS
+        if nutrient != "energy"
+    }
+    pfc_energy = sum(nutrient_energies.values())
+    if pfc_energy == 0:
+        _logger.warning(
+            "Skipping PFC composition ratio calculation because "
+            "PFC energy is zero."
+        )
+        return {nutrient: 0.0 for nutrient in nutrient_energies}
+
+    return {
+        nutrient: round(nutrient_energy / pfc_energy * PERCENTAGE_FACTOR, 1)
+        for nutrient, nutrient_energy in nutrient_energies.items()
+    }
+
+
+def create_pfc_energy_expression(
+    nutrient_expressions: Mapping[str, float | LpAffineExpression],
+) -> LpAffineExpression:
+    return lpSum(
+        nutrient_expressions[nutrient] * get_nutrient_energy_per_gram(nutrient)
+        for nutrient in NUTRIENT_KEYS
+        if nutrient != "energy"
+    )
+
+
+def create_nutrient_constraint(
+    constraint: Constraint,
+    nutrient_expressions: Mapping[str, float | LpAffineExpression],
+    pfc_energy: float | LpAffineExpression,
+) -> LpConstraint:
+    constrained_value = nutrient_expressions[constraint.nutrient]
+    limit: float | LpAffineExpression = constraint.value
+    if constraint.unit == "pfc_ratio":
+        constrained_value = constrained_value * get_nutrient_energy_per_gram(
+            constraint.nutrient
+        )
+        limit = pfc_energy * (constraint.value / PERCENTAGE_FACTOR)
+
+    return cast(
+        LpConstraint,
+        constrained_value <= limit
+        if constraint.min_max == "max"
+        else constrained_value >= limit,
+    )
+
+
+def get_constraint_name(constraint: Constraint, constraint_index: int) -> str:
+    return (
+        f"{constraint_index}_{constraint.min_max}_"
+        f"{constraint.nutrient}_{constraint.unit}"
+    )
+
+
+def add_nutrient_constraints(
+    problem: LpProblem,
+    constraints: list[Constraint],
+    nutrient_expressions: Mapping[str, float | LpAffineExpression],
+    pfc_energy: float | LpAffineExpression,
+    name_prefix: str = "",
+) -> None:
+    if any(constraint.unit == "pfc_ratio" for constraint in constraints):
+        problem += (
+            pfc_energy >= PFC_ENERGY_EPSILON,
+            f"{name_prefix}pfc_energy_must_be_positive",
+        )
+
+    for constraint_index, constraint in enumerate(constraints, start=1):
+        constraint_name = get_constraint_name(constraint, constraint_index)
+        problem += (
+            create_nutrient_constraint(
+                constraint, nutrient_expressions, pfc_energy
+            ),
+            f"{name_prefix}{constraint_name}",
+        )
+
+
+def _resolve_relative_gap(relative_gap: float | None) -> float | None:
+    if relative_gap is None:
+        return _settings.solver_relative_gap
+    return relative_gap
+
+
+def is_solution_proven_optimal(
+    problem: LpProblem, relative_gap: float | None = None
+) -> bool:
+    return (
+        problem.sol_status == LpSolutionOptimal
+        and not _resolve_relative_gap(relative_gap)
+    )
+
+
+def create_solver(
+    mip: bool = True,
+    relative_gap: float | None = None,
+    warm_start: bool = False,
+    solver_name: str | None = None,
+) -> LpSolver:
+    if solver_name is None:
+        solver_name = _settings.solver_name
+    solver_options: dict[str, float | int | bool | None] = {
+        "mip": mip,
+        "msg": _settings.solver_message,
+        "timeLimit": _settings.solver_time_limit_seconds,
+        "gapRel": _resolve_relative_gap(relative_gap),
+        "threads": _settings.solver_threads,
+        "warmStart": (
+            True
+            if warm_start and solver_name in _WARM_START_SOLVER_NAMES
+            else None
+        ),
+    }
+    solver = getSolver(
+        solver_name,
+        **{
+            option: value
+            for option, value in solver_options.items()
+            if value is not None
+        },
+    )
+    _raise_if_unavailable(solver, solver_name)
+    return solver
+
+
+def check_solver_available(solver_name: str | None = None) -> None:
+    if solver_name is None:
+        solver_name = _settings.solver_name
+    _raise_if_unavailable(getSolver(solver_name), solver_name)
+
+
+def _raise_if_unavailable(solver: LpSolver, solver_name: str) -> None:
+    if not solver.available():
+        raise RuntimeError(f"Solver is not available: {solver_name}.")
 
 
 class NutritionOptimizer:
-    _PERCENTAGE_FACTOR = 100
-    _PFC_ENERGY_EPSILON = 1e-6
+    _FEASIBILITY_TOLERANCE = 1e-6
+    _MAX_REPAIR_CANDIDATES = 4096
+    _SENSITIVITY_DIGITS = 4
 
     def __init__(
         self,
         food_information: list[FoodInformation],
         objective: Objective,
         constraints: list[Constraint],
+        solve_mode: SolveMode = "exact",
+        max_food_count: int | None = None,
+        solver_name: str | None = None,
     ) -> None:
         self._food_information = food_information
         self._objective = objective
         self._constraints = constraints
-        self._validate_food_names_are_unique()
+        self._solve_mode = solve_mode
+        self._max_food_count = max_food_count
+        self._solver_name = solver_name
+        validate_food_names_are_unique(
+            item.name for item in self._food_information
+        )
+        self._validate_max_food_count()
+        self._presolved_foods: PresolvedFoods = presolve_foods(
+            self._food_information
+        )
 
-        self._food_intake_grams_variables: dict[str, LpVariable] = {}
+        self._food_intake_unit_variables: dict[str, LpVariable] = {}
+        self._food_selection_variables: dict[str, LpVariable] = {}
+        self._nutrient_coefficient_matrix: tuple[tuple[float, ...], ...] = ()
         self._problem: LpProblem = self._create_lp_problem()
         self._objective_variables: dict[str, float | LpAffineExpression] = {
             nutrient: 0.0 for nutrient in NUTRIENT_KEYS
         }
+        self._pfc_energy: float | LpAffineExpression = 0.0
+        self._proven_optimal = False
+        self._within_relative_gap = False
+        self._is_prepared = False
+        self._phase_timer = PhaseTimer()
 
-    def _validate_food_names_are_unique(self) -> None:
-        food_names = [item.name for item in self._food_information]
-        duplicate_food_names = {
-            food_name
-            for food_name in food_names
-            if food_names.count(food_name) > 1
-        }
-        if duplicate_food_names:
-            duplicate_names = ", ".join(sorted(duplicate_food_names))
-            raise ValueError(f"Food names must be unique: {duplicate_names}.")
+    def _validate_max_food_count(self) -> None:
+        if self._max_food_count is not None and self._max_food_count < 1:
+            raise ValueError(
+                "Maximum food count must be at least 1."
+                f" Got {self._max_food_count}."
+            )
+
+    def _count_fixed_selected_foods(self) -> int:
+        return sum(
+            grams > 0
+            for grams in self._presolved_foods.fixed_food_intake_grams.values()
+        )
+
+    def _has_food_count_limit(self) -> bool:
+        return self._max_food_count is not None and self._max_food_count < (
+            len(self._presolved_foods.variable_foods)
+            + self._count_fixed_selected_foods()
+        )
 
-    def _setup_food_intake_grams_variables(self) -> None:
-        _logger.info("Setting up food intake gram variables.")
+    def _setup_food_intake_unit_variables(self) -> None:
+        _logger.info("Setting up food intake unit variables.")
 
-        for food_information in self._food_information:
-            self._food_intake_grams_variables[food_information.name] = (
+        for food_information in self._presolved_foods.variable_foods:
+            self._food_intake_unit_variables[food_information.name] = (
                 self._problem.add_variable(
                     food_information.name,
-                    lowBound=food_information.minimum_intake_grams,
-                    upBound=food_information.maximum_intake_grams,
+                    lowBound=food_information.minimum_intake_units,
+                    upBound=food_information.maximum_intake_units,
                     cat=LpInteger,
                 )
             )
 
-        _logger.info("Completed setting up food intake gram variables.")
+        _logger.info("Completed setting up food intake unit variables.")
 
     def _get_objective_variable(
         self, nutrient: str
@@ -105,211 +332,871 @@ class NutritionOptimizer:
     def _setup_objective_variables(self) -> None:
         _logger.info("Setting up objective variables.")
 
-        for food_information in self._food_information:
-            for nutrient in NUTRIENT_KEYS:
-                nutrient_value = getattr(food_information, nutrient)
-                objective_variable = (
-                    nutrient_value
-                    * self._food_intake_grams_variables[food_information.name]
-                    / NUTRIENT_REFERENCE_GRAMS
+        variable_foods = self._presolved_foods.variable_foods
+        food_intake_unit_variables = [
+            self._food_intake_unit_variables[food_information.name]
+            for food_information in variable_foods
+        ]
+        grams_per_unit = [
+            food_information.grams_per_unit
+            for food_information in variable_foods
+        ]
+        self._nutrient_coefficient_matrix = build_nutrient_coefficient_matrix(
+            self._food_information
+        )
+        fixed_nutrient_values = self._calculate_total_nutrient_values(
+            tuple(
+                self._presolved_foods.fixed_food_intake_grams.get(
+                    food_information.name, 0
                 )
+                for food_information in self._food_information
+            )
+        )
 
-                current_objective_variables = self._get_objective_variable(
-                    nutrient
-                )
-                self._update_objective_variable(
-                    nutrient,
-                    current_objective_variables + objective_variable,
-                )
+        for nutrient, coefficients in zip(
+            NUTRIENT_KEYS,
+            build_nutrient_coefficient_matrix(variable_foods),
+            strict=True,
+        ):
+            self._update_objective_variable(
+                nutrient,
+                LpAffineExpression(
+                    zip(
+                        food_intake_unit_variables,
+                        map(mul, coefficients, grams_per_unit),
+                        strict=True,
+                    ),
+                    constant=fixed_nutrient_values[nutrient],
+                ),
+            )
 
         _logger.info("Completed setting up objective variables.")
 
-    def _apply_amount_or_energy_constraint(
-        self, constraint: Constraint, constraint_index: int
-    ) -> None:
-        constraint_operations = {
-            "max": lambda objective_variable, value: (
-                objective_variable <= value
-            ),
-            "min": lambda objective_variable, value: (
-                objective_variable >= value
-            ),
-        }
+    def _setup_energy_expressions(self) -> None:
+        _logger.info("Setting up energy expressions.")
+
+        self._pfc_energy = create_pfc_energy_expression(
+            self._objective_variables
+        )
+
+        _logger.info("Completed setting up energy expressions.")
+
+    def _create_constraint(self, constraint: Constraint) -> LpConstraint:
+        return create_nutrient_constraint(
+            constraint, self._objective_variables, self._pfc_energy
+        )
 
-        constraint_name = (
-            f"{constraint_index}_{constraint.min_max}_"
-            f"{constraint.nutrient}_{constraint.unit}"
+    def _setup_constraints(self) -> None:
+        _logger.info("Setting up constraints.")
+
+        add_nutrient_constraints(
+            self._problem,
+            self._constraints,
+            self._objective_variables,
+            self._pfc_energy,
         )
-        objective_variable = self._get_objective_variable(constraint.nutrient)
 
+        _logger.info("Completed setting up constraints.")
+
+    def _setup_food_count_constraint(self) -> None:
+        if not self._has_food_count_limit():
+            return
+
+        _logger.info("Setting up food selection variables.")
+
+        for food_index, food_information in enumerate(
+            self._presolved_foods.variable_foods
+        ):
+            is_selected = self._problem.add_variable(
+                f"food_{food_index}_selected", cat=LpBinary
+            )
+            self._problem += (
+                self._food_intake_unit_variables[food_information.name]
+                <= food_information.maximum_intake_units * is_selected,
+                f"food_{food_index}_selected",
+            )
+            self._food_selection_variables[food_information.name] = is_selected
         self._problem += (
-            constraint_operations[constraint.min_max](
-                objective_variable, constraint.value
+            lpSum(self._food_selection_variables.values())
+            <= cast(int, self._max_food_count)
+            - self._count_fixed_selected_foods(),
+            "max_food_count",
+        )
+
+        _logger.info("Completed setting up food selection variables.")
+
+    def _get_food_intake_grams(self, food_information: FoodInformation) -> int:
+        fixed_food_intake_grams = self._presolved_foods.fixed_food_intake_grams
+        if food_information.name in fixed_food_intake_grams:
+            return fixed_food_intake_grams[food_information.name]
+
+        food_intake_units = self._food_intake_unit_variables[
+            food_information.name
+        ].varValue
+        if food_intake_units is None:
+            return (
+                food_information.minimum_intake_units
+                * food_information.grams_per_unit
+            )
+
+        return int(round(food_intake_units)) * food_information.grams_per_unit
+
+    def _read_food_intake_grams(self) -> tuple[int, ...]:
+        return tuple(
+            self._get_food_intake_grams(food_information)
+            for food_information in self._food_information
+        )
+
+    def _calculate_total_nutrient_values(
+        self, food_intake_grams: tuple[int, ...]
+    ) -> dict[str, float]:
+        return {
+            nutrient: sumprod(coefficients, food_intake_grams)
+            for nutrient, coefficients in zip(
+                NUTRIENT_KEYS, self._nutrient_coefficient_matrix, strict=True
+            )
+        }
+
+    def _is_proven_optimal(self) -> bool:
+        return self._proven_optimal
+
+    def _rank_foods_by_relaxed_intake(self) -> list[FoodInformation] | None:
+        relaxed_intake_units = NutritionOptimizer(
+            self._food_information,
+            self._objective,
+            self._constraints,
+            solver_name=self._solver_name,
+        ).solve_food_intake_units(mip=False)
+        if relaxed_intake_units is None:
+            return None
+
+        return sorted(
+            self._presolved_foods.variable_foods,
+            key=lambda item: (
+                item.minimum_intake_grams > 0,
+                relaxed_intake_units[item.name] * item.grams_per_unit,
             ),
-            constraint_name,
+            reverse=True,
         )
 
-    def _get_nutrient_energy_per_gram(self, nutrient: str) -> int:
-        energy_per_gram = NUTRIENTS_BY_KEY[nutrient].energy_per_gram
-        if energy_per_gram is None:
-            raise RuntimeError(
-                f"Nutrient has no energy conversion factor: {nutrient}."
+    def _solve_restricted_problem(
+        self, selected_food_names: set[str]
+    ) -> dict[str, float] | None:
+        return NutritionOptimizer(
+            [
+                item
+                if item.name in selected_food_names
+                or item.name in self._presolved_foods.fixed_food_intake_grams
+                else replace(
+                    item, minimum_intake_grams=0, maximum_intake_grams=0
+                )
+                for item in self._food_information
+            ],
+            self._objective,
+            self._constraints,
+            solver_name=self._solver_name,
+        ).solve_food_intake_units()
+
+    def _set_food_count_warm_start(self) -> bool:
+        _logger.info("Searching for an initial food selection.")
+
+        ranked_foods = self._rank_foods_by_relaxed_intake()
+        if ranked_foods is None:
+            return False
+
+        selectable_count = (
+            cast(int, self._max_food_count)
+            - self._count_fixed_selected_foods()
+        )
+        restricted_intake_units = self._solve_restricted_problem(
+            {item.name for item in ranked_foods[: max(selectable_count, 0)]}
+        )
+        if restricted_intake_units is None:
+            _logger.info("No initial food selection was found.")
+            return False
+
+        initial_intake_units = {
+            food_information.name: round(
+                restricted_intake_units[food_information.name]
             )
-        return energy_per_gram
+            for food_information in self._presolved_foods.variable_foods
+        }
+        if any(
+            not food_information.minimum_intake_units
+            <= initial_intake_units[food_information.name]
+            <= food_information.maximum_intake_units
+            for food_information in self._presolved_foods.variable_foods
+        ):
+            _logger.info("Initial food selection violates food bounds.")
+            return False
 
-    def _calculate_pfc_energy(
-        self,
-    ) -> float | LpAffineExpression:
-        pfc_energy: float | LpAffineExpression = 0.0
-        for nutrient in NUTRIENT_KEYS:
-            if nutrient == "energy":
+        for food_information in self._presolved_foods.variable_foods:
+            food_intake_units = initial_intake_units[food_information.name]
+            self._food_intake_unit_variables[
+                food_information.name
+            ].setInitialValue(food_intake_units)
+            self._food_selection_variables[
+                food_information.name
+            ].setInitialValue(int(food_intake_units > 0))
+        return True
+
+    def _solve_mip(self, warm_start: bool = False) -> SolutionMethod:
+        relative_gap = None
+        if self._has_food_count_limit():
+            relative_gap = _settings.food_count_relative_gap
+            warm_start = self._set_food_count_warm_start() or warm_start
+        self._problem.solve(
+            create_solver(
+                relative_gap=relative_gap,
+                warm_start=warm_start,
+                solver_name=self._solver_name,
+            )
+        )
+        self._proven_optimal = is_solution_proven_optimal(
+            self._problem, relative_gap
+        )
+        self._within_relative_gap = (
+            self._problem.sol_status == LpSolutionOptimal
+        )
+        return "mip"
+
+    def _is_within_constraint(self, sense: int, value: float) -> bool:
+        if sense == LpConstraintEQ:
+            return abs(value) <= self._FEASIBILITY_TOLERANCE
+        return value * sense >= -self._FEASIBILITY_TOLERANCE
+
+    def _create_repair_offsets(
+        self, fractional_variables: list[LpVariable]
+    ) -> list[range]:
+        window_size = max(
+            2,
+            floor(
+                self._MAX_REPAIR_CANDIDATES
+                ** (1 / max(len(fractional_variables), 1))
+            ),
+        )
+        lowest_offset = 1 - window_size // 2
+        return [
+            range(
+                max(lowest_offset, int(variable.lowBound - variable.varValue)),
+                min(
+                    lowest_offset + window_size,
+                    int(variable.upBound - variable.varValue) + 1,
+                ),
+            )
+            for variable in fractional_variables
+        ]
+
+    def _find_best_repair(
+        self, fractional_variables: list[LpVariable]
+    ) -> tuple[int, ...] | None:
+        constraints = self._problem.constraints()
+        base_values = [constraint.value() or 0.0 for constraint in constraints]
+        constraint_steps = [
+            [
+                constraint.get(variable, 0.0)
+                for variable in fractional_variables
+            ]
+            for constraint in constraints
+        ]
+        objective = self._problem.objective or LpAffineExpression()
+        objective_steps = [
+            objective.get(variable, 0.0) for variable in fractional_variables
+        ]
+        direction = 1 if self._objective.sense == "maximize" else -1
+
+        best_offsets: tuple[int, ...] | None = None
+        best_score = -inf
+        for offsets in product(
+            *self._create_repair_offsets(fractional_variables)
+        ):
+            if not all(
+                self._is_within_constraint(
+                    constraint.sense, base_value + sumprod(steps, offsets)
+                )
+                for constraint, base_value, steps in zip(
+                    constraints, base_values, constraint_steps, strict=True
+                )
+            ):
                 continue
-            pfc_energy += self._get_objective_variable(
-                nutrient
-            ) * self._get_nutrient_energy_per_gram(nutrient)
-        return pfc_energy
+            score = direction * sumprod(objective_steps, offsets)
+            if score > best_score:
+                best_offsets, best_score = offsets, score
+        return best_offsets
+
+    def _closes_relaxation_gap(self, relaxation_objective: float) -> bool:
+        rounded_objective = self._problem.objective.value() or 0.0
+        if self._objective.sense == "maximize":
+            return (
+                rounded_objective
+                >= relaxation_objective - self._FEASIBILITY_TOLERANCE
+            )
+        return (
+            rounded_objective
+            <= relaxation_objective + self._FEASIBILITY_TOLERANCE
+        )
+
+    def _repair_relaxed_solution(self) -> bool:
+        relaxation_objective = self._problem.objective.value() or 0.0
+
+        fractional_variables = []
+        for variable in self._food_intake_unit_variables.values():
+            relaxed_units = variable.varValue or 0.0
+            floored_units = floor(relaxed_units + self._FEASIBILITY_TOLERANCE)
+            if relaxed_units - floored_units > self._FEASIBILITY_TOLERANCE:
+                fractional_variables.append(variable)
+            variable.varValue = floored_units
+
+        if 2 ** len(fractional_variables) > self._MAX_REPAIR_CANDIDATES:
+            return False
+
+        offsets = self._find_best_repair(fractional_variables)
+        if offsets is None:
+            return False
+
+        for variable, offset in zip(
+            fractional_variables, offsets, strict=True
+        ):
+            variable.varValue = (variable.varValue or 0) + offset
+        self._proven_optimal = self._closes_relaxation_gap(
+            relaxation_objective
+        )
+        return True
+
+    def _solve_by_lp_rounding(self) -> SolutionMethod:
+        _logger.info("Solving the continuous relaxation.")
+        self._within_relative_gap = False
+        self._problem.solve(
+            create_solver(mip=False, solver_name=self._solver_name)
+        )
 
-    def _apply_pfc_ratio_constraint(
+        relaxation_result = LpStatus[self._problem.status]
+        if relaxation_result == "Infeasible":
+            return "lp_rounding"
+        if relaxation_result == "Optimal" and self._repair_relaxed_solution():
+            _logger.info("Rounded relaxation satisfies all constraints.")
+            return "lp_rounding"
+
+        _logger.info("Rounding repair failed. Falling back to MIP.")
+        return self._solve_mip()
+
+    def _calculate_constraint_activity(
+        self, constraint: Constraint, total_nutrient_values: dict[str, float]
+    ) -> float:
+        if constraint.unit != "pfc_ratio":
+            return total_nutrient_values[constraint.nutrient]
+
+        pfc_energy = sum(
+            total_nutrient_values[nutrient]
+            * get_nutrient_energy_per_gram(nutrient)
+            for nutrient in NUTRIENT_KEYS
+            if nutrient != "energy"
+        )
+        if pfc_energy == 0:
+            return 0.0
+        return (
+            total_nutrient_values[constraint.nutrient]
+            * get_nutrient_energy_per_gram(constraint.nutrient)
+            / pfc_energy
+            * PERCENTAGE_FACTOR
+        )
+
+    def _calculate_constraint_slack(
+        self, constraint: Constraint, total_nutrient_values: dict[str, float]
+    ) -> float:
+        activity = self._calculate_constraint_activity(
+            constraint, total_nutrient_values
+        )
+        if constraint.min_max == "max":
+            return constraint.value - activity
+        return activity - constraint.value
+
+    def _get_shadow_price(
         self, constraint: Constraint, constraint_index: int
-    ) -> None:
-        objective_variable = self._get_objective_variable(constraint.nutrient)
-        pfc_energy = self._calculate_pfc_energy()
-        nutrient_energy_per_gram = self._get_nutrient_energy_per_gram(
-            constraint.nutrient
+    ) -> float:
+        lp_constraint = self._problem.get_constraint_by_name(
+            get_constraint_name(constraint, constraint_index)
         )
-        total_nutrient_energy = objective_variable * nutrient_energy_per_gram
+        shadow_price = abs(lp_constraint.pi or 0.0) if lp_constraint else 0.0
+        if constraint.unit == "pfc_ratio":
+            pfc_energy = cast(LpAffineExpression, self._pfc_energy).value()
+            shadow_price *= (pfc_energy or 0.0) / PERCENTAGE_FACTOR
+        shadow_price = round(shadow_price, self._SENSITIVITY_DIGITS)
 
-        calculation_factor = constraint.value / self._PERCENTAGE_FACTOR
-        comparison_operations = {
-            "max": lambda nutrient_energy: (
-                nutrient_energy <= pfc_energy * calculation_factor
-            ),
-            "min": lambda nutrient_energy: (
-                nutrient_energy >= pfc_energy * calculation_factor
-            ),
-        }
+        raising_value_increases_objective = (constraint.min_max == "max") == (
+            self._objective.sense == "maximize"
+        )
+        return (
+            shadow_price
+            if raising_value_increases_objective
+            else -shadow_price or 0.0
+        )
 
-        self._problem += (
-            comparison_operations[constraint.min_max](total_nutrient_energy),
-            f"{constraint_index}_{constraint.min_max}_"
-            f"{constraint.nutrient}_{constraint.unit}",
+    def _get_reduced_cost(
+        self, variable: LpVariable, grams_per_unit: int
+    ) -> float:
+        reduced_cost = round(
+            abs(variable.dj or 0.0) / grams_per_unit, self._SENSITIVITY_DIGITS
+        )
+        is_at_upper_bound = (
+            variable.upBound is not None
+            and (variable.varValue or 0.0)
+            >= variable.upBound - self._FEASIBILITY_TOLERANCE
+        )
+        improves_objective = is_at_upper_bound == (
+            self._objective.sense == "maximize"
         )
+        return reduced_cost if improves_objective else -reduced_cost or 0.0
 
-    def _setup_constraints(self) -> None:
-        _logger.info("Setting up constraints.")
+    def _analyze_sensitivity(
+        self,
+        food_intake_grams: tuple[int, ...],
+        total_nutrient_values: dict[str, float],
+    ) -> SensitivityAnalysis | None:
+        _logger.info("Solving the continuous relaxation for sensitivity.")
+        self._problem.solve(
+            create_solver(mip=False, solver_name=self._solver_name)
+        )
+        relaxation_result = LpStatus[self._problem.status]
 
-        apply_methods = {
-            "amount": self._apply_amount_or_energy_constraint,
-            "energy": self._apply_amount_or_energy_constraint,
-            "pfc_ratio": self._apply_pfc_ratio_constraint,
-        }
+        sensitivity: SensitivityAnalysis | None = None
+        if relaxation_result == "Optimal":
+            constraint_sensitivities: list[ConstraintSensitivity] = [
+                {
+                    "min_max": constraint.min_max,
+                    "nutrient": constraint.nutrient,
+                    "unit": constraint.unit,
+                    "value": constraint.value,
+                    "slack": round(
+                        self._calculate_constraint_slack(
+                            constraint, total_nutrient_values
+                        ),
+                        1,
+                    ),
+                    "shadow_price": self._get_shadow_price(
+                        constraint, constraint_index
+                    ),
+                }
+                for constraint_index, constraint in enumerate(
+                    self._constraints, start=1
+                )
+            ]
+            sensitivity = {
+                "constraints": constraint_sensitivities,
+                "food_reduced_costs": {
+                    food_information.name: self._get_reduced_cost(
+                        self._food_intake_unit_variables[
+                            food_information.name
+                        ],
+                        food_information.grams_per_unit,
+                    )
+                    for food_information in (
+                        self._presolved_foods.variable_foods
+                    )
+                },
+            }
+        else:
+            _logger.warning(
+                "Skipping sensitivity analysis because the relaxation "
+                f"finished with status: {relaxation_result}"
+            )
+
+        for food_information, grams in zip(
+            self._food_information, food_intake_grams, strict=True
+        ):
+            variable = self._food_intake_unit_variables.get(
+                food_information.name
+            )
+            if variable is not None:
+                variable.varValue = grams // food_information.grams_per_unit
+        return sensitivity
 
+    def _add_elastic_constraints(
+        self, elastic_problem: LpProblem
+    ) -> list[LpVariable]:
         if any(
             constraint.unit == "pfc_ratio" for constraint in self._constraints
         ):
-            self._problem += (
-                self._calculate_pfc_energy() >= self._PFC_ENERGY_EPSILON,
+            elastic_problem += (
+                self._pfc_energy >= PFC_ENERGY_EPSILON,
                 "pfc_energy_must_be_positive",
             )
 
+        violation_variables = []
         for constraint_index, constraint in enumerate(
             self._constraints, start=1
         ):
-            apply_methods[constraint.unit](constraint, constraint_index)
+            constraint_name = get_constraint_name(constraint, constraint_index)
+            violation = elastic_problem.add_variable(
+                f"{constraint_name}_violation", lowBound=0
+            )
+            lp_constraint = self._create_constraint(constraint)
+            elastic_problem += (
+                lp_constraint + lp_constraint.sense * violation,
+                constraint_name,
+            )
+            violation_variables.append(violation)
+        return violation_variables
 
-        _logger.info("Completed setting up constraints.")
+    def _add_elastic_food_count(
+        self, elastic_problem: LpProblem
+    ) -> tuple[dict[str, LpVariable], list[LpVariable]]:
+        if not self._has_food_count_limit():
+            return {}, []
 
-    def _get_food_intake_grams(self, food_information: FoodInformation) -> int:
-        food_intake_grams = self._food_intake_grams_variables[
-            food_information.name
-        ].varValue
-        if food_intake_grams is None:
-            return food_information.minimum_intake_grams
+        selection_variables = {
+            food_information.name: elastic_problem.add_variable(
+                f"food_{food_index}_selected", cat=LpBinary
+            )
+            for food_index, food_information in enumerate(
+                self._presolved_foods.variable_foods
+            )
+        }
+        count_violation = elastic_problem.add_variable(
+            "max_food_count_violation", lowBound=0
+        )
+        elastic_problem += (
+            lpSum(selection_variables.values()) - count_violation
+            <= cast(int, self._max_food_count)
+            - self._count_fixed_selected_foods(),
+            "max_food_count",
+        )
+        return selection_variables, [count_violation]
 
-        return int(round(food_intake_grams))
+    def _add_elastic_food_bounds(
+        self,
+        elastic_problem: LpProblem,
+        selection_variables: dict[str, LpVariable],
+    ) -> list[LpVariable]:
+        violation_variables = []
+        for food_index, food_information in enumerate(
+            self._presolved_foods.variable_foods
+        ):
+            variable = self._food_intake_unit_variables[food_information.name]
+            variable.lowBound, variable.upBound = 0, None
 
-    def _calculate_food_intake_grams(self) -> dict[str, int]:
-        return {
-            food_information.name: self._get_food_intake_grams(
-                food_information
+            maximum_violation = elastic_problem.add_variable(
+                f"food_{food_index}_maximum_violation", lowBound=0
             )
-            for food_information in self._food_information
-        }
+            maximum_intake_grams: int | LpAffineExpression = (
+                food_information.maximum_intake_grams
+            )
+            if food_information.name in selection_variables:
+                maximum_intake_grams = (
+                    food_information.maximum_intake_grams
+                    * selection_variables[food_information.name]
+                )
+            grams = variable * food_information.grams_per_unit
+            elastic_problem += (
+                grams - maximum_violation <= maximum_intake_grams,
+                f"food_{food_index}_maximum",
+            )
+            violation_variables.append(maximum_violation)
+            if food_information.minimum_intake_grams == 0:
+                continue
 
-    def _calculate_total_nutrient_value(self, nutrient: str) -> float:
-        return sum(
-            getattr(food_information, nutrient)
-            * self._get_food_intake_grams(food_information)
-            / NUTRIENT_REFERENCE_GRAMS
-            for food_information in self._food_information
-        )
+            minimum_violation = elastic_problem.add_variable(
+                f"food_{food_index}_minimum_violation",
+                lowBound=0,
+                upBound=food_information.minimum_intake_grams,
+            )
+            elastic_problem += (
+                grams + minimum_violation
+                >= food_information.minimum_intake_grams,
+                f"food_{food_index}_minimum",
+            )
+            violation_variables.append(minimum_violation)
+        return violation_variables
+
+    def _find_constraint_violations(
+        self, total_nutrient_values: dict[str, float]
+    ) -> list[ConstraintViolation]:
+        constraint_violations: list[ConstraintViolation] = []
+        for constraint in self._constraints:
+            violation = -self._calculate_constraint_slack(
+                constraint, total_nutrient_values
+            )
+            if violation > self._FEASIBILITY_TOLERANCE:
+                constraint_violations.append(
+                    {
+                        "min_max": constraint.min_max,
+                        "nutrient": constraint.nutrient,
+                        "unit": constraint.unit,
+                        "value": constraint.value,
+                        "violation": round(violation, 1),
+                    }
+                )
+        return constraint_violations
+
+    def _find_food_bound_violations(
+        self, food_intake_grams: tuple[int, ...]
+    ) -> list[FoodBoundViolation]:
+        food_bound_violations: list[FoodBoundViolation] = []
+        for food_information, grams in zip(
+            self._food_information, food_intake_grams, strict=True
+        ):
+            if grams < food_information.minimum_intake_grams:
+                food_bound_violations.append(
+                    {
+                        "food_name": food_information.name,
+                        "bound": "minimum",
+                        "value": food_information.minimum_intake_grams,
+                        "violation": (
+                            food_information.minimum_intake_grams - grams
+                        ),
+                    }
+                )
+            elif grams > food_information.maximum_intake_grams:
+                food_bound_violations.append(
+                    {
+                        "food_name": food_information.name,
+                        "bound": "maximum",
+                        "value": food_information.maximum_intake_grams,
+                        "violation": (
+                            grams - food_information.maximum_intake_grams
+                        ),
+                    }
+                )
+        return food_bound_violations
 
-    def _calculate_total_nutrient_values(self) -> dict[str, float]:
+    def _find_food_count_violation(
+        self, food_intake_grams: tuple[int, ...]
+    ) -> FoodCountViolation | None:
+        if self._max_food_count is None:
+            return None
+
+        food_count = sum(grams > 0 for grams in food_intake_grams)
+        if food_count <= self._max_food_count:
+            return None
         return {
-            nutrient: round(self._calculate_total_nutrient_value(nutrient), 1)
-            for nutrient in NUTRIENT_KEYS
+            "value": self._max_food_count,
+            "violation": food_count - self._max_food_count,
         }
 
-    def _calculate_pfc_composition_ratio(self) -> dict[str, float]:
-        pfc_energy = sum(
-            self._calculate_total_nutrient_value(nutrient)
-            * self._get_nutrient_energy_per_gram(nutrient)
-            for nutrient in NUTRIENT_KEYS
-            if nutrient != "energy"
-        )
-        if pfc_energy == 0:
-            _logger.warning(
-                "Skipping PFC composition ratio calculation because "
-                "PFC energy is zero."
+    def _diagnose_infeasibility(self) -> InfeasibilityDiagnosis | None:
+        _logger.info("Solving the elastic problem to diagnose infeasibility.")
+
+        elastic_problem = LpProblem("minimize_violation", LpMinimize)
+        try:
+            selection_variables, count_violation_variables = (
+                self._add_elastic_food_count(elastic_problem)
             )
-            return {
-                nutrient: 0.0
-                for nutrient in NUTRIENT_KEYS
-                if nutrient != "energy"
-            }
+            violation_variables = [
+                *self._add_elastic_constraints(elastic_problem),
+                *self._add_elastic_food_bounds(
+                    elastic_problem, selection_variables
+                ),
+                *count_violation_variables,
+            ]
+            elastic_problem += (
+                lpSum(violation_variables),
+                "minimize_violation",
+            )
+            elastic_problem.solve(create_solver(solver_name=self._solver_name))
+        finally:
+            self._update_food_intake_bounds()
 
-        return {
-            nutrient: round(
-                self._calculate_total_nutrient_value(nutrient)
-                * self._get_nutrient_energy_per_gram(nutrient)
-                / pfc_energy
-                * self._PERCENTAGE_FACTOR,
-                1,
+        elastic_result = LpStatus[elastic_problem.status]
+        if elastic_result != "Optimal":
+            _logger.warning(
+                "Skipping infeasibility diagnosis because the elastic "
+                f"problem finished with status: {elastic_result}"
             )
-            for nutrient in NUTRIENT_KEYS
-            if nutrient != "energy"
+            return None
+
+        food_intake_grams = self._read_food_intake_grams()
+        diagnosis: InfeasibilityDiagnosis = {
+            "constraint_violations": self._find_constraint_violations(
+                self._calculate_total_nutrient_values(food_intake_grams)
+            ),
+            "food_bound_violations": self._find_food_bound_violations(
+                food_intake_grams
+            ),
         }
+        food_count_violation = self._find_food_count_violation(
+            food_intake_grams
+        )
+        if food_count_violation is not None:
+            diagnosis["food_count_violation"] = food_count_violation
+        return diagnosis
+
+    def _extract_optimal_result(
+        self, solution_method: SolutionMethod, include_sensitivity: bool
+    ) -> OptimalNutritionOptimizerResult:
+        food_intake_grams = self._read_food_intake_grams()
+        total_nutrient_values = self._calculate_total_nutrient_values(
+            food_intake_grams
+        )
+        pfc_composition_ratio = calculate_pfc_composition_ratio(
+            total_nutrient_values
+        )
+
+        result: OptimalNutritionOptimizerResult = {
+            "status": "Optimal",
+            "is_proven_optimal": self._is_proven_optimal(),
+            "solution_method": solution_method,
+            "food_intake_grams": {
+                food_information.name: grams
+                for food_information, grams in zip(
+                    self._food_information, food_intake_grams, strict=True
+                )
+            },
+            "total_nutrient_values": {
+                nutrient: round(total_nutrient_value, 1)
+                for nutrient, total_nutrient_value in (
+                    total_nutrient_values.items()
+                )
+            },
+            "pfc_composition_ratio": pfc_composition_ratio,
+        }
+        if include_sensitivity:
+            sensitivity = self._analyze_sensitivity(
+                food_intake_grams, total_nutrient_values
+            )
+            if sensitivity is not None:
+                result["sensitivity"] = sensitivity
+        return result
 
     def _preparation(self) -> None:
         _logger.info("Starting preparation for solve.")
 
-        self._setup_food_intake_grams_variables()
-        self._setup_objective_variables()
-        self._setup_objective()
-        self._setup_constraints()
+        with self._phase_timer.measure("variable_setup"):
+            self._setup_food_intake_unit_variables()
+        with self._phase_timer.measure("objective_setup"):
+            self._setup_objective_variables()
+            self._setup_energy_expressions()
+            self._setup_objective()
+        with self._phase_timer.measure("constraint_setup"):
+            self._setup_constraints()
+            self._setup_food_count_constraint()
+        self._is_prepared = True
 
         _logger.info("Completed preparation for solve.")
 
-    def solve(self) -> NutritionOptimizerResult:
-        self._preparation()
+    def _has_same_model_structure(
+        self,
+        food_information: list[FoodInformation],
+        objective: Objective,
+        constraints: list[Constraint],
+    ) -> bool:
+        return (
+            objective == self._objective
+            and presolve_foods(food_information).fixed_food_intake_grams
+            == self._presolved_foods.fixed_food_intake_grams
+            and [
+                (
+                    item.name,
+                    item.grams_per_unit,
+                    *(getattr(item, key) for key in NUTRIENT_KEYS),
+                )
+                for item in food_information
+            ]
+            == [
+                (
+                    item.name,
+                    item.grams_per_unit,
+                    *(getattr(item, key) for key in NUTRIENT_KEYS),
+                )
+                for item in self._food_information
+            ]
+            and [
+                (item.min_max, item.nutrient, item.unit)
+                for item in constraints
+            ]
+            == [
+                (item.min_max, item.nutrient, item.unit)
+                for item in self._constraints
+            ]
+        )
+
+    def _update_food_intake_bounds(self) -> None:
+        for food_information in self._presolved_foods.variable_foods:
+            variable = self._food_intake_unit_variables[food_information.name]
+            variable.lowBound = food_information.minimum_intake_units
+            variable.upBound = food_information.maximum_intake_units
+
+    def _update_constraint(
+        self, constraint: Constraint, constraint_index: int
+    ) -> None:
+        existing_constraint = self._problem.get_constraint_by_name(
+            get_constraint_name(constraint, constraint_index)
+        )
+        if existing_constraint is None:
+            raise RuntimeError(
+                f"Constraint is missing from the model: {constraint}."
+            )
+
+        if constraint.unit != "pfc_ratio":
+            nutrient_expression = cast(
+                LpAffineExpression,
+                self._get_objective_variable(constraint.nutrient),
+            )
+            existing_constraint.changeRHS(
+                constraint.value - nutrient_expression.constant
+            )
+            return
+
+        replacement = self._create_constraint(constraint)
+        existing_constraint.expr = replacement.expr
+        existing_constraint.changeRHS(-replacement.constant)
+
+    def _update_constraints(self) -> None:
+        for constraint_index, constraint in enumerate(
+            self._constraints, start=1
+        ):
+            self._update_constraint(constraint, constraint_index)
+
+    def _set_warm_start_values(self) -> None:
+        for variable in self._food_intake_unit_variables.values():
+            previous_units = variable.varValue
+            if previous_units is None:
+                continue
+            variable.setInitialValue(
+                min(
+                    max(round(previous_units), variable.lowBound or 0),
+                    variable.upBound or 0,
+                )
+            )
 
+    def _create_solve_metrics(self) -> SolveMetrics:
+        return {
+            "phase_seconds": self._phase_timer.phase_seconds(),
+            "model_size": count_model_size(
+                self._problem, self._presolved_foods
+            ),
+        }
+
+    def _solve_prepared_problem(
+        self, include_sensitivity: bool, warm_start: bool = False
+    ) -> NutritionOptimizerResult:
         _logger.info("Starting to solve the optimization problem.")
-        self._problem.solve()
+        with self._phase_timer.measure("solve"):
+            solution_method = (
+                self._solve_by_lp_rounding()
+                if self._solve_mode == "fast"
+                and not self._has_food_count_limit()
+                else self._solve_mip(warm_start)
+            )
+        with self._phase_timer.measure("result_extraction"):
+            result = self._extract_result(solution_method, include_sensitivity)
+
+        result["solve_metrics"] = self._create_solve_metrics()
+        _logger.info(f"Solve metrics: {result['solve_metrics']}")
+        return result
 
+    def _extract_result(
+        self, solution_method: SolutionMethod, include_sensitivity: bool
+    ) -> NutritionOptimizerResult:
         solution_result = LpStatus[self._problem.status]
         if solution_result == "Optimal":
+            if not self._is_proven_optimal():
+                _logger.warning(
+                    "Solver stopped at its limits before proving optimality."
+                )
             _logger.info("Optimization completed successfully.")
-
-            food_intake_grams = self._calculate_food_intake_grams()
-            total_nutrient_values = self._calculate_total_nutrient_values()
-            pfc_composition_ratio = self._calculate_pfc_composition_ratio()
-
-            return {
-                "status": solution_result,
-                "food_intake_grams": food_intake_grams,
-                "total_nutrient_values": total_nutrient_values,
-                "pfc_composition_ratio": pfc_composition_ratio,
-            }
+            return self._extract_optimal_result(
+                solution_method, include_sensitivity
+            )
 
         _logger.warning(f"Optimization failed with status: {solution_result}")
         error_code = (
@@ -317,7 +1204,134 @@ class NutritionOptimizer:
             if solution_result == "Infeasible"
             else "optimization_failed"
         )
-        return {
+        result: FailedNutritionOptimizerResult = {
             "status": solution_result,
             "error_code": error_code,
         }
+        if (
+            solution_result == "Infeasible"
+            and _settings.diagnose_infeasibility
+        ):
+            diagnosis = self._diagnose_infeasibility()
+            if diagnosis is not None:
+                result["infeasibility_diagnosis"] = diagnosis
+        return result
+
+    def _create_sweep_point(
+        self, constraint_value: float, result: NutritionOptimizerResult
+    ) -> SweepPoint:
+        objective_value = None
+        if result["status"] == "Optimal":
+            optimal_result = cast(OptimalNutritionOptimizerResult, result)
+            objective_value = optimal_result["total_nutrient_values"][
+                self._objective.nutrient
+            ]
+
+        return {
+            "constraint_value": constraint_value,
+            "objective_value": objective_value,
+            "result": result,
+        }
+
+    def can_resolve(
+        self,
+        food_information: list[FoodInformation],
+        objective: Objective,
+        constraints: list[Constraint],
+        solve_mode: SolveMode = "exact",
+    ) -> bool:
+        return (
+            self._is_prepared
+            and self._max_food_count is None
+            and solve_mode == self._solve_mode
+            and self._has_same_model_structure(
+                food_information, objective, constraints
+            )
+        )
+
+    def resolve(
+        self,
+        food_information: list[FoodInformation],
+        constraints: list[Constraint],
+        include_sensitivity: bool = False,
+    ) -> NutritionOptimizerResult:
+        _logger.info("Applying intake bound and constraint changes.")
+
+        self._food_information = food_information
+        self._constraints = constraints
+        self._presolved_foods = presolve_foods(food_information)
+        self._phase_timer = PhaseTimer()
+        with self._phase_timer.measure("variable_setup"):
+            self._update_food_intake_bounds()
+        with self._phase_timer.measure("constraint_setup"):
+            self._update_constraints()
+        self._set_warm_start_values()
+
+        return self._solve_prepared_problem(
+            include_sensitivity, warm_start=True
+        )
+
+    def solve(
+        self, include_sensitivity: bool = False
+    ) -> NutritionOptimizerResult:
+        self._phase_timer = PhaseTimer()
+        self._preparation()
+        return self._solve_prepared_problem(include_sensitivity)
+
+    def is_within_relative_gap(self) -> bool:
+        return self._within_relative_gap
+
+    def solve_food_intake_units(
+        self, mip: bool = True
+    ) -> dict[str, float] | None:
+        self._preparation()
+        if mip:
+            self._solve_mip()
+        else:
+            self._problem.solve(
+                create_solver(mip=False, solver_name=self._solver_name)
+            )
+        if LpStatus[self._problem.status] != "Optimal":
+            return None
+
+        fixed_food_intake_grams = self._presolved_foods.fixed_food_intake_grams
+        return {
+            item.name: (
+                fixed_food_intake_grams[item.name] / item.grams_per_unit
+                if item.name in fixed_food_intake_grams
+                else self._food_intake_unit_variables[item.name].varValue
+                or 0.0
+            )
+            for item in self._food_information
+        }
+
+    def sweep(
+        self,
+        constraint_index: int,
+        constraint_values: list[float],
+        include_sensitivity: bool = False,
+    ) -> list[SweepPoint]:
+        sweep_points: list[SweepPoint] = []
+        for constraint_value in constraint_values:
+            constraint = replace(
+                self._constraints[constraint_index], value=constraint_value
+            )
+            self._constraints = [*self._constraints]
+            self._constraints[constraint_index] = constraint
+
+            if self._is_prepared:
+                _logger.info(f"Re-optimizing with {constraint}.")
+                self._phase_timer = PhaseTimer()
+                with self._phase_timer.measure("constraint_setup"):
+                    self._update_constraint(constraint, constraint_index + 1)
+                self._set_warm_start_values()
+                result = self._solve_prepared_problem(
+                    include_sensitivity, warm_start=True
+                )
+            else:
+                result = self.solve(include_sensitivity)
+            sweep_points.append(
+                self._create_sweep_point(constraint_value, result)
+            )
+
+        return sweep_points
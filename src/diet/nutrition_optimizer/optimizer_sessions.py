@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from time import monotonic
+
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    SolveMode,
+)
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+
+
+class OptimizerSessionStore:
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._sessions: OrderedDict[str, tuple[float, NutritionOptimizer]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def solve(
+        self,
+        session_id: str,
+        food_information: list[FoodInformation],
+        objective: Objective,
+        constraints: list[Constraint],
+        solve_mode: SolveMode = "exact",
+        include_sensitivity: bool = False,
+    ) -> NutritionOptimizerResult:
+        nutrition_optimizer = self._take(session_id)
+        if nutrition_optimizer is not None and nutrition_optimizer.can_resolve(
+            food_information, objective, constraints, solve_mode
+        ):
+            _logger.info(f"Re-optimizing session model: {session_id}")
+            result = nutrition_optimizer.resolve(
+                food_information, constraints, include_sensitivity
+            )
+        else:
+            nutrition_optimizer = NutritionOptimizer(
+                food_information, objective, constraints, solve_mode
+            )
+            result = nutrition_optimizer.solve(include_sensitivity)
+
+        self._put(session_id, nutrition_optimizer)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _take(self, session_id: str) -> NutritionOptimizer | None:
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return None
+
+        expires_at, nutrition_optimizer = entry
+        if expires_at <= self._clock():
+            return None
+        return nutrition_optimizer
+
+    def _put(
+        self, session_id: str, nutrition_optimizer: NutritionOptimizer
+    ) -> None:
+        if self._max_size == 0:
+            return
+
+        with self._lock:
+            self._sessions[session_id] = (
+                self._clock() + self._ttl_seconds,
+                nutrition_optimizer,
+            )
+            while len(self._sessions) > self._max_size:
+                self._sessions.popitem(last=False)
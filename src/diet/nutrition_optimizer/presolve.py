@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+from diet.nutrition_optimizer.models import FoodInformation
+from diet.nutrition_optimizer.nutrients import NUTRIENT_KEYS
+from diet.utils.custom_logger import get_logger
+
+_logger = get_logger()
+
+
+@dataclass(frozen=True)
+class PresolvedFoods:
+    variable_foods: list[FoodInformation]
+    fixed_food_intake_grams: dict[str, int]
+    fixed_bound_food_count: int
+    zero_nutrient_food_count: int
+
+
+def _is_fixed(food_information: FoodInformation) -> bool:
+    return (
+        food_information.minimum_intake_units
+        == food_information.maximum_intake_units
+    )
+
+
+def _has_no_nutrients(food_information: FoodInformation) -> bool:
+    return not any(
+        getattr(food_information, nutrient) for nutrient in NUTRIENT_KEYS
+    )
+
+
+def presolve_foods(
+    food_information: list[FoodInformation],
+) -> PresolvedFoods:
+    variable_foods: list[FoodInformation] = []
+    fixed_food_intake_grams: dict[str, int] = {}
+    fixed_bound_food_count = 0
+    for item in food_information:
+        if _is_fixed(item):
+            fixed_bound_food_count += 1
+        elif not _has_no_nutrients(item):
+            variable_foods.append(item)
+            continue
+        fixed_food_intake_grams[item.name] = (
+            item.minimum_intake_units * item.grams_per_unit
+        )
+
+    if fixed_food_intake_grams:
+        _logger.info(
+            f"Presolve fixed {len(fixed_food_intake_grams)} of"
+            f" {len(food_information)} foods."
+        )
+    return PresolvedFoods(
+        variable_foods=variable_foods,
+        fixed_food_intake_grams=fixed_food_intake_grams,
+        fixed_bound_food_count=fixed_bound_food_count,
+        zero_nutrient_food_count=(
+            len(fixed_food_intake_grams) - fixed_bound_food_count
+        ),
+    )
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+
+from diet.nutrition_optimizer.models import (
+    CatalogOptimizationProblem,
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    SolveMode,
+)
+
+ProblemFingerprint = tuple[
+    tuple[FoodInformation, ...],
+    Objective,
+    tuple[Constraint, ...],
+    SolveMode,
+    bool,
+]
+
+CatalogProblemFingerprint = tuple[
+    str,
+    Objective,
+    tuple[Constraint, ...],
+    int,
+    int | None,
+    int,
+    float | None,
+    float | None,
+]
+
+
+@dataclass(frozen=True)
+class ResultCacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+def create_problem_fingerprint(
+    food_information: list[FoodInformation],
+    objective: Objective,
+    constraints: list[Constraint],
+    solve_mode: SolveMode = "exact",
+    include_sensitivity: bool = False,
+) -> ProblemFingerprint:
+    return (
+        tuple(sorted(food_information, key=lambda item: item.name)),
+        objective,
+        tuple(constraints),
+        solve_mode,
+        include_sensitivity,
+    )
+
+
+def create_catalog_problem_fingerprint(
+    problem: CatalogOptimizationProblem,
+    solver_relative_gap: float | None = None,
+    food_count_relative_gap: float | None = None,
+) -> CatalogProblemFingerprint:
+    return (
+        "catalog",
+        problem.objective,
+        tuple(problem.constraints),
+        problem.maximum_intake_grams,
+        problem.max_food_count,
+        problem.grams_per_unit,
+        solver_relative_gap,
+        food_count_relative_gap,
+    )
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[
+            Hashable, tuple[float, NutritionOptimizerResult]
+        ] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> NutritionOptimizerResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._evictions += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Hashable, result: NutritionOptimizerResult) -> None:
+        if self._max_size == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def statistics(self) -> ResultCacheStatistics:
+        with self._lock:
+            return ResultCacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_size=self._max_size,
+            )
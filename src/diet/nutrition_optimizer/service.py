@@ -1,26 +1,398 @@
+from collections.abc import Hashable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from copy import copy, deepcopy
+from functools import cache
+from typing import cast
+
+from diet.config import get_nutrition_optimizer_settings
+from diet.nutrition_optimizer.food_catalog import get_food_catalog
+from diet.nutrition_optimizer.food_search import (
+    FoodSearchPage,
+    SortOrder,
+    get_food_search_index,
+)
+from diet.nutrition_optimizer.jobs import (
+    OptimizationJob,
+    OptimizationJobQueue,
+    solve_optimization_problem,
+)
+from diet.nutrition_optimizer.meal_plan_optimizer import MealPlanOptimizer
 from diet.nutrition_optimizer.models import (
+    CatalogOptimizationProblem,
     Constraint,
+    FailedNutritionOptimizerResult,
     FoodInformation,
+    MealPlanProblem,
+    MealPlanResult,
     NutritionOptimizerResult,
     Objective,
+    OptimalNutritionOptimizerResult,
+    OptimizationProblem,
+    SolveMode,
+    SweepPoint,
+    SweepProblem,
 )
 from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.nutrition_optimizer.optimizer_sessions import OptimizerSessionStore
+from diet.nutrition_optimizer.result_cache import (
+    ProblemFingerprint,
+    ResultCache,
+    ResultCacheStatistics,
+    create_catalog_problem_fingerprint,
+    create_problem_fingerprint,
+)
+from diet.nutrition_optimizer.solve_metrics import (
+    SolveMetricsRecorder,
+    SolveMetricsStatistics,
+)
 from diet.utils.custom_logger import get_logger
 
 _logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+_result_cache = ResultCache(
+    max_size=_settings.result_cache_size,
+    ttl_seconds=_settings.result_cache_ttl_seconds,
+)
+_solve_metrics = SolveMetricsRecorder()
+_optimizer_sessions = OptimizerSessionStore(
+    max_size=_settings.session_max_count,
+    ttl_seconds=_settings.session_ttl_seconds,
+)
+_job_queue = OptimizationJobQueue(
+    max_workers=_settings.job_workers,
+    max_queue_depth=_settings.job_max_queue_depth,
+    result_ttl_seconds=_settings.job_result_ttl_seconds,
+    on_result=_solve_metrics.record_result,
+)
 
 
 def optimize(
     food_information: list[FoodInformation],
     objective: Objective,
     constraints: list[Constraint],
+    solve_mode: SolveMode = "exact",
+    session_id: str | None = None,
+    include_sensitivity: bool = False,
 ) -> NutritionOptimizerResult:
     _logger.info("Start: optimize nutrition")
 
-    nutrition_optimizer = NutritionOptimizer(
-        food_information, objective, constraints
+    fingerprint = create_problem_fingerprint(
+        food_information,
+        objective,
+        constraints,
+        solve_mode,
+        include_sensitivity,
     )
-    result = nutrition_optimizer.solve()
+    cached_result = _result_cache.get(fingerprint)
+    if cached_result is not None:
+        _logger.info("End: optimize nutrition (result cache hit)")
+        return _copy_result(cached_result, food_information)
+
+    if session_id is None:
+        nutrition_optimizer = NutritionOptimizer(
+            food_information, objective, constraints, solve_mode
+        )
+        result = nutrition_optimizer.solve(include_sensitivity)
+    else:
+        result = _optimizer_sessions.solve(
+            session_id,
+            food_information,
+            objective,
+            constraints,
+            solve_mode,
+            include_sensitivity,
+        )
+    _solve_metrics.record_result(result)
+    _cache_result(fingerprint, result)
 
     _logger.info("End: optimize nutrition")
+    return _copy_result(result, food_information)
+
+
+def optimize_many(
+    problems: list[OptimizationProblem],
+) -> Iterator[NutritionOptimizerResult]:
+    _logger.info(f"Start: optimize {len(problems)} nutrition problems")
+
+    fingerprints = [
+        create_problem_fingerprint(
+            problem.food_information,
+            problem.objective,
+            problem.constraints,
+            problem.solve_mode,
+            problem.include_sensitivity,
+        )
+        for problem in problems
+    ]
+    unique_problems = dict(zip(fingerprints, problems, strict=True))
+    _logger.info(f"Deduplicated to {len(unique_problems)} unique problems")
+
+    executor = _get_batch_executor()
+    try:
+        futures = _submit_problems(executor, unique_problems)
+    except BrokenProcessPool:
+        _replace_broken_batch_executor(executor)
+        executor = _get_batch_executor()
+        futures = _submit_problems(executor, unique_problems)
+
+    for fingerprint, problem in zip(fingerprints, problems, strict=True):
+        result = _get_batch_result(executor, futures[fingerprint])
+        _cache_result(fingerprint, result)
+        yield _copy_result(result, problem.food_information)
+
+    _logger.info("End: optimize nutrition problems")
+
+
+def optimize_catalog(
+    problem: CatalogOptimizationProblem,
+) -> NutritionOptimizerResult:
+    _logger.info("Start: optimize over the food catalog")
+
+    fingerprint = create_catalog_problem_fingerprint(
+        problem,
+        _settings.solver_relative_gap,
+        _settings.food_count_relative_gap,
+    )
+    cached_result = _result_cache.get(fingerprint)
+    if cached_result is not None:
+        _logger.info("End: optimize over the food catalog (result cache hit)")
+        return deepcopy(cached_result)
+
+    nutrition_optimizer = NutritionOptimizer(
+        get_food_catalog().to_food_information(
+            problem.maximum_intake_grams, problem.grams_per_unit
+        ),
+        problem.objective,
+        problem.constraints,
+        max_food_count=problem.max_food_count,
+    )
+    result = _remove_unselected_foods(nutrition_optimizer.solve())
+    _solve_metrics.record_result(result)
+    _cache_result(
+        fingerprint, result, nutrition_optimizer.is_within_relative_gap()
+    )
+
+    _logger.info("End: optimize over the food catalog")
+    return deepcopy(result)
+
+
+def search_foods(
+    query: str, sort_by: str, order: SortOrder, page: int
+) -> FoodSearchPage:
+    return get_food_search_index().search(
+        query, sort_by, order, page, _settings.food_search_page_size
+    )
+
+
+def sweep(problem: SweepProblem) -> list[SweepPoint]:
+    _logger.info(
+        f"Start: sweep {len(problem.constraint_values)} constraint values"
+    )
+
+    nutrition_optimizer = NutritionOptimizer(
+        problem.food_information,
+        problem.objective,
+        problem.constraints,
+        problem.solve_mode,
+    )
+    sweep_points = nutrition_optimizer.sweep(
+        problem.constraint_index,
+        problem.constraint_values,
+        problem.include_sensitivity,
+    )
+    for sweep_point in sweep_points:
+        _solve_metrics.record_result(sweep_point["result"])
+
+    _logger.info("End: sweep constraint values")
+    return sweep_points
+
+
+def plan_meals(problem: MealPlanProblem) -> MealPlanResult:
+    _logger.info(f"Start: plan meals for {problem.days} days")
+
+    meal_plan_optimizer = MealPlanOptimizer(
+        problem.food_information,
+        problem.objective,
+        problem.daily_constraints,
+        problem.plan_constraints,
+        problem.days,
+        problem.max_food_occurrences,
+    )
+    result = meal_plan_optimizer.solve()
+
+    _logger.info("End: plan meals")
     return result
+
+
+def submit_optimization_job(
+    food_information: list[FoodInformation],
+    objective: Objective,
+    constraints: list[Constraint],
+    solve_mode: SolveMode = "exact",
+    include_sensitivity: bool = False,
+) -> OptimizationJob:
+    return _job_queue.submit(
+        food_information,
+        objective,
+        constraints,
+        solve_mode,
+        include_sensitivity,
+    )
+
+
+def get_optimization_job(job_id: str) -> OptimizationJob:
+    return _job_queue.get(job_id)
+
+
+def cancel_optimization_job(job_id: str) -> OptimizationJob:
+    return _job_queue.cancel(job_id)
+
+
+def get_result_cache_statistics() -> ResultCacheStatistics:
+    return _result_cache.statistics()
+
+
+def clear_result_cache() -> None:
+    _result_cache.clear()
+
+
+def get_solve_metrics_statistics() -> SolveMetricsStatistics:
+    return _solve_metrics.statistics()
+
+
+def clear_solve_metrics() -> None:
+    _solve_metrics.clear()
+
+
+def _is_cacheable(result: NutritionOptimizerResult) -> bool:
+    if result["status"] == "Optimal":
+        optimal_result = cast(OptimalNutritionOptimizerResult, result)
+        return optimal_result["is_proven_optimal"]
+
+    return result["status"] == "Infeasible"
+
+
+def _cache_result(
+    fingerprint: Hashable,
+    result: NutritionOptimizerResult,
+    is_within_relative_gap: bool = False,
+) -> None:
+    if not (is_within_relative_gap or _is_cacheable(result)):
+        return
+
+    cached_result = copy(result)
+    cached_result.pop("solve_metrics", None)
+    _result_cache.put(fingerprint, cached_result)
+
+
+def _remove_unselected_foods(
+    result: NutritionOptimizerResult,
+) -> NutritionOptimizerResult:
+    if result["status"] != "Optimal":
+        return result
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    optimal_result["food_intake_grams"] = {
+        name: grams
+        for name, grams in optimal_result["food_intake_grams"].items()
+        if grams > 0
+    }
+    return optimal_result
+
+
+def _copy_result(
+    result: NutritionOptimizerResult,
+    food_information: list[FoodInformation],
+) -> NutritionOptimizerResult:
+    if result["status"] != "Optimal":
+        return cast(FailedNutritionOptimizerResult, deepcopy(result))
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    copied_result: OptimalNutritionOptimizerResult = {
+        "status": "Optimal",
+        "is_proven_optimal": optimal_result["is_proven_optimal"],
+        "solution_method": optimal_result["solution_method"],
+        "food_intake_grams": {
+            item.name: optimal_result["food_intake_grams"][item.name]
+            for item in food_information
+        },
+        "total_nutrient_values": {**optimal_result["total_nutrient_values"]},
+        "pfc_composition_ratio": {**optimal_result["pfc_composition_ratio"]},
+    }
+    if "sensitivity" in optimal_result:
+        copied_result["sensitivity"] = deepcopy(optimal_result["sensitivity"])
+    if "solve_metrics" in optimal_result:
+        copied_result["solve_metrics"] = deepcopy(
+            optimal_result["solve_metrics"]
+        )
+    return copied_result
+
+
+@cache
+def _get_batch_executor() -> Executor:
+    return ProcessPoolExecutor(max_workers=_settings.batch_workers)
+
+
+def _replace_broken_batch_executor(executor: Executor) -> None:
+    if _get_batch_executor() is executor:
+        _logger.warning("Batch worker pool is broken; starting a new one.")
+        _get_batch_executor.cache_clear()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_problems(
+    executor: Executor,
+    problems: dict[ProblemFingerprint, OptimizationProblem],
+) -> dict[ProblemFingerprint, Future[NutritionOptimizerResult]]:
+    return {
+        fingerprint: _submit_problem(executor, fingerprint, problem)
+        for fingerprint, problem in problems.items()
+    }
+
+
+def _submit_problem(
+    executor: Executor,
+    fingerprint: ProblemFingerprint,
+    problem: OptimizationProblem,
+) -> Future[NutritionOptimizerResult]:
+    cached_result = _result_cache.get(fingerprint)
+    if cached_result is None:
+        future = executor.submit(
+            solve_optimization_problem,
+            problem.food_information,
+            problem.objective,
+            problem.constraints,
+            problem.solve_mode,
+            problem.include_sensitivity,
+        )
+        future.add_done_callback(_record_solve_metrics)
+        return future
+
+    cached_future: Future[NutritionOptimizerResult] = Future()
+    cached_future.set_result(cached_result)
+    return cached_future
+
+
+def _get_batch_result(
+    executor: Executor, future: Future[NutritionOptimizerResult]
+) -> NutritionOptimizerResult:
+    try:
+        return future.result()
+    except BrokenProcessPool as e:
+        _logger.error(f"Batch worker pool failed: {e}", exc_info=True)
+        _replace_broken_batch_executor(executor)
+    except Exception as e:
+        _logger.error(f"Batch optimization failed: {e}", exc_info=True)
+
+    failed_result: FailedNutritionOptimizerResult = {
+        "status": "Error",
+        "error_code": "optimization_failed",
+    }
+    return failed_result
+
+
+def _record_solve_metrics(future: Future[NutritionOptimizerResult]) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _solve_metrics.record_result(future.result())
@@ -0,0 +1,124 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import cast
+
+from pulp import LpProblem
+
+from diet.nutrition_optimizer.models import (
+    ModelSize,
+    NutritionOptimizerResult,
+    OptimizerPhase,
+    SolveMetrics,
+)
+from diet.nutrition_optimizer.presolve import PresolvedFoods
+
+_PHASE_SECONDS_DIGITS = 6
+
+
+@dataclass(frozen=True)
+class SolveMetricsStatistics:
+    solve_count: int
+    total_phase_seconds: dict[str, float]
+    max_phase_seconds: dict[str, float]
+    max_model_size: ModelSize
+
+
+class PhaseTimer:
+    def __init__(self, clock: Callable[[], float] = perf_counter) -> None:
+        self._clock = clock
+        self._phase_seconds: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: OptimizerPhase) -> Iterator[None]:
+        started_at = self._clock()
+        try:
+            yield
+        finally:
+            self._phase_seconds[phase] = (
+                self._phase_seconds.get(phase, 0.0)
+                + self._clock()
+                - started_at
+            )
+
+    def phase_seconds(self) -> dict[str, float]:
+        return {
+            phase: round(seconds, _PHASE_SECONDS_DIGITS)
+            for phase, seconds in self._phase_seconds.items()
+        }
+
+
+def count_model_size(
+    problem: LpProblem, presolved_foods: PresolvedFoods
+) -> ModelSize:
+    return {
+        "variables": problem.numVariables(),
+        "constraints": problem.numConstraints(),
+        "nonzeros": sum(
+            len(constraint) for constraint in problem.constraints()
+        ),
+        "presolve_fixed_foods": presolved_foods.fixed_bound_food_count,
+        "presolve_zero_nutrient_foods": (
+            presolved_foods.zero_nutrient_food_count
+        ),
+    }
+
+
+class SolveMetricsRecorder:
+    def __init__(self) -> None:
+        self._solve_count = 0
+        self._total_phase_seconds: dict[str, float] = {}
+        self._max_phase_seconds: dict[str, float] = {}
+        self._max_model_size: dict[str, int] = {}
+        self._lock = Lock()
+
+    def record(self, metrics: SolveMetrics) -> None:
+        with self._lock:
+            self._solve_count += 1
+            for phase, seconds in metrics["phase_seconds"].items():
+                self._total_phase_seconds[phase] = (
+                    self._total_phase_seconds.get(phase, 0.0) + seconds
+                )
+                self._max_phase_seconds[phase] = max(
+                    self._max_phase_seconds.get(phase, 0.0), seconds
+                )
+            model_size = cast(dict[str, int], metrics["model_size"])
+            for key, count in model_size.items():
+                self._max_model_size[key] = max(
+                    self._max_model_size.get(key, 0), count
+                )
+
+    def record_result(self, result: NutritionOptimizerResult) -> None:
+        if "solve_metrics" in result:
+            self.record(result["solve_metrics"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._solve_count = 0
+            self._total_phase_seconds.clear()
+            self._max_phase_seconds.clear()
+            self._max_model_size.clear()
+
+    def statistics(self) -> SolveMetricsStatistics:
+        with self._lock:
+            return SolveMetricsStatistics(
+                solve_count=self._solve_count,
+                total_phase_seconds={
+                    phase: round(seconds, _PHASE_SECONDS_DIGITS)
+                    for phase, seconds in self._total_phase_seconds.items()
+                },
+                max_phase_seconds={**self._max_phase_seconds},
+                max_model_size={
+                    "variables": self._max_model_size.get("variables", 0),
+                    "constraints": self._max_model_size.get("constraints", 0),
+                    "nonzeros": self._max_model_size.get("nonzeros", 0),
+                    "presolve_fixed_foods": self._max_model_size.get(
+                        "presolve_fixed_foods", 0
+                    ),
+                    "presolve_zero_nutrient_foods": self._max_model_size.get(
+                        "presolve_zero_nutrient_foods", 0
+                    ),
+                },
+            )
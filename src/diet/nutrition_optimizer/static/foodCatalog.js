@@ -1,14 +1,19 @@
-import { currentLocale, translate } from "../../static/i18n.js";
+import { translate } from "../../static/i18n.js";
+import {
+    fetchBinaryFoodCatalog,
+    fetchJsonFoodCatalog,
+    searchFoodCatalog,
+} from "./foodCatalogBinary.js";
 
-const FOOD_PAGE_SIZE = 50;
 const FOOD_SEARCH_DEBOUNCE_MS = 250;
 
 let activeFoodRow = null;
 let currentFoodPage = 1;
-let foodPickerModal = null;
 let foodCatalog = null;
-let foodCatalogPromise = null;
+let foodCatalogRequested = false;
+let foodPickerModal = null;
 let foodNutrientIndexes = new Map();
+let foodPageRequestId = 0;
 let foodSearchTimer = null;
 let handleFoodSelected = null;
 let nutrientDefinitions = [];
@@ -34,11 +39,51 @@ function parseNutrientNumericValue(value) {
     return Number.isFinite(numericValue) ? numericValue : 0;
 }
 
+function currentFoodSearch() {
+    return {
+        query: document.getElementById("food-picker-search").value.trim(),
+        sortBy: document.getElementById("food-sort-by").value,
+        sortOrder: document.getElementById("food-sort-order").value,
+        page: currentFoodPage,
+    };
+}
+
 async function fetchFoodCatalog() {
     const modalElement = document.getElementById("food-picker-modal");
+    const catalog = await fetchBinaryFoodCatalog(
+        modalElement.dataset.foodBinaryCatalogUrl,
+    );
+    if (catalog !== null) {
+        return catalog;
+    }
+
+    return fetchJsonFoodCatalog(modalElement.dataset.foodCatalogUrl);
+}
+
+function loadFoodCatalogInBackground() {
+    if (foodCatalogRequested) {
+        return;
+    }
+
+    foodCatalogRequested = true;
+    fetchFoodCatalog().then((catalog) => {
+        foodCatalog = catalog;
+    });
+}
+
+async function fetchServerFoodPage(foodSearch) {
+    const modalElement = document.getElementById("food-picker-modal");
+    const searchParameters = new URLSearchParams({
+        query: foodSearch.query,
+        sortBy: foodSearch.sortBy,
+        order: foodSearch.sortOrder,
+        page: String(foodSearch.page),
+    });
     let response;
     try {
-        response = await fetch(modalElement.dataset.foodCatalogUrl);
+        response = await fetch(
+            `${modalElement.dataset.foodSearchUrl}?${searchParameters}`,
+        );
     } catch {
         throw new Error(translate("js.unexpected_response"));
     }
@@ -46,43 +91,33 @@ async function fetchFoodCatalog() {
         throw new Error(translate("js.unexpected_response"));
     }
 
-    let catalogData;
+    let foodPage;
     try {
-        catalogData = await response.json();
+        foodPage = await response.json();
     } catch {
         throw new Error(translate("js.unexpected_response"));
     }
     if (
-        !Array.isArray(catalogData.nutrientIdentifiers) ||
-        !Array.isArray(catalogData.foods)
+        !Array.isArray(foodPage.nutrientIdentifiers) ||
+        !Array.isArray(foodPage.foods)
     ) {
         throw new Error(translate("js.unexpected_response"));
     }
 
-    foodNutrientIndexes = new Map(
-        catalogData.nutrientIdentifiers.map((identifier, index) => [
-            identifier,
-            index,
-        ]),
-    );
-    foodCatalog = catalogData.foods;
+    return foodPage;
 }
 
-async function loadFoodCatalog() {
-    if (foodCatalog !== null) {
-        return;
-    }
-
-    if (foodCatalogPromise === null) {
-        foodCatalogPromise = fetchFoodCatalog();
+async function fetchFoodPage() {
+    const foodSearch = currentFoodSearch();
+    if (foodCatalog === null) {
+        return fetchServerFoodPage(foodSearch);
     }
 
-    try {
-        await foodCatalogPromise;
-    } catch (error) {
-        foodCatalogPromise = null;
-        throw error;
-    }
+    const modalElement = document.getElementById("food-picker-modal");
+    return searchFoodCatalog(foodCatalog, {
+        ...foodSearch,
+        pageSize: Number(modalElement.dataset.foodPageSize),
+    });
 }
 
 function formatNutrientLabel(definition) {
@@ -144,22 +179,6 @@ function createPickerValueCell(food, definition) {
     return cell;
 }
 
-function compareFoods(left, right, sortBy, sortOrder) {
-    const direction = sortOrder === "asc" ? 1 : -1;
-
-    if (sortBy === "name") {
-        return left.name.localeCompare(right.name, currentLocale()) * direction;
-    }
-
-    const leftValue = getFoodNutrient(left, sortBy)?.numericValue || 0;
-    const rightValue = getFoodNutrient(right, sortBy)?.numericValue || 0;
-    if (leftValue === rightValue) {
-        return left.name.localeCompare(right.name, currentLocale());
-    }
-
-    return (leftValue - rightValue) * direction;
-}
-
 function selectedFood(food) {
     return {
         name: food.name,
@@ -225,22 +244,20 @@ function updatePagination(resultCount, totalPages) {
     nextButton.disabled = currentFoodPage === totalPages;
 }
 
-function renderRows() {
-    if (foodCatalog === null) {
-        return;
-    }
-
+function renderRows(foodPage) {
     const optionsBody = document.getElementById("food-picker-options");
     const headerRow = document.querySelector("#food-picker-table thead tr");
     const actionHeader = headerRow.querySelector(
         "[data-picker-static-column='action']",
     );
-    const searchValue = document
-        .getElementById("food-picker-search")
-        .value.trim()
-        .toLowerCase();
-    const sortBy = document.getElementById("food-sort-by").value;
-    const sortOrder = document.getElementById("food-sort-order").value;
+
+    foodNutrientIndexes = new Map(
+        foodPage.nutrientIdentifiers.map((identifier, index) => [
+            identifier,
+            index,
+        ]),
+    );
+    currentFoodPage = foodPage.page;
 
     document
         .querySelectorAll("[data-generated-picker-column]")
@@ -249,24 +266,8 @@ function renderRows() {
         headerRow.insertBefore(createHeaderCell(definition), actionHeader);
     });
 
-    const filteredFoods = foodCatalog
-        .filter(
-            (food) =>
-                searchValue === "" ||
-                food.name.toLowerCase().includes(searchValue),
-        )
-        .sort((left, right) => compareFoods(left, right, sortBy, sortOrder));
-
-    const totalPages = Math.ceil(filteredFoods.length / FOOD_PAGE_SIZE);
-    currentFoodPage = Math.min(currentFoodPage, Math.max(totalPages, 1));
-    const pageStart = (currentFoodPage - 1) * FOOD_PAGE_SIZE;
-    const displayedFoods = filteredFoods.slice(
-        pageStart,
-        pageStart + FOOD_PAGE_SIZE,
-    );
-
     const fragment = document.createDocumentFragment();
-    displayedFoods.forEach((food) => {
+    foodPage.foods.forEach((food) => {
         const row = document.createElement("tr");
         const nameCell = document.createElement("td");
         nameCell.textContent = food.name;
@@ -280,7 +281,37 @@ function renderRows() {
     });
 
     optionsBody.replaceChildren(fragment);
-    updatePagination(filteredFoods.length, totalPages);
+    updatePagination(foodPage.totalCount, foodPage.totalPages);
+}
+
+async function loadFoodPage() {
+    foodPageRequestId += 1;
+    const requestId = foodPageRequestId;
+    let foodPage;
+    try {
+        foodPage = await fetchFoodPage();
+    } catch (error) {
+        if (requestId !== foodPageRequestId) {
+            return false;
+        }
+        throw error;
+    }
+    if (requestId !== foodPageRequestId) {
+        return false;
+    }
+
+    renderRows(foodPage);
+    return true;
+}
+
+async function refreshFoodPage() {
+    try {
+        await loadFoodPage();
+    } catch (error) {
+        if (error instanceof Error) {
+            window.alert(error.message);
+        }
+    }
 }
 
 async function openFoodPicker(triggerButton) {
@@ -294,24 +325,23 @@ async function openFoodPicker(triggerButton) {
     searchInput.value = "";
 
     foodPickerModal.show();
-    if (foodCatalog === null) {
-        loadingMessage.hidden = false;
-        pickerTable.hidden = true;
-        try {
-            await loadFoodCatalog();
-        } catch (error) {
-            if (error instanceof Error) {
-                window.alert(error.message);
-            }
-            foodPickerModal.hide();
+    loadFoodCatalogInBackground();
+    loadingMessage.hidden = false;
+    pickerTable.hidden = true;
+    try {
+        if (!(await loadFoodPage())) {
             return;
-        } finally {
-            loadingMessage.hidden = true;
         }
-        pickerTable.hidden = false;
+    } catch (error) {
+        if (error instanceof Error) {
+            window.alert(error.message);
+        }
+        foodPickerModal.hide();
+        return;
+    } finally {
+        loadingMessage.hidden = true;
     }
-
-    renderRows();
+    pickerTable.hidden = false;
 }
 
 export function addFoodPickerTrigger(root) {
@@ -349,29 +379,29 @@ export function initializeFoodPicker(definitions, onFoodSelected) {
         foodSearchTimer = window.setTimeout(() => {
             foodSearchTimer = null;
             currentFoodPage = 1;
-            renderRows();
+            refreshFoodPage();
         }, FOOD_SEARCH_DEBOUNCE_MS);
     });
     sortBySelect.addEventListener("change", () => {
         window.clearTimeout(foodSearchTimer);
         foodSearchTimer = null;
         currentFoodPage = 1;
-        renderRows();
+        refreshFoodPage();
     });
     sortOrderSelect.addEventListener("change", () => {
         window.clearTimeout(foodSearchTimer);
         foodSearchTimer = null;
         currentFoodPage = 1;
-        renderRows();
+        refreshFoodPage();
     });
     previousButton.addEventListener("click", () => {
         if (currentFoodPage > 1) {
             currentFoodPage -= 1;
-            renderRows();
+            refreshFoodPage();
         }
     });
     nextButton.addEventListener("click", () => {
         currentFoodPage += 1;
-        renderRows();
+        refreshFoodPage();
     });
 }
@@ -0,0 +1,259 @@
+const FOOD_CATALOG_MAGIC = "FCAT";
+const FOOD_CATALOG_VERSION = 2;
+const HEADER_BYTE_LENGTH = 24;
+const NUTRIENT_FLAG_ESTIMATED = 1;
+const NUTRIENT_FLAG_TRACE = 2;
+const NUTRIENT_FLAG_MISSING = 4;
+const MISSING_VALUES = ["", "-", "*"];
+const TRACE_VALUE = "Tr";
+
+const utf8Decoder = new TextDecoder();
+const foodNameCollator = new Intl.Collator("ja");
+
+function isLittleEndian() {
+    return new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+}
+
+function normalizeSearchText(text) {
+    return text.normalize("NFKC").trim().toLowerCase();
+}
+
+function createFoodCatalog({
+    nutrientIdentifiers,
+    names,
+    nameOrder,
+    values,
+    flags,
+    decimalPlaces,
+}) {
+    const nameRanks = new Uint32Array(names.length);
+    nameOrder.forEach((foodIndex, rank) => {
+        nameRanks[foodIndex] = rank;
+    });
+
+    return {
+        foodCount: names.length,
+        nutrientIdentifiers,
+        names,
+        normalizedNames: names.map(normalizeSearchText),
+        nameOrder,
+        nameRanks,
+        values,
+        flags,
+        decimalPlaces,
+        sortOrders: new Map(),
+    };
+}
+
+function decodeFoodCatalog(buffer) {
+    const view = new DataView(buffer);
+    const magic = utf8Decoder.decode(new Uint8Array(buffer, 0, 4));
+    if (
+        buffer.byteLength < HEADER_BYTE_LENGTH ||
+        magic !== FOOD_CATALOG_MAGIC ||
+        view.getUint32(4, true) !== FOOD_CATALOG_VERSION
+    ) {
+        return null;
+    }
+
+    const foodCount = view.getUint32(8, true);
+    const nutrientCount = view.getUint32(12, true);
+    const identifierByteLength = view.getUint32(16, true);
+    const nameByteLength = view.getUint32(20, true);
+    const cellCount = foodCount * nutrientCount;
+
+    let offset = HEADER_BYTE_LENGTH;
+    const nameOffsets = new Uint32Array(buffer, offset, foodCount + 1);
+    offset += nameOffsets.byteLength;
+    const nameOrder = new Uint32Array(buffer, offset, foodCount);
+    offset += nameOrder.byteLength;
+    const values = new Float32Array(buffer, offset, cellCount);
+    offset += values.byteLength;
+    const flags = new Uint8Array(buffer, offset, cellCount);
+    offset += cellCount;
+    const decimalPlaces = new Uint8Array(buffer, offset, cellCount);
+    offset += cellCount;
+    const nutrientIdentifiers = utf8Decoder
+        .decode(new Uint8Array(buffer, offset, identifierByteLength))
+        .split("\n");
+    offset += identifierByteLength;
+    const nameBytes = new Uint8Array(buffer, offset, nameByteLength);
+
+    const names = Array.from({ length: foodCount }, (_, index) =>
+        utf8Decoder.decode(
+            nameBytes.subarray(nameOffsets[index], nameOffsets[index + 1]),
+        ),
+    );
+
+    return createFoodCatalog({
+        nutrientIdentifiers,
+        names,
+        nameOrder,
+        values,
+        flags,
+        decimalPlaces,
+    });
+}
+
+function parseNutrientValue(value) {
+    let text = value.trim().replace(/†+$/u, "");
+    let flags = 0;
+    if (text.startsWith("(") && text.endsWith(")")) {
+        text = text.slice(1, -1);
+        flags |= NUTRIENT_FLAG_ESTIMATED;
+    }
+
+    if (MISSING_VALUES.includes(text)) {
+        return { value: 0, flags: flags | NUTRIENT_FLAG_MISSING, places: 0 };
+    }
+    if (text === TRACE_VALUE) {
+        return { value: 0, flags: flags | NUTRIENT_FLAG_TRACE, places: 0 };
+    }
+
+    const [, fraction = ""] = text.split(".");
+    return { value: Number(text), flags, places: fraction.length };
+}
+
+function parseFoodCatalog(foodMaster) {
+    const { nutrientIdentifiers, foods } = foodMaster;
+    const cellCount = foods.length * nutrientIdentifiers.length;
+    const values = new Float32Array(cellCount);
+    const flags = new Uint8Array(cellCount);
+    const decimalPlaces = new Uint8Array(cellCount);
+    foods.forEach((food, foodIndex) => {
+        nutrientIdentifiers.forEach((_, nutrientIndex) => {
+            const cellIndex = nutrientIndex * foods.length + foodIndex;
+            const parsedValue = parseNutrientValue(food.values[nutrientIndex]);
+            values[cellIndex] = parsedValue.value;
+            flags[cellIndex] = parsedValue.flags;
+            decimalPlaces[cellIndex] = parsedValue.places;
+        });
+    });
+
+    const names = foods.map((food) => food.name);
+    return createFoodCatalog({
+        nutrientIdentifiers,
+        names,
+        nameOrder: Uint32Array.from(names.keys()).sort((left, right) =>
+            foodNameCollator.compare(names[left], names[right]),
+        ),
+        values,
+        flags,
+        decimalPlaces,
+    });
+}
+
+export async function fetchJsonFoodCatalog(url) {
+    if (!url) {
+        return null;
+    }
+
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            return null;
+        }
+        return parseFoodCatalog(await response.json());
+    } catch {
+        return null;
+    }
+}
+
+export async function fetchBinaryFoodCatalog(url) {
+    if (!url || !isLittleEndian()) {
+        return null;
+    }
+
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            return null;
+        }
+        return decodeFoodCatalog(await response.arrayBuffer());
+    } catch {
+        return null;
+    }
+}
+
+function nutrientColumn(catalog, columnArray, nutrientIndex) {
+    const start = nutrientIndex * catalog.foodCount;
+    return columnArray.subarray(start, start + catalog.foodCount);
+}
+
+function getSortOrder(catalog, sortBy, sortOrder) {
+    const key = `${sortBy}:${sortOrder}`;
+    if (catalog.sortOrders.has(key)) {
+        return catalog.sortOrders.get(key);
+    }
+
+    let order;
+    const nutrientIndex = catalog.nutrientIdentifiers.indexOf(sortBy);
+    if (nutrientIndex === -1) {
+        order =
+            sortOrder === "asc"
+                ? catalog.nameOrder
+                : catalog.nameOrder.slice().reverse();
+    } else {
+        const direction = sortOrder === "asc" ? 1 : -1;
+        const column = nutrientColumn(catalog, catalog.values, nutrientIndex);
+        order = catalog.nameOrder
+            .slice()
+            .sort(
+                (left, right) =>
+                    (column[left] - column[right]) * direction ||
+                    catalog.nameRanks[left] - catalog.nameRanks[right],
+            );
+    }
+    catalog.sortOrders.set(key, order);
+    return order;
+}
+
+function formatNutrientValue(catalog, nutrientIndex, foodIndex) {
+    const cellIndex = nutrientIndex * catalog.foodCount + foodIndex;
+    const flags = catalog.flags[cellIndex];
+    let text;
+    if (flags & NUTRIENT_FLAG_MISSING) {
+        text = "-";
+    } else if (flags & NUTRIENT_FLAG_TRACE) {
+        text = "Tr";
+    } else {
+        text = catalog.values[cellIndex].toFixed(
+            catalog.decimalPlaces[cellIndex],
+        );
+    }
+
+    return flags & NUTRIENT_FLAG_ESTIMATED ? `(${text})` : text;
+}
+
+export function searchFoodCatalog(
+    catalog,
+    { query, sortBy, sortOrder, page, pageSize },
+) {
+    const normalizedQuery = normalizeSearchText(query);
+    const matchingFoods = getSortOrder(catalog, sortBy, sortOrder).filter(
+        (foodIndex) =>
+            normalizedQuery === "" ||
+            catalog.normalizedNames[foodIndex].includes(normalizedQuery),
+    );
+
+    const totalPages = Math.ceil(matchingFoods.length / pageSize);
+    const currentPage = Math.min(page, Math.max(totalPages, 1));
+    const pageStart = (currentPage - 1) * pageSize;
+    const foods = Array.from(
+        matchingFoods.subarray(pageStart, pageStart + pageSize),
+        (foodIndex) => ({
+            name: catalog.names[foodIndex],
+            values: catalog.nutrientIdentifiers.map((_, nutrientIndex) =>
+                formatNutrientValue(catalog, nutrientIndex, foodIndex),
+            ),
+        }),
+    );
+
+    return {
+        nutrientIdentifiers: catalog.nutrientIdentifiers,
+        foods,
+        totalCount: matchingFoods.length,
+        page: currentPage,
+        totalPages,
+    };
+}
@@ -1,19 +1,73 @@
-from flask import Blueprint, Response, jsonify, render_template, request
+import json
+from collections.abc import Iterator
+from uuid import uuid4
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    jsonify,
+    render_template,
+    request,
+    send_file,
+    session,
+    stream_with_context,
+)
 from flask_wtf.csrf import CSRFError
 
+from diet.config import get_nutrition_optimizer_settings
 from diet.i18n import translate
 from diet.nutrition_optimizer.api_models import (
+    CatalogOptimizeRequest,
     ErrorCode,
     ErrorResponse,
+    FoodSearchResponse,
+    MealPlanRequest,
+    MealPlanResponse,
+    MetricsResponse,
+    OptimizationJobResponse,
+    OptimizeBatchRequest,
     OptimizeRequest,
     OptimizeResponse,
+    SweepRequest,
+    SweepResponse,
+    validate_catalog_optimize_request,
+    validate_food_search_request,
+    validate_meal_plan_request,
+    validate_optimize_batch_request,
     validate_optimize_request,
+    validate_sweep_request,
+)
+from diet.nutrition_optimizer.food_master_asset import (
+    FoodMasterAsset,
+    get_food_master_asset,
+    get_food_master_binary_asset,
+)
+from diet.nutrition_optimizer.food_search import get_food_search_index
+from diet.nutrition_optimizer.jobs import (
+    JobNotFoundError,
+    JobQueueFullError,
+    OptimizationJob,
 )
+from diet.nutrition_optimizer.models import OptimizationProblem
 from diet.nutrition_optimizer.nutrients import (
     NUTRIENT_REFERENCE_GRAMS,
     NUTRIENTS,
     NutrientDefinition,
 )
+from diet.nutrition_optimizer.optimizer import check_solver_available
+from diet.nutrition_optimizer.service import (
+    cancel_optimization_job,
+    get_optimization_job,
+    get_result_cache_statistics,
+    get_solve_metrics_statistics,
+    optimize_catalog,
+    optimize_many,
+    plan_meals,
+    search_foods,
+    submit_optimization_job,
+    sweep,
+)
 from diet.nutrition_optimizer.service import optimize as optimize_nutrition
 from diet.utils.custom_logger import get_logger
 
@@ -26,6 +80,26 @@ blueprint = Blueprint(
 )
 
 _logger = get_logger()
+_settings = get_nutrition_optimizer_settings()
+
+_OPTIMIZER_SESSION_KEY = "nutrition_optimizer_session_id"
+_FOOD_MASTER_ASSET_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
+
+
+@blueprint.record_once
+def check_solver(_: object) -> None:
+    check_solver_available()
+
+
+@blueprint.record_once
+def build_food_search_index(_: object) -> None:
+    get_food_search_index()
+
+
+@blueprint.record_once
+def build_food_master_assets(_: object) -> None:
+    get_food_master_asset()
+    get_food_master_binary_asset()
 
 
 @blueprint.errorhandler(CSRFError)
@@ -41,7 +115,40 @@ def index() -> str:
         nutrient_definitions=[
             _nutrient_definition_item(definition) for definition in NUTRIENTS
         ],
+        food_master_digest=get_food_master_asset().digest,
+        food_master_binary_digest=get_food_master_binary_asset().digest,
+        food_search_page_size=_settings.food_search_page_size,
+    )
+
+
+@blueprint.route("/food_master.<digest>.json")
+def food_master_asset(digest: str) -> Response:
+    return _food_master_asset_response(get_food_master_asset(), digest)
+
+
+@blueprint.route("/food_master.<digest>.bin")
+def food_master_binary_asset(digest: str) -> Response:
+    return _food_master_asset_response(get_food_master_binary_asset(), digest)
+
+
+@blueprint.route("/foods", methods=["GET"])
+def get_foods() -> Response | tuple[Response, int]:
+    try:
+        food_search_request = validate_food_search_request(
+            request.args.to_dict()
+        )
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    food_search_page = search_foods(
+        food_search_request.query,
+        food_search_request.sort_by,
+        food_search_request.order,
+        food_search_request.page,
     )
+    response = FoodSearchResponse.from_domain_page(food_search_page)
+    return jsonify(response.model_dump(by_alias=True))
 
 
 @blueprint.route("/optimize", methods=["POST"])
@@ -55,7 +162,12 @@ def optimize() -> Response | tuple[Response, int]:
         return _error_response("invalid_input", 400)
 
     try:
-        result = optimize_nutrition(*domain_input)
+        result = optimize_nutrition(
+            *domain_input,
+            solve_mode=optimize_request.solve_mode,
+            session_id=_get_optimizer_session_id(),
+            include_sensitivity=optimize_request.include_sensitivity,
+        )
         response = OptimizeResponse.from_domain_result(result)
         return jsonify(response.model_dump(by_alias=True))
     except Exception as e:
@@ -63,6 +175,182 @@ def optimize() -> Response | tuple[Response, int]:
         return _error_response("unexpected_response", 500)
 
 
+@blueprint.route("/optimize_batch", methods=["POST"])
+def optimize_batch() -> Response | tuple[Response, int]:
+    try:
+        payload = request.get_json(silent=True)
+        batch_request = _parse_optimize_batch_request(payload)
+        problems = batch_request.to_problems()
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    return Response(
+        stream_with_context(_stream_batch_results(problems)),
+        mimetype="application/x-ndjson",
+    )
+
+
+@blueprint.route("/optimize_catalog", methods=["POST"])
+def optimize_food_catalog() -> Response | tuple[Response, int]:
+    try:
+        payload = request.get_json(silent=True)
+        catalog_request = _parse_catalog_optimize_request(payload)
+        problem = catalog_request.to_domain()
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    try:
+        result = optimize_catalog(problem)
+        response = OptimizeResponse.from_domain_result(result)
+        return jsonify(response.model_dump(by_alias=True))
+    except Exception as e:
+        _logger.error(f"Error during catalog optimization: {e}", exc_info=True)
+        return _error_response("unexpected_response", 500)
+
+
+@blueprint.route("/sweep", methods=["POST"])
+def sweep_constraint() -> Response | tuple[Response, int]:
+    try:
+        payload = request.get_json(silent=True)
+        sweep_request = _parse_sweep_request(payload)
+        problem = sweep_request.to_sweep_problem()
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    try:
+        sweep_points = sweep(problem)
+        response = SweepResponse.from_domain_result(sweep_points)
+        return jsonify(response.model_dump(by_alias=True))
+    except Exception as e:
+        _logger.error(f"Error during constraint sweep: {e}", exc_info=True)
+        return _error_response("unexpected_response", 500)
+
+
+@blueprint.route("/meal_plan", methods=["POST"])
+def meal_plan() -> Response | tuple[Response, int]:
+    try:
+        payload = request.get_json(silent=True)
+        meal_plan_request = _parse_meal_plan_request(payload)
+        problem = meal_plan_request.to_domain()
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    try:
+        result = plan_meals(problem)
+        response = MealPlanResponse.from_domain_result(result)
+        return jsonify(response.model_dump(by_alias=True))
+    except Exception as e:
+        _logger.error(f"Error during meal planning: {e}", exc_info=True)
+        return _error_response("unexpected_response", 500)
+
+
+@blueprint.route("/jobs", methods=["POST"])
+def submit_job() -> tuple[Response, int]:
+    try:
+        payload = request.get_json(silent=True)
+        optimize_request = _parse_optimize_request(payload)
+        domain_input = optimize_request.to_domain()
+    except ValueError as e:
+        _logger.warning(f"Invalid request data: {e}")
+        return _error_response("invalid_input", 400)
+
+    try:
+        job = submit_optimization_job(
+            *domain_input,
+            solve_mode=optimize_request.solve_mode,
+            include_sensitivity=optimize_request.include_sensitivity,
+        )
+    except JobQueueFullError as e:
+        _logger.warning(e)
+        return _error_response("job_queue_full", 503)
+
+    return _job_response(job), 202
+
+
+@blueprint.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id: str) -> Response | tuple[Response, int]:
+    try:
+        job = get_optimization_job(job_id)
+    except JobNotFoundError as e:
+        _logger.info(e)
+        return _error_response("job_not_found", 404)
+
+    try:
+        return _job_response(job)
+    except Exception as e:
+        _logger.error(f"Error while reading job result: {e}", exc_info=True)
+        return _error_response("unexpected_response", 500)
+
+
+@blueprint.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id: str) -> Response | tuple[Response, int]:
+    try:
+        job = cancel_optimization_job(job_id)
+    except JobNotFoundError as e:
+        _logger.info(e)
+        return _error_response("job_not_found", 404)
+
+    return _job_response(job)
+
+
+@blueprint.route("/metrics", methods=["GET"])
+def get_metrics() -> Response:
+    response = MetricsResponse.from_domain_statistics(
+        get_result_cache_statistics(), get_solve_metrics_statistics()
+    )
+    return jsonify(response.model_dump(by_alias=True))
+
+
+def _stream_batch_results(
+    problems: list[OptimizationProblem],
+) -> Iterator[str]:
+    try:
+        for result in optimize_many(problems):
+            response = OptimizeResponse.from_domain_result(result)
+            yield json.dumps(response.model_dump(by_alias=True)) + "\n"
+    except Exception as e:
+        _logger.error(f"Error during batch optimization: {e}", exc_info=True)
+        error_response = ErrorResponse(error_code="unexpected_response")
+        yield json.dumps(error_response.model_dump(by_alias=True)) + "\n"
+
+
+def _food_master_asset_response(
+    asset: FoodMasterAsset, digest: str
+) -> Response:
+    if digest != asset.digest:
+        abort(404)
+
+    is_gzipped = request.accept_encodings.quality("gzip") > 0
+    response = send_file(
+        asset.gzip_path if is_gzipped else asset.path,
+        mimetype=asset.mimetype,
+        etag=f"{asset.digest}-gzip" if is_gzipped else asset.digest,
+        max_age=_FOOD_MASTER_ASSET_MAX_AGE_SECONDS,
+    )
+    if is_gzipped:
+        response.content_encoding = "gzip"
+    response.vary.add("Accept-Encoding")
+    response.cache_control.immutable = True
+    return response
+
+
+def _get_optimizer_session_id() -> str:
+    session_id = session.get(_OPTIMIZER_SESSION_KEY)
+    if not isinstance(session_id, str):
+        session_id = uuid4().hex
+        session[_OPTIMIZER_SESSION_KEY] = session_id
+    return session_id
+
+
+def _job_response(job: OptimizationJob) -> Response:
+    response = OptimizationJobResponse.from_domain_job(job)
+    return jsonify(response.model_dump(by_alias=True))
+
+
 def _parse_optimize_request(payload: object) -> OptimizeRequest:
     if payload is None:
         raise ValueError("Invalid request data: request JSON is required")
@@ -70,6 +358,36 @@ def _parse_optimize_request(payload: object) -> OptimizeRequest:
     return validate_optimize_request(payload)
 
 
+def _parse_optimize_batch_request(payload: object) -> OptimizeBatchRequest:
+    if payload is None:
+        raise ValueError("Invalid request data: request JSON is required")
+
+    return validate_optimize_batch_request(payload)
+
+
+def _parse_catalog_optimize_request(
+    payload: object,
+) -> CatalogOptimizeRequest:
+    if payload is None:
+        raise ValueError("Invalid request data: request JSON is required")
+
+    return validate_catalog_optimize_request(payload)
+
+
+def _parse_sweep_request(payload: object) -> SweepRequest:
+    if payload is None:
+        raise ValueError("Invalid request data: request JSON is required")
+
+    return validate_sweep_request(payload)
+
+
+def _parse_meal_plan_request(payload: object) -> MealPlanRequest:
+    if payload is None:
+        raise ValueError("Invalid request data: request JSON is required")
+
+    return validate_meal_plan_request(payload)
+
+
 def _error_response(
     error_code: ErrorCode, status_code: int
 ) -> tuple[Response, int]:
@@ -5,14 +5,23 @@ import pytest
 from pydantic import ValidationError
 
 from diet.nutrition_optimizer.api_models import (
+    CatalogOptimizeRequest,
     ErrorResponse,
+    FoodSearchResponse,
+    MealPlanRequest,
+    MealPlanResponse,
     OptimizeRequest,
     OptimizeResponse,
+    SweepRequest,
+    SweepResponse,
+    validate_food_search_request,
     validate_optimize_request,
 )
+from diet.nutrition_optimizer.food_search import FoodSearchItem, FoodSearchPage
 from diet.nutrition_optimizer.models import (
     Constraint,
     FoodInformation,
+    MealPlanProblem,
     Objective,
 )
 
@@ -152,6 +161,8 @@ def test_optimize_response_uses_camel_case_aliases() -> None:
     response = OptimizeResponse.model_validate(
         {
             "status": "Optimal",
+            "is_proven_optimal": True,
+            "solution_method": "mip",
             "food_intake_grams": {"boiled_egg": 100},
             "total_nutrient_values": {"energy": 201.0},
             "pfc_composition_ratio": {"protein": 25.0},
@@ -160,6 +171,7 @@ def test_optimize_response_uses_camel_case_aliases() -> None:
 
     dumped = response.model_dump(by_alias=True)
 
+    assert "isProvenOptimal" in dumped
     assert "foodIntakeGrams" in dumped
     assert "totalNutrientValues" in dumped
     assert "pfcCompositionRatio" in dumped
@@ -181,6 +193,8 @@ def test_failed_optimize_response_uses_error_code_alias() -> None:
 @pytest.mark.parametrize(
     "missing_result",
     [
+        "is_proven_optimal",
+        "solution_method",
         "food_intake_grams",
         "total_nutrient_values",
         "pfc_composition_ratio",
@@ -191,6 +205,8 @@ def test_optimal_response_requires_all_result_values(
 ) -> None:
     response_data = {
         "status": "Optimal",
+        "is_proven_optimal": True,
+        "solution_method": "mip",
         "food_intake_grams": {"boiled_egg": 100},
         "total_nutrient_values": {"energy": 201.0},
         "pfc_composition_ratio": {"protein": 25.0},
@@ -212,6 +228,8 @@ def test_optimal_response_rejects_error_code() -> None:
         OptimizeResponse.model_validate(
             {
                 "status": "Optimal",
+                "is_proven_optimal": True,
+                "solution_method": "mip",
                 "food_intake_grams": {"boiled_egg": 100},
                 "total_nutrient_values": {"energy": 201.0},
                 "pfc_composition_ratio": {"protein": 25.0},
@@ -286,6 +304,8 @@ def test_optimize_response_rejects_none_food_intake_grams() -> None:
         OptimizeResponse.model_validate(
             {
                 "status": "Optimal",
+                "is_proven_optimal": True,
+                "solution_method": "mip",
                 "food_intake_grams": {"boiled_egg": None},
                 "total_nutrient_values": {"energy": 201.0},
                 "pfc_composition_ratio": {"protein": 25.0},
@@ -305,6 +325,7 @@ def test_food_selection_to_food_information() -> None:
                 "carbohydrates": 2.0,
                 "minimumIntakeGrams": 100,
                 "maximumIntakeGrams": 200,
+                "gramsPerUnit": 50,
             }
         ],
     }
@@ -315,6 +336,7 @@ def test_food_selection_to_food_information() -> None:
     assert food_information.name == "manual tofu"
     assert food_information.energy == 80
     assert food_information.maximum_intake_grams == 200
+    assert food_information.grams_per_unit == 50
 
 
 def test_manual_food_selection_requires_nutrient_values() -> None:
@@ -331,3 +353,289 @@ def test_manual_food_selection_requires_nutrient_values() -> None:
 
     with pytest.raises(ValidationError):
         OptimizeRequest.model_validate(request_data)
+
+
+def test_meal_plan_request_to_domain() -> None:
+    request_data = {
+        "foodSelections": _REQUEST_DATA["foodSelections"],
+        "objective": _REQUEST_DATA["objective"],
+        "dailyConstraints": _REQUEST_DATA["constraints"],
+        "planConstraints": _REQUEST_DATA["constraints"][:1],
+        "days": 7,
+        "maxFoodOccurrences": 3,
+    }
+
+    problem = MealPlanRequest.model_validate(request_data).to_domain()
+
+    assert isinstance(problem, MealPlanProblem)
+    assert len(problem.daily_constraints) == 2
+    assert len(problem.plan_constraints) == 1
+    assert (problem.days, problem.max_food_occurrences) == (7, 3)
+
+
+@pytest.mark.parametrize("days", [0, 32])
+def test_meal_plan_request_rejects_out_of_range_days(days: int) -> None:
+    request_data = {
+        "foodSelections": _REQUEST_DATA["foodSelections"],
+        "objective": _REQUEST_DATA["objective"],
+        "dailyConstraints": [],
+        "days": days,
+    }
+
+    with pytest.raises(ValidationError, match="days"):
+        MealPlanRequest.model_validate(request_data)
+
+
+def test_catalog_optimize_request_to_domain() -> None:
+    request_data = {
+        "objective": _REQUEST_DATA["objective"],
+        "constraints": _REQUEST_DATA["constraints"],
+        "maxFoodCount": 5,
+    }
+
+    problem = CatalogOptimizeRequest.model_validate(request_data).to_domain()
+
+    assert problem.max_food_count == 5
+    assert problem.maximum_intake_grams == 300
+    assert problem.grams_per_unit == 1
+    assert len(problem.constraints) == 2
+
+
+@pytest.mark.parametrize("max_food_count", [0, 31])
+def test_catalog_optimize_request_rejects_out_of_range_food_count(
+    max_food_count: int,
+) -> None:
+    request_data = {
+        "objective": _REQUEST_DATA["objective"],
+        "constraints": [],
+        "maxFoodCount": max_food_count,
+    }
+
+    with pytest.raises(ValidationError, match="max_food_count"):
+        CatalogOptimizeRequest.model_validate(request_data)
+
+
+def test_validate_food_search_request_reads_query_parameters() -> None:
+    food_search_request = validate_food_search_request(
+        {"query": "卵", "sortBy": "PROT-", "order": "desc", "page": "3"}
+    )
+
+    assert food_search_request.query == "卵"
+    assert food_search_request.sort_by == "PROT-"
+    assert food_search_request.order == "desc"
+    assert food_search_request.page == 3
+
+
+def test_validate_food_search_request_rejects_unknown_sort_key() -> None:
+    with pytest.raises(ValueError, match="Sort key must be one of"):
+        validate_food_search_request({"sortBy": "VITK"})
+
+
+def test_food_search_response_uses_camel_case_aliases() -> None:
+    page = FoodSearchPage(
+        nutrient_identifiers=("ENERC_KCAL", "PROT-"),
+        foods=[FoodSearchItem(name="egg", values=("134", "12.5"))],
+        total_count=1,
+        page=1,
+        total_pages=1,
+    )
+
+    response = FoodSearchResponse.from_domain_page(page)
+
+    assert response.model_dump(by_alias=True) == {
+        "nutrientIdentifiers": ["ENERC_KCAL", "PROT-"],
+        "foods": [{"name": "egg", "values": ["134", "12.5"]}],
+        "totalCount": 1,
+        "page": 1,
+        "totalPages": 1,
+    }
+
+
+def test_sweep_request_to_sweep_problem() -> None:
+    request_data = {
+        **_REQUEST_DATA,
+        "constraintIndex": 0,
+        "start": 1000,
+        "stop": 2000,
+        "points": 5,
+    }
+
+    problem = SweepRequest.model_validate(request_data).to_sweep_problem()
+
+    assert problem.constraint_index == 0
+    assert problem.constraint_values == [1000, 1250, 1500, 1750, 2000]
+    assert len(problem.constraints) == 2
+
+
+@pytest.mark.parametrize(
+    ("sweep_data", "message"),
+    [
+        ({"constraintIndex": 2, "points": 5}, "Constraint index"),
+        ({"constraintIndex": 0, "points": 1}, "points"),
+        ({"constraintIndex": 0, "points": 101}, "points"),
+    ],
+)
+def test_sweep_request_rejects_invalid_sweep(
+    sweep_data: dict[str, int], message: str
+) -> None:
+    request_data = {**_REQUEST_DATA, "start": 0, "stop": 100, **sweep_data}
+
+    with pytest.raises(ValidationError, match=message):
+        SweepRequest.model_validate(request_data)
+
+
+def test_sweep_request_rejects_invalid_constraint_values() -> None:
+    request_data = {
+        **_REQUEST_DATA,
+        "constraintIndex": 1,
+        "start": -10,
+        "stop": 10,
+        "points": 3,
+    }
+    sweep_request = SweepRequest.model_validate(request_data)
+
+    with pytest.raises(ValueError, match="finite and non-negative"):
+        sweep_request.to_sweep_problem()
+
+
+def test_sweep_response_uses_camel_case_aliases() -> None:
+    response = SweepResponse.from_domain_result(
+        [
+            {
+                "constraint_value": 1,
+                "objective_value": None,
+                "result": {
+                    "status": "Infeasible",
+                    "error_code": "optimization_infeasible",
+                },
+            }
+        ]
+    )
+
+    assert response.model_dump(by_alias=True) == {
+        "points": [
+            {
+                "constraintValue": 1,
+                "objectiveValue": None,
+                "result": {
+                    "status": "Infeasible",
+                    "isProvenOptimal": None,
+                    "solutionMethod": None,
+                    "foodIntakeGrams": None,
+                    "totalNutrientValues": None,
+                    "pfcCompositionRatio": None,
+                    "sensitivity": None,
+                    "errorCode": "optimization_infeasible",
+                    "infeasibilityDiagnosis": None,
+                    "solveMetrics": None,
+                },
+            }
+        ]
+    }
+
+
+def test_failed_meal_plan_response_rejects_daily_plans() -> None:
+    with pytest.raises(ValidationError, match="must not include result"):
+        MealPlanResponse.model_validate(
+            {
+                "status": "Infeasible",
+                "errorCode": "optimization_infeasible",
+                "dailyPlans": [],
+            }
+        )
+
+
+def test_optimize_response_serializes_sensitivity() -> None:
+    response = OptimizeResponse.model_validate(
+        {
+            "status": "Optimal",
+            "is_proven_optimal": True,
+            "solution_method": "mip",
+            "food_intake_grams": {"boiled_egg": 100},
+            "total_nutrient_values": {"energy": 134.0},
+            "pfc_composition_ratio": {"protein": 34.5},
+            "sensitivity": {
+                "constraints": [
+                    {
+                        "min_max": "max",
+                        "nutrient": "energy",
+                        "unit": "energy",
+                        "value": 200,
+                        "slack": 66.0,
+                        "shadow_price": 0.0,
+                    }
+                ],
+                "food_reduced_costs": {"boiled_egg": 0.125},
+            },
+        }
+    )
+
+    sensitivity = response.model_dump(by_alias=True)["sensitivity"]
+
+    assert sensitivity["constraints"][0]["shadowPrice"] == 0.0
+    assert sensitivity["constraints"][0]["minMax"] == "max"
+    assert sensitivity["foodReducedCosts"] == {"boiled_egg": 0.125}
+
+
+def test_failed_response_rejects_sensitivity() -> None:
+    with pytest.raises(ValidationError, match="must not include result"):
+        OptimizeResponse.model_validate(
+            {
+                "status": "Infeasible",
+                "error_code": "optimization_infeasible",
+                "sensitivity": {"constraints": [], "food_reduced_costs": {}},
+            }
+        )
+
+
+def test_failed_response_serializes_infeasibility_diagnosis() -> None:
+    response = OptimizeResponse.model_validate(
+        {
+            "status": "Infeasible",
+            "error_code": "optimization_infeasible",
+            "infeasibility_diagnosis": {
+                "constraint_violations": [
+                    {
+                        "min_max": "max",
+                        "nutrient": "energy",
+                        "unit": "energy",
+                        "value": 1,
+                        "violation": 0.3,
+                    }
+                ],
+                "food_bound_violations": [
+                    {
+                        "food_name": "boiled_egg",
+                        "bound": "minimum",
+                        "value": 50,
+                        "violation": 49,
+                    }
+                ],
+                "food_count_violation": {"value": 2, "violation": 1},
+            },
+        }
+    )
+
+    diagnosis = response.model_dump(by_alias=True)["infeasibilityDiagnosis"]
+
+    assert diagnosis["constraintViolations"][0]["minMax"] == "max"
+    assert diagnosis["foodBoundViolations"][0]["foodName"] == "boiled_egg"
+    assert diagnosis["foodCountViolation"] == {"value": 2, "violation": 1}
+
+
+def test_optimal_response_rejects_infeasibility_diagnosis() -> None:
+    with pytest.raises(ValidationError, match="infeasibility diagnosis"):
+        OptimizeResponse.model_validate(
+            {
+                "status": "Optimal",
+                "is_proven_optimal": True,
+                "solution_method": "mip",
+                "food_intake_grams": {"boiled_egg": 100},
+                "total_nutrient_values": {"energy": 134.0},
+                "pfc_composition_ratio": {"protein": 34.5},
+                "infeasibility_diagnosis": {
+                    "constraint_violations": [],
+                    "food_bound_violations": [],
+                },
+            }
+        )
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from diet.nutrition_optimizer.food_catalog import (
+    get_food_catalog,
+    load_food_catalog,
+    parse_nutrient_value,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("343", 343.0),
+        ("(0.6)", 0.6),
+        ("Tr", 0.0),
+        ("(Tr)", 0.0),
+        ("-", 0.0),
+        ("*", 0.0),
+        ("", 0.0),
+    ],
+)
+def test_parse_nutrient_value(value: str, expected: float) -> None:
+    assert parse_nutrient_value(value) == expected
+
+
+def test_load_food_catalog_reads_nutrient_columns(tmp_path: Path) -> None:
+    food_master_path = tmp_path / "food_master.json"
+    food_master_path.write_text(
+        json.dumps(
+            {
+                "nutrientIdentifiers": [
+                    "ENERC_KCAL",
+                    "PROT-",
+                    "NA",
+                    "FAT-",
+                    "CHOCDF-",
+                ],
+                "foods": [
+                    {
+                        "name": "egg",
+                        "values": ["134", "12.5", "1", "10.4", "Tr"],
+                    },
+                    {
+                        "name": "rice",
+                        "values": ["156", "(2.6)", "1", "0.4", "37.2"],
+                    },
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    food_catalog = load_food_catalog(food_master_path)
+
+    assert list(food_catalog.names) == ["egg", "rice"]
+    assert food_catalog.nutrient_values == {
+        "energy": (134.0, 156.0),
+        "protein": (12.5, 2.6),
+        "fat": (10.4, 0.4),
+        "carbohydrates": (0.0, 37.2),
+    }
+    assert food_catalog.display_values["protein"] == ("12.5", "(2.6)")
+    food_information = food_catalog.to_food_information(200)
+    assert food_information[1].name == "rice"
+    assert food_information[1].carbohydrates == 37.2
+    assert food_information[1].maximum_intake_grams == 200
+
+
+def test_get_food_catalog_loads_food_master_once() -> None:
+    food_catalog = get_food_catalog()
+
+    assert len(food_catalog) == 2538
+    assert get_food_catalog() is food_catalog
@@ -1,6 +1,9 @@
 import pytest
 
-from diet.nutrition_optimizer.models import FoodInformation
+from diet.nutrition_optimizer.models import (
+    FoodInformation,
+    validate_food_names_are_unique,
+)
 
 
 def test_valid_food_information() -> None:
@@ -122,3 +125,66 @@ def test_minimum_intake_grams_is_less_than_maximum_intake_grams() -> None:
             minimum_intake_grams=3,
             maximum_intake_grams=1,
         )
+
+
+def test_unique_food_names() -> None:
+    validate_food_names_are_unique(["boiled_egg", "rice"])
+
+
+def test_duplicate_food_names_are_listed_once_in_sorted_order() -> None:
+    with pytest.raises(
+        ValueError, match="Food names must be unique: boiled_egg, rice."
+    ):
+        validate_food_names_are_unique(
+            ["rice", "boiled_egg", "rice", "boiled_egg", "rice", "natto"]
+        )
+
+
+def test_intake_units_round_inward_to_whole_portions() -> None:
+    boiled_egg = FoodInformation(
+        name="boiled_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=40,
+        maximum_intake_grams=170,
+        grams_per_unit=50,
+    )
+
+    assert boiled_egg.minimum_intake_units == 1
+    assert boiled_egg.maximum_intake_units == 3
+
+
+@pytest.mark.parametrize("grams_per_unit", [0, -50])
+def test_non_positive_grams_per_unit(grams_per_unit: int) -> None:
+    with pytest.raises(
+        ValueError, match="Grams_per_unit must be a positive integer."
+    ):
+        FoodInformation(
+            name="boiled_egg",
+            energy=134,
+            protein=12.5,
+            fat=10.4,
+            carbohydrates=0.3,
+            minimum_intake_grams=0,
+            maximum_intake_grams=150,
+            grams_per_unit=grams_per_unit,
+        )
+
+
+def test_intake_range_without_a_whole_portion() -> None:
+    with pytest.raises(
+        ValueError,
+        match="must include at least one multiple of grams_per_unit.",
+    ):
+        FoodInformation(
+            name="boiled_egg",
+            energy=134,
+            protein=12.5,
+            fat=10.4,
+            carbohydrates=0.3,
+            minimum_intake_grams=60,
+            maximum_intake_grams=90,
+            grams_per_unit=50,
+        )
@@ -0,0 +1,170 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from diet.nutrition_optimizer.food_master import (
+    FoodNames,
+    NutrientFlag,
+    ParsedNutrientValue,
+    format_nutrient_value,
+    get_food_master,
+    load_food_master,
+    parse_food_master_value,
+)
+
+
+def _write_food_master(path: Path) -> Path:
+    food_master_path = path / "food_master.json"
+    food_master_path.write_text(
+        json.dumps(
+            {
+                "nutrientIdentifiers": ["ENERC_KCAL", "PROT-", "NA"],
+                "foods": [
+                    {"name": "egg", "values": ["134", "12.5", "(Tr)"]},
+                    {"name": "rice", "values": ["156", "(2.6)", "-"]},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    return food_master_path
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("343", ParsedNutrientValue(343.0, NutrientFlag(0), 0)),
+        ("6.0", ParsedNutrientValue(6.0, NutrientFlag(0), 1)),
+        ("(0.62)", ParsedNutrientValue(0.62, NutrientFlag.ESTIMATED, 2)),
+        ("Tr", ParsedNutrientValue(0.0, NutrientFlag.TRACE, 0)),
+        (
+            "(Tr)",
+            ParsedNutrientValue(
+                0.0, NutrientFlag.ESTIMATED | NutrientFlag.TRACE, 0
+            ),
+        ),
+        ("-", ParsedNutrientValue(0.0, NutrientFlag.MISSING, 0)),
+        ("*", ParsedNutrientValue(0.0, NutrientFlag.MISSING, 0)),
+        ("14.0†", ParsedNutrientValue(14.0, NutrientFlag(0), 1)),
+    ],
+)
+def test_parse_food_master_value(
+    value: str, expected: ParsedNutrientValue
+) -> None:
+    assert parse_food_master_value(value) == expected
+
+
+def test_parse_food_master_value_rejects_extra_decimal_places() -> None:
+    with pytest.raises(ValueError, match="decimal places"):
+        parse_food_master_value("0.125")
+
+
+@pytest.mark.parametrize("value", ["343", "6.0", "(0.62)", "Tr", "(Tr)", "-"])
+def test_format_nutrient_value_restores_food_master_text(value: str) -> None:
+    parsed_value = parse_food_master_value(value)
+
+    assert (
+        format_nutrient_value(
+            parsed_value.value, parsed_value.flags, parsed_value.decimal_places
+        )
+        == value
+    )
+
+
+def test_food_names_decodes_names_from_offsets() -> None:
+    food_names = FoodNames.from_names(["鶏卵", "rice", ""])
+
+    assert len(food_names) == 3
+    assert food_names.name_offsets.tolist() == [0, 6, 10, 10]
+    assert food_names[0] == "鶏卵"
+    assert food_names[-2] == "rice"
+    assert food_names[1:] == ["rice", ""]
+    assert list(food_names) == ["鶏卵", "rice", ""]
+    with pytest.raises(IndexError):
+        food_names[3]
+
+
+def test_load_food_master_reads_typed_columns(tmp_path: Path) -> None:
+    food_master = load_food_master(_write_food_master(tmp_path))
+
+    assert list(food_master.names) == ["egg", "rice"]
+    assert food_master.values.dtype == np.float32
+    assert food_master.values.shape == (3, 2)
+    assert food_master.column("PROT-").tolist() == pytest.approx([12.5, 2.6])
+    assert food_master.exact_column("PROT-") == (12.5, 2.6)
+    assert food_master.flag_column("NA").tolist() == [
+        NutrientFlag.ESTIMATED | NutrientFlag.TRACE,
+        NutrientFlag.MISSING,
+    ]
+    assert food_master.display_column("PROT-") == ("12.5", "(2.6)")
+    with pytest.raises(KeyError):
+        food_master.column("VITK")
+
+
+def test_load_food_master_memory_maps_cached_columns(tmp_path: Path) -> None:
+    food_master_path = _write_food_master(tmp_path)
+    cache_dir = tmp_path / "cache"
+
+    parsed_food_master = load_food_master(food_master_path, cache_dir)
+    cached_food_master = load_food_master(food_master_path, cache_dir)
+
+    assert len(list(cache_dir.iterdir())) == 1
+    assert isinstance(cached_food_master.values, np.memmap)
+    assert isinstance(cached_food_master.flags, np.memmap)
+    assert not cached_food_master.values.flags.writeable
+    assert isinstance(cached_food_master.names.encoded_names, np.memmap)
+    assert list(cached_food_master.names) == list(parsed_food_master.names)
+    assert (
+        cached_food_master.nutrient_identifiers
+        == parsed_food_master.nutrient_identifiers
+    )
+    assert np.array_equal(cached_food_master.values, parsed_food_master.values)
+    assert cached_food_master.display_column(
+        "NA"
+    ) == parsed_food_master.display_column("NA")
+
+
+def test_load_food_master_ignores_cache_of_changed_source(
+    tmp_path: Path,
+) -> None:
+    food_master_path = _write_food_master(tmp_path)
+    cache_dir = tmp_path / "cache"
+    load_food_master(food_master_path, cache_dir)
+    food_master = json.loads(food_master_path.read_text(encoding="utf-8"))
+    food_master["foods"][0]["values"][0] = "150"
+    food_master_path.write_text(json.dumps(food_master), encoding="utf-8")
+
+    reloaded_food_master = load_food_master(food_master_path, cache_dir)
+
+    assert reloaded_food_master.exact_column("ENERC_KCAL") == (150.0, 156.0)
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+@pytest.mark.parametrize("corrupt_bytes", [b"", b"not a numpy array"])
+def test_load_food_master_rebuilds_corrupt_cache(
+    tmp_path: Path, corrupt_bytes: bytes
+) -> None:
+    food_master_path = _write_food_master(tmp_path)
+    cache_dir = tmp_path / "cache"
+    load_food_master(food_master_path, cache_dir)
+    (cache_path,) = cache_dir.iterdir()
+    (cache_path / "values.npy").write_bytes(corrupt_bytes)
+
+    reloaded_food_master = load_food_master(food_master_path, cache_dir)
+    cached_food_master = load_food_master(food_master_path, cache_dir)
+
+    assert reloaded_food_master.exact_column("ENERC_KCAL") == (134.0, 156.0)
+    assert isinstance(cached_food_master.values, np.memmap)
+    assert np.array_equal(
+        cached_food_master.values, reloaded_food_master.values
+    )
+
+
+def test_get_food_master_loads_food_master_once() -> None:
+    food_master = get_food_master()
+
+    assert len(food_master) == 2538
+    assert len(food_master.nutrient_identifiers) == 33
+    assert get_food_master() is food_master
@@ -0,0 +1,120 @@
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+
+from diet.nutrition_optimizer.food_master import (
+    FOOD_MASTER_PATH,
+    NutrientFlag,
+    get_food_master,
+    load_food_master,
+)
+from diet.nutrition_optimizer.food_master_asset import (
+    FOOD_MASTER_BINARY_MAGIC,
+    FOOD_MASTER_BINARY_VERSION,
+    build_food_master_asset,
+    encode_food_master_binary,
+    get_food_master_asset,
+    get_food_master_binary_asset,
+)
+
+
+def test_build_food_master_asset_fingerprints_and_compresses(
+    tmp_path: Path,
+) -> None:
+    food_master_path = tmp_path / "food_master.json"
+    food_master_path.write_text(
+        '{"nutrientIdentifiers": [], "foods": []}', encoding="utf-8"
+    )
+
+    food_master_asset = build_food_master_asset(
+        tmp_path / "assets", food_master_path
+    )
+    rebuilt_food_master_asset = build_food_master_asset(
+        tmp_path / "assets", food_master_path
+    )
+    food_master_path.write_text(
+        '{"nutrientIdentifiers": ["PROT-"], "foods": []}', encoding="utf-8"
+    )
+    changed_food_master_asset = build_food_master_asset(
+        tmp_path / "changed_assets", food_master_path
+    )
+
+    assert len(food_master_asset.digest) == 16
+    assert food_master_asset == rebuilt_food_master_asset
+    assert changed_food_master_asset.digest != food_master_asset.digest
+    assert food_master_asset.path.read_bytes() == (
+        b'{"nutrientIdentifiers": [], "foods": []}'
+    )
+    assert (
+        gzip.decompress(food_master_asset.gzip_path.read_bytes())
+        == food_master_asset.path.read_bytes()
+    )
+
+
+def test_get_food_master_asset_compresses_food_master_once() -> None:
+    food_master_asset = get_food_master_asset()
+
+    assert food_master_asset.path.read_bytes() == (
+        FOOD_MASTER_PATH.read_bytes()
+    )
+    assert food_master_asset.gzip_path.stat().st_size < (
+        food_master_asset.path.stat().st_size * 0.2
+    )
+    assert get_food_master_asset() is food_master_asset
+
+
+def test_encode_food_master_binary_writes_aligned_columns(
+    tmp_path: Path,
+) -> None:
+    food_master_path = tmp_path / "food_master.json"
+    food_master_path.write_text(
+        json.dumps(
+            {
+                "nutrientIdentifiers": ["ENERC_KCAL", "PROT-"],
+                "foods": [
+                    {"name": "鶏卵", "values": ["142", "(Tr)"]},
+                    {"name": "rice", "values": ["342", "6.10"]},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    content = encode_food_master_binary(load_food_master(food_master_path))
+
+    assert content[:4] == FOOD_MASTER_BINARY_MAGIC
+    header = np.frombuffer(content, dtype="<u4", count=5, offset=4)
+    assert header.tolist() == [FOOD_MASTER_BINARY_VERSION, 2, 2, 16, 10]
+    name_offsets = np.frombuffer(content, dtype="<u4", count=3, offset=24)
+    name_order = np.frombuffer(content, dtype="<u4", count=2, offset=36)
+    values = np.frombuffer(content, dtype="<f4", count=4, offset=44)
+    flags = np.frombuffer(content, dtype=np.uint8, count=4, offset=60)
+    decimal_places = np.frombuffer(content, dtype=np.uint8, count=4, offset=64)
+    assert name_offsets.tolist() == [0, 6, 10]
+    assert name_order.tolist() == [1, 0]
+    assert values.tolist() == [142.0, 342.0, 0.0, np.float32(6.1)]
+    assert flags.tolist() == [
+        0,
+        0,
+        NutrientFlag.ESTIMATED | NutrientFlag.TRACE,
+        0,
+    ]
+    assert decimal_places.tolist() == [0, 0, 0, 2]
+    assert content[68:] == "ENERC_KCAL\nPROT-鶏卵rice".encode()
+
+
+def test_get_food_master_binary_asset_is_smaller_than_json() -> None:
+    food_master_binary_asset = get_food_master_binary_asset()
+
+    assert food_master_binary_asset.mimetype == "application/octet-stream"
+    assert (
+        food_master_binary_asset.path.read_bytes()
+        == encode_food_master_binary(get_food_master())
+    )
+    assert (
+        food_master_binary_asset.path.stat().st_size
+        < get_food_master_asset().path.stat().st_size
+    )
+    assert get_food_master_binary_asset() is food_master_binary_asset
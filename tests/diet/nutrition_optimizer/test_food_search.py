@@ -0,0 +1,199 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from diet.nutrition_optimizer.food_master import FoodMaster, parse_food_master
+from diet.nutrition_optimizer.food_search import (
+    FoodSearchIndex,
+    FoodSearchPage,
+    create_food_name_sort_key,
+    get_food_search_index,
+    load_food_search_index,
+    normalize_search_text,
+)
+
+
+def _food_master() -> FoodMaster:
+    names = ("鶏卵　全卵　生", "こめ　精白米", "ＡＢＣスープ", "鶏肉　むね")
+    values = (
+        ("142", "12.2", "10.2", "0.4"),
+        ("342", "(6.1)", "0.9", "77.6"),
+        ("40", "Tr", "1.0", "8.0"),
+        ("105", "23.3", "1.9", "0"),
+    )
+    return parse_food_master(
+        json.dumps(
+            {
+                "nutrientIdentifiers": [
+                    "ENERC_KCAL",
+                    "PROT-",
+                    "FAT-",
+                    "CHOCDF-",
+                ],
+                "foods": [
+                    {"name": name, "values": list(food_values)}
+                    for name, food_values in zip(names, values, strict=True)
+                ],
+            }
+        ).encode()
+    )
+
+
+def _food_search_index() -> FoodSearchIndex:
+    return FoodSearchIndex.from_food_master(_food_master())
+
+
+def _names(page: FoodSearchPage) -> list[str]:
+    return [food.name for food in page.foods]
+
+
+def test_normalize_search_text_folds_width_and_case() -> None:
+    assert normalize_search_text(" ＡＢＣスープ ") == "abcスープ"
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("鶏", ["鶏卵　全卵　生", "鶏肉　むね"]),
+        ("鶏肉", ["鶏肉　むね"]),
+        ("全卵　生", ["鶏卵　全卵　生"]),
+        ("abc", ["ＡＢＣスープ"]),
+        ("卵生", []),
+        ("豆", []),
+    ],
+)
+def test_search_matches_name_substrings(
+    query: str, expected: list[str]
+) -> None:
+    index = _food_search_index()
+
+    page = index.search(query, "name", "asc", page=1, page_size=10)
+
+    assert sorted(_names(page)) == sorted(expected)
+
+
+def test_search_sorts_by_nutrient_with_name_tie_break() -> None:
+    index = _food_search_index()
+
+    protein_page = index.search("", "PROT-", "desc", page=1, page_size=10)
+    energy_page = index.search("鶏", "ENERC_KCAL", "asc", page=1, page_size=10)
+
+    assert _names(protein_page) == [
+        "鶏肉　むね",
+        "鶏卵　全卵　生",
+        "こめ　精白米",
+        "ＡＢＣスープ",
+    ]
+    assert _names(energy_page) == [
+        "鶏肉　むね",
+        "鶏卵　全卵　生",
+    ]
+
+
+def test_food_name_sort_key_follows_japanese_collation() -> None:
+    names = ["アジ", "鶏卵", "ああ", "10", "abd", "あじ", "あーす", "（鶏）"]
+    names += ["あし", "Abc", "2", "牛乳", "ぁあ", "あい", "アシ", "abc"]
+
+    assert sorted(names, key=create_food_name_sort_key) == [
+        "（鶏）",
+        "10",
+        "2",
+        "abc",
+        "Abc",
+        "abd",
+        "ぁあ",
+        "ああ",
+        "あーす",
+        "あい",
+        "あし",
+        "アシ",
+        "あじ",
+        "アジ",
+        "牛乳",
+        "鶏卵",
+    ]
+
+
+def test_search_returns_one_page_with_display_values() -> None:
+    index = _food_search_index()
+
+    page = index.search("", "PROT-", "desc", page=2, page_size=3)
+
+    assert page.nutrient_identifiers == (
+        "ENERC_KCAL",
+        "PROT-",
+        "FAT-",
+        "CHOCDF-",
+    )
+    assert page.total_count == 4
+    assert page.total_pages == 2
+    assert page.page == 2
+    assert [food.values for food in page.foods] == [("40", "Tr", "1.0", "8.0")]
+
+
+def test_search_clamps_page_to_last_page() -> None:
+    index = _food_search_index()
+
+    page = index.search("鶏", "name", "asc", page=5, page_size=1)
+
+    assert page.page == 2
+    assert page.total_pages == 2
+    assert len(page.foods) == 1
+
+
+def test_search_without_matches_returns_first_empty_page() -> None:
+    index = _food_search_index()
+
+    page = index.search("豆", "name", "asc", page=3, page_size=10)
+
+    assert page.page == 1
+    assert page.total_count == 0
+    assert page.total_pages == 0
+    assert page.foods == []
+
+
+def test_search_rejects_unknown_sort_key() -> None:
+    index = _food_search_index()
+
+    with pytest.raises(ValueError, match="Invalid sort key"):
+        index.search("", "VITK", "asc", page=1, page_size=10)
+
+
+def test_get_food_search_index_builds_index_once() -> None:
+    index = get_food_search_index()
+
+    assert len(index) == 2538
+    assert get_food_search_index() is index
+
+
+def test_load_food_search_index_memory_maps_cached_arrays(
+    tmp_path: Path,
+) -> None:
+    cache_path = tmp_path / "search"
+
+    built_index = load_food_search_index(_food_master(), cache_path)
+    cached_index = load_food_search_index(_food_master(), cache_path)
+
+    assert isinstance(cached_index._sort_orders, np.memmap)
+    assert isinstance(cached_index._posting_indexes, np.memmap)
+    for query in ("", "鶏", "全卵　生", "abc"):
+        assert cached_index.search(
+            query, "PROT-", "desc", page=1, page_size=10
+        ) == built_index.search(query, "PROT-", "desc", page=1, page_size=10)
+
+
+def test_load_food_search_index_rebuilds_corrupt_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path / "search"
+    built_index = load_food_search_index(_food_master(), cache_path)
+    (cache_path / "sort_orders.npy").write_bytes(b"")
+
+    rebuilt_index = load_food_search_index(_food_master(), cache_path)
+    cached_index = load_food_search_index(_food_master(), cache_path)
+
+    assert isinstance(cached_index._sort_orders, np.memmap)
+    for index in (rebuilt_index, cached_index):
+        assert index.search(
+            "", "PROT-", "desc", page=1, page_size=10
+        ) == built_index.search("", "PROT-", "desc", page=1, page_size=10)
@@ -0,0 +1,183 @@
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+import pytest
+from pytest_mock import MockerFixture
+
+from diet.nutrition_optimizer.jobs import (
+    JobNotFoundError,
+    JobQueueFullError,
+    OptimizationJob,
+    OptimizationJobQueue,
+)
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+)
+
+_FOOD_INFORMATION = [
+    FoodInformation(
+        name="boiled_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=50,
+        maximum_intake_grams=150,
+    ),
+]
+_OBJECTIVE = Objective(sense="maximize", nutrient="energy")
+_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=200),
+]
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def release_solver(mocker: MockerFixture) -> Generator[Event, None, None]:
+    release = Event()
+
+    def blocking_solve(*args: object) -> dict[str, str]:
+        release.wait(timeout=5)
+        return {
+            "status": "Infeasible",
+            "error_code": "optimization_infeasible",
+        }
+
+    mocker.patch(
+        "diet.nutrition_optimizer.jobs.solve_optimization_problem",
+        side_effect=blocking_solve,
+    )
+    yield release
+    release.set()
+
+
+def _create_queue(
+    max_queue_depth: int = 2, clock: _FakeClock | None = None
+) -> OptimizationJobQueue:
+    return OptimizationJobQueue(
+        max_workers=1,
+        max_queue_depth=max_queue_depth,
+        result_ttl_seconds=60,
+        executor_factory=ThreadPoolExecutor,
+        clock=clock or _FakeClock(),
+    )
+
+
+def _wait_until_finished(
+    queue: OptimizationJobQueue, job_id: str
+) -> OptimizationJob:
+    for _ in range(500):
+        job = queue.get(job_id)
+        if job.status not in ("queued", "running"):
+            return job
+        sleep(0.01)
+    raise AssertionError(f"Job did not finish: {job_id}")
+
+
+def test_submit_solves_in_process_pool() -> None:
+    queue = OptimizationJobQueue(
+        max_workers=1, max_queue_depth=1, result_ttl_seconds=60
+    )
+    try:
+        job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+        finished_job = _wait_until_finished(queue, job.job_id)
+    finally:
+        queue.shutdown()
+
+    assert finished_job.status == "completed"
+    assert finished_job.result is not None
+    assert finished_job.result["status"] == "Optimal"
+
+
+def test_completed_job_results_are_passed_to_on_result() -> None:
+    results: list[NutritionOptimizerResult] = []
+    queue = OptimizationJobQueue(
+        max_workers=1,
+        max_queue_depth=1,
+        result_ttl_seconds=60,
+        executor_factory=ThreadPoolExecutor,
+        on_result=results.append,
+    )
+    job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    finished_job = _wait_until_finished(queue, job.job_id)
+    for _ in range(500):
+        if results:
+            break
+        sleep(0.01)
+    queue.shutdown()
+
+    assert results == [finished_job.result]
+
+
+def test_submit_rejects_jobs_beyond_queue_depth(
+    release_solver: Event,
+) -> None:
+    queue = _create_queue(max_queue_depth=2)
+    queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    with pytest.raises(JobQueueFullError):
+        queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    release_solver.set()
+    queue.shutdown()
+
+
+def test_cancel_queued_job(release_solver: Event) -> None:
+    queue = _create_queue()
+    running_job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    queued_job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    cancelled_job = queue.cancel(queued_job.job_id)
+
+    assert cancelled_job.status == "cancelled"
+    release_solver.set()
+    assert _wait_until_finished(queue, running_job.job_id).status == (
+        "completed"
+    )
+    queue.shutdown()
+
+
+def test_finished_jobs_expire_after_ttl() -> None:
+    clock = _FakeClock()
+    queue = _create_queue(clock=clock)
+    job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    _wait_until_finished(queue, job.job_id)
+
+    clock.now = 60
+
+    with pytest.raises(JobNotFoundError):
+        queue.get(job.job_id)
+    queue.shutdown()
+
+
+def test_failed_job_reports_failed_status(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.jobs.solve_optimization_problem",
+        side_effect=RuntimeError("solver exploded"),
+    )
+    queue = _create_queue()
+
+    job = queue.submit(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    assert _wait_until_finished(queue, job.job_id) == OptimizationJob(
+        job_id=job.job_id, status="failed"
+    )
+    queue.shutdown()
+
+
+def test_get_unknown_job() -> None:
+    with pytest.raises(JobNotFoundError):
+        _create_queue().get("unknown")
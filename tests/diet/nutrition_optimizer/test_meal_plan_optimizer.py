@@ -0,0 +1,266 @@
+from dataclasses import replace
+from typing import cast
+
+import pytest
+from pytest_mock import MockerFixture
+
+from diet.nutrition_optimizer.meal_plan_optimizer import MealPlanOptimizer
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    Objective,
+    OptimalMealPlanResult,
+)
+
+_BOILED_EGG = FoodInformation(
+    name="boiled_egg",
+    energy=134,
+    protein=12.5,
+    fat=10.4,
+    carbohydrates=0.3,
+    minimum_intake_grams=50,
+    maximum_intake_grams=150,
+)
+_RICE = FoodInformation(
+    name="rice",
+    energy=156,
+    protein=2.6,
+    fat=0.4,
+    carbohydrates=37.2,
+    minimum_intake_grams=0,
+    maximum_intake_grams=300,
+)
+_OBJECTIVE = Objective(sense="maximize", nutrient="protein")
+_DAILY_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=500),
+]
+
+
+def test_solve_applies_daily_and_plan_constraints(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.meal_plan_optimizer._settings.meal_plan_relative_gap",
+        0,
+    )
+    plan_constraints = [
+        Constraint(
+            min_max="max", nutrient="energy", unit="energy", value=1200
+        ),
+    ]
+
+    result = MealPlanOptimizer(
+        [_BOILED_EGG, _RICE],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        plan_constraints,
+        days=3,
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalMealPlanResult, result)
+    assert optimal_result["is_proven_optimal"] is True
+    assert len(optimal_result["daily_plans"]) == 3
+    assert all(
+        daily_plan["total_nutrient_values"]["energy"] <= 500
+        for daily_plan in optimal_result["daily_plans"]
+    )
+    assert all(
+        daily_plan["food_intake_grams"]["boiled_egg"] >= 50
+        for daily_plan in optimal_result["daily_plans"]
+    )
+    assert 1190 <= optimal_result["total_nutrient_values"]["energy"] <= 1200
+    assert optimal_result["total_nutrient_values"]["protein"] == pytest.approx(
+        sum(
+            daily_plan["total_nutrient_values"]["protein"]
+            for daily_plan in optimal_result["daily_plans"]
+        ),
+        abs=0.2,
+    )
+
+
+def test_solve_limits_food_occurrences() -> None:
+    result = MealPlanOptimizer(
+        [_BOILED_EGG, _RICE],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        [],
+        days=3,
+        max_food_occurrences=1,
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalMealPlanResult, result)
+    egg_grams = [
+        daily_plan["food_intake_grams"]["boiled_egg"]
+        for daily_plan in optimal_result["daily_plans"]
+    ]
+    assert sum(grams > 0 for grams in egg_grams) == 1
+    assert max(egg_grams) == 150
+    assert all(grams in (0, 150) for grams in egg_grams)
+
+
+def test_solve_applies_pfc_ratio_to_plan_totals() -> None:
+    plan_constraints = [
+        Constraint(min_max="min", nutrient="fat", unit="pfc_ratio", value=30),
+        Constraint(min_max="max", nutrient="fat", unit="pfc_ratio", value=40),
+    ]
+
+    result = MealPlanOptimizer(
+        [_BOILED_EGG, _RICE],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        plan_constraints,
+        days=2,
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalMealPlanResult, result)
+    assert 30 <= optimal_result["pfc_composition_ratio"]["fat"] <= 40
+
+
+def test_infeasible_plan() -> None:
+    plan_constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=100),
+    ]
+
+    result = MealPlanOptimizer(
+        [_BOILED_EGG, _RICE],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        plan_constraints,
+        days=2,
+    ).solve()
+
+    assert result == {
+        "status": "Infeasible",
+        "error_code": "optimization_infeasible",
+    }
+
+
+def test_model_size_grows_linearly_with_days() -> None:
+    model_sizes = []
+    for days in (1, 2, 4):
+        optimizer = MealPlanOptimizer(
+            [_BOILED_EGG, _RICE],
+            _OBJECTIVE,
+            _DAILY_CONSTRAINTS,
+            [],
+            days=days,
+            max_food_occurrences=1,
+        )
+        optimizer._preparation()
+        model_sizes.append(
+            (
+                len(optimizer._problem.variables()),
+                optimizer._problem.numConstraints(),
+            )
+        )
+
+    assert model_sizes == [(2, 1), (8, 10), (16, 18)]
+
+
+@pytest.mark.parametrize(
+    ("days", "max_food_occurrences", "message"),
+    [
+        (0, None, "Number of days must be at least 1"),
+        (2, 0, "Maximum food occurrences must be at least 1"),
+    ],
+)
+def test_invalid_plan_shape_is_rejected(
+    days: int, max_food_occurrences: int | None, message: str
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        MealPlanOptimizer(
+            [_BOILED_EGG],
+            _OBJECTIVE,
+            _DAILY_CONSTRAINTS,
+            [],
+            days=days,
+            max_food_occurrences=max_food_occurrences,
+        )
+
+
+def test_solve_in_whole_portions() -> None:
+    result = MealPlanOptimizer(
+        [replace(_BOILED_EGG, grams_per_unit=50)],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        [],
+        days=2,
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalMealPlanResult, result)
+    assert [
+        daily_plan["food_intake_grams"]
+        for daily_plan in optimal_result["daily_plans"]
+    ] == [{"boiled_egg": 150}, {"boiled_egg": 150}]
+
+
+def test_unsolved_food_defaults_to_whole_minimum_intake_units() -> None:
+    zero_nutrient_food = FoodInformation(
+        name="zero_nutrient_food",
+        energy=0,
+        protein=0,
+        fat=0,
+        carbohydrates=0,
+        minimum_intake_grams=30,
+        maximum_intake_grams=300,
+        grams_per_unit=50,
+    )
+
+    optimizer = MealPlanOptimizer(
+        [zero_nutrient_food],
+        _OBJECTIVE,
+        [],
+        [],
+        days=2,
+        max_food_occurrences=1,
+    )
+    optimizer._preparation()
+
+    assert [
+        optimizer._get_food_intake_grams(
+            daily_variables[0], zero_nutrient_food
+        )
+        for daily_variables in optimizer._food_intake_unit_variables
+    ] == [50, 50]
+
+
+def test_solve_with_relative_gap_is_not_proven_optimal(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.meal_plan_optimizer._settings.meal_plan_relative_gap",
+        0.01,
+    )
+
+    result = MealPlanOptimizer(
+        [_BOILED_EGG, _RICE], _OBJECTIVE, _DAILY_CONSTRAINTS, [], days=2
+    ).solve()
+
+    optimal_result = cast(OptimalMealPlanResult, result)
+    assert optimal_result["is_proven_optimal"] is False
+
+
+def test_solve_with_food_names_that_look_like_variable_names() -> None:
+    result = MealPlanOptimizer(
+        [
+            _BOILED_EGG,
+            replace(_RICE, name="boiled_egg_selected"),
+            replace(_RICE, name="boiled egg"),
+        ],
+        _OBJECTIVE,
+        _DAILY_CONSTRAINTS,
+        [],
+        days=2,
+        max_food_occurrences=1,
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalMealPlanResult, result)
+    assert [
+        list(daily_plan["food_intake_grams"])
+        for daily_plan in optimal_result["daily_plans"]
+    ] == [["boiled_egg", "boiled_egg_selected", "boiled egg"]] * 2
@@ -1,15 +1,24 @@
+from dataclasses import replace
 from typing import cast
 
 import pytest
+from pulp import LpAffineExpression, LpSolutionIntegerFeasible, getSolver
+from pytest_mock import MockerFixture
 
 from diet.nutrition_optimizer.models import (
     Constraint,
     FailedNutritionOptimizerResult,
     FoodInformation,
+    NutritionOptimizerResult,
     Objective,
     OptimalNutritionOptimizerResult,
+    SolveMode,
+)
+from diet.nutrition_optimizer.optimizer import (
+    NutritionOptimizer,
+    check_solver_available,
+    create_solver,
 )
-from diet.nutrition_optimizer.optimizer import NutritionOptimizer
 
 _FOOD_INFORMATION = [
     FoodInformation(
@@ -50,6 +59,14 @@ _INFEASIBLE_CONSTRAINTS = [
 ]
 
 
+def _without_solve_metrics(
+    result: NutritionOptimizerResult,
+) -> dict[str, object]:
+    return {
+        key: value for key, value in result.items() if key != "solve_metrics"
+    }
+
+
 def test_solve() -> None:
     optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
     result = optimizer.solve()
@@ -57,6 +74,7 @@ def test_solve() -> None:
     assert result["status"] == "Optimal"
     optimal_result = cast(OptimalNutritionOptimizerResult, result)
 
+    assert optimal_result["is_proven_optimal"] is True
     assert optimal_result["food_intake_grams"]["boiled_egg"] == 149
     assert isinstance(optimal_result["food_intake_grams"]["boiled_egg"], int)
     assert optimal_result["total_nutrient_values"]["energy"] == 199.7
@@ -67,6 +85,31 @@ def test_solve() -> None:
     }
 
 
+def test_solve_reports_phase_timings_and_model_size() -> None:
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    result = optimizer.solve()
+
+    solve_metrics = result["solve_metrics"]
+    assert list(solve_metrics["phase_seconds"]) == [
+        "variable_setup",
+        "objective_setup",
+        "constraint_setup",
+        "solve",
+        "result_extraction",
+    ]
+    assert all(
+        seconds >= 0 for seconds in solve_metrics["phase_seconds"].values()
+    )
+    assert solve_metrics["model_size"] == {
+        "variables": 1,
+        "constraints": 3,
+        "nonzeros": 3,
+        "presolve_fixed_foods": 0,
+        "presolve_zero_nutrient_foods": 0,
+    }
+
+
 def test_infeasible() -> None:
     optimizer = NutritionOptimizer(
         _FOOD_INFORMATION, _OBJECTIVE, _INFEASIBLE_CONSTRAINTS
@@ -79,6 +122,73 @@ def test_infeasible() -> None:
     assert failed_result["error_code"] == "optimization_infeasible"
 
 
+def test_infeasible_result_reports_cheapest_violations() -> None:
+    optimizer = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _INFEASIBLE_CONSTRAINTS
+    )
+
+    failed_result = cast(FailedNutritionOptimizerResult, optimizer.solve())
+
+    assert failed_result["infeasibility_diagnosis"] == {
+        "constraint_violations": [
+            {
+                "min_max": "max",
+                "nutrient": "energy",
+                "unit": "energy",
+                "value": 1,
+                "violation": 0.3,
+            }
+        ],
+        "food_bound_violations": [
+            {
+                "food_name": "boiled_egg",
+                "bound": "minimum",
+                "value": 50,
+                "violation": 49,
+            }
+        ],
+    }
+
+
+def test_infeasibility_diagnosis_keeps_model_resolvable() -> None:
+    constraints = [
+        Constraint(min_max="min", nutrient="protein", unit="amount", value=50)
+    ]
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, constraints)
+
+    failed_result = cast(FailedNutritionOptimizerResult, optimizer.solve())
+    diagnosis = failed_result["infeasibility_diagnosis"]
+    assert [
+        item["violation"] for item in diagnosis["constraint_violations"]
+    ] == [31.2]
+    assert diagnosis["food_bound_violations"] == []
+
+    result = optimizer.resolve(
+        _FOOD_INFORMATION, [replace(constraints[0], value=10)]
+    )
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["food_intake_grams"]["boiled_egg"] == 150
+
+
+def test_infeasibility_diagnosis_can_be_disabled(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.diagnose_infeasibility",
+        False,
+    )
+    optimizer = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _INFEASIBLE_CONSTRAINTS
+    )
+
+    result = optimizer.solve()
+
+    assert _without_solve_metrics(result) == {
+        "status": "Infeasible",
+        "error_code": "optimization_infeasible",
+    }
+
+
 def test_duplicate_food_names_are_rejected() -> None:
     duplicate_food_information = [
         _FOOD_INFORMATION[0],
@@ -179,6 +289,7 @@ def test_pfc_ratio_constraint_rejects_zero_pfc_energy() -> None:
     ).solve()
 
     assert result["status"] == "Infeasible"
+    assert "infeasibility_diagnosis" not in result
 
 
 def test_solve_with_multiple_foods_calculates_totals_by_food_name() -> None:
@@ -267,3 +378,750 @@ def test_unused_optional_food_defaults_to_zero_intake_grams() -> None:
     assert optimal_result["food_intake_grams"] == {
         "optional_zero_nutrient_food": 0
     }
+
+
+def test_unsolved_food_defaults_to_whole_minimum_intake_units() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=30,
+            maximum_intake_grams=300,
+            grams_per_unit=50,
+        )
+    ]
+
+    optimizer = NutritionOptimizer(food_information, _OBJECTIVE, [])
+    optimizer._preparation()
+
+    assert optimizer._read_food_intake_grams() == (50,)
+
+
+def test_objective_variables_are_built_from_per_gram_coefficients() -> None:
+    food_information = [
+        _FOOD_INFORMATION[0],
+        FoodInformation(
+            name="rice",
+            energy=156,
+            protein=2.6,
+            fat=0.4,
+            carbohydrates=37.2,
+            minimum_intake_grams=0,
+            maximum_intake_grams=300,
+        ),
+    ]
+    optimizer = NutritionOptimizer(food_information, _OBJECTIVE, [])
+
+    optimizer._preparation()
+
+    energy_expression = cast(
+        LpAffineExpression, optimizer._get_objective_variable("energy")
+    )
+    assert {
+        variable.name: coefficient
+        for variable, coefficient in energy_expression.items()
+    } == {"boiled_egg": 1.34, "rice": 1.56}
+
+
+def test_solve_reports_time_limited_incumbent(mocker: MockerFixture) -> None:
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    original_solve = optimizer._problem.solve
+
+    def solve_with_time_limit(*args: object) -> int:
+        status = original_solve(*args)
+        optimizer._problem.sol_status = LpSolutionIntegerFeasible
+        return status
+
+    mocker.patch.object(
+        optimizer._problem, "solve", side_effect=solve_with_time_limit
+    )
+
+    result = optimizer.solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["is_proven_optimal"] is False
+
+
+def test_solve_passes_configured_limits_to_solver(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.multiple(
+        "diet.nutrition_optimizer.optimizer._settings",
+        solver_name="PULP_CBC_CMD",
+        solver_time_limit_seconds=5,
+        solver_relative_gap=0.01,
+        solver_threads=None,
+    )
+
+    solver = create_solver()
+
+    assert solver.timeLimit == 5
+    assert solver.msg is False
+    assert solver.optionsDict["gapRel"] == 0.01
+    assert "threads" not in solver.optionsDict
+
+
+def test_solve_uses_explicit_solver_name(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.solver_name",
+        "GLPK_CMD",
+    )
+    get_solver = mocker.patch(
+        "diet.nutrition_optimizer.optimizer.getSolver", wraps=getSolver
+    )
+
+    result = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, solver_name="PULP_CBC_CMD"
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    assert {call.args[0] for call in get_solver.call_args_list} == {
+        "PULP_CBC_CMD"
+    }
+
+
+def test_unavailable_solver_is_rejected(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.solver_name",
+        "GLPK_CMD",
+    )
+    mocker.patch("pulp.GLPK_CMD.available", return_value=False)
+
+    with pytest.raises(RuntimeError, match="Solver is not available"):
+        NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, []).solve()
+
+
+def test_check_solver_available_rejects_unavailable_solver(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("pulp.GLPK_CMD.available", return_value=False)
+
+    check_solver_available("PULP_CBC_CMD")
+    with pytest.raises(RuntimeError, match="Solver is not available"):
+        check_solver_available("GLPK_CMD")
+
+
+def test_fast_mode_rounds_relaxed_solution() -> None:
+    result = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, solve_mode="fast"
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["solution_method"] == "lp_rounding"
+    assert optimal_result["is_proven_optimal"] is False
+    assert optimal_result["food_intake_grams"]["boiled_egg"] == 149
+
+
+def test_fast_mode_reports_infeasible_relaxation() -> None:
+    result = NutritionOptimizer(
+        _FOOD_INFORMATION,
+        _OBJECTIVE,
+        _INFEASIBLE_CONSTRAINTS,
+        solve_mode="fast",
+    ).solve()
+
+    assert result["status"] == "Infeasible"
+
+
+def test_fast_mode_falls_back_to_mip_when_repair_fails(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        NutritionOptimizer, "_repair_relaxed_solution", return_value=False
+    )
+
+    result = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, solve_mode="fast"
+    ).solve()
+
+    assert result["status"] == "Optimal"
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["solution_method"] == "mip"
+    assert optimal_result["is_proven_optimal"] is True
+    assert optimal_result["food_intake_grams"]["boiled_egg"] == 149
+
+
+def test_resolve_matches_cold_solve_after_constraint_and_bound_changes() -> (
+    None
+):
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    optimizer.solve()
+    food_information = [replace(_FOOD_INFORMATION[0], minimum_intake_grams=20)]
+    constraints = [replace(_CONSTRAINTS[0], value=150), _CONSTRAINTS[1]]
+
+    assert optimizer.can_resolve(food_information, _OBJECTIVE, constraints)
+    result = optimizer.resolve(food_information, constraints)
+
+    assert _without_solve_metrics(result) == _without_solve_metrics(
+        NutritionOptimizer(food_information, _OBJECTIVE, constraints).solve()
+    )
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["food_intake_grams"]["boiled_egg"] == 111
+
+
+def test_resolve_updates_pfc_ratio_constraint() -> None:
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    optimizer.solve()
+    constraints = [_CONSTRAINTS[0], replace(_CONSTRAINTS[1], value=70)]
+
+    result = optimizer.resolve(_FOOD_INFORMATION, constraints)
+
+    assert result["status"] == "Infeasible"
+
+
+def test_can_resolve_rejects_structural_changes() -> None:
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    assert not optimizer.can_resolve(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS
+    )
+
+    optimizer.solve()
+
+    assert optimizer.can_resolve(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    assert not optimizer.can_resolve(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS[:1]
+    )
+    assert not optimizer.can_resolve(
+        _FOOD_INFORMATION,
+        Objective(sense="minimize", nutrient="energy"),
+        _CONSTRAINTS,
+    )
+    assert not optimizer.can_resolve(
+        [replace(_FOOD_INFORMATION[0], protein=1)], _OBJECTIVE, _CONSTRAINTS
+    )
+    assert not optimizer.can_resolve(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, solve_mode="fast"
+    )
+    assert not optimizer.can_resolve(
+        [replace(_FOOD_INFORMATION[0], grams_per_unit=10)],
+        _OBJECTIVE,
+        _CONSTRAINTS,
+    )
+
+
+@pytest.mark.parametrize("solve_mode", ["exact", "fast"])
+def test_solve_in_whole_portions(solve_mode: SolveMode) -> None:
+    boiled_egg = replace(_FOOD_INFORMATION[0], grams_per_unit=50)
+    optimizer = NutritionOptimizer(
+        [boiled_egg], _OBJECTIVE, _CONSTRAINTS, solve_mode
+    )
+
+    result = cast(
+        OptimalNutritionOptimizerResult,
+        optimizer.solve(include_sensitivity=True),
+    )
+
+    assert result["status"] == "Optimal"
+    assert result["food_intake_grams"] == {"boiled_egg": 100}
+    assert result["total_nutrient_values"]["energy"] == 134.0
+    assert result["sensitivity"]["food_reduced_costs"] == {"boiled_egg": 0.0}
+
+
+def test_minimum_intake_is_rounded_up_to_a_whole_portion() -> None:
+    boiled_egg = replace(
+        _FOOD_INFORMATION[0], minimum_intake_grams=40, grams_per_unit=50
+    )
+    optimizer = NutritionOptimizer(
+        [boiled_egg],
+        _OBJECTIVE,
+        [replace(_INFEASIBLE_CONSTRAINTS[0], value=60)],
+    )
+
+    result = cast(FailedNutritionOptimizerResult, optimizer.solve())
+
+    assert result["status"] == "Infeasible"
+    assert result["infeasibility_diagnosis"] == {
+        "constraint_violations": [
+            {
+                "min_max": "max",
+                "nutrient": "energy",
+                "unit": "energy",
+                "value": 60,
+                "violation": 7.0,
+            }
+        ],
+        "food_bound_violations": [],
+    }
+
+
+def test_sweep_reuses_prepared_model(mocker: MockerFixture) -> None:
+    preparation = mocker.spy(NutritionOptimizer, "_preparation")
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    sweep_points = optimizer.sweep(0, [1, 150, 200])
+
+    assert preparation.call_count == 1
+    assert [point["constraint_value"] for point in sweep_points] == [
+        1,
+        150,
+        200,
+    ]
+    assert [point["objective_value"] for point in sweep_points] == [
+        None,
+        148.7,
+        199.7,
+    ]
+    assert sweep_points[0]["result"]["status"] == "Infeasible"
+    assert _without_solve_metrics(
+        sweep_points[1]["result"]
+    ) == _without_solve_metrics(
+        NutritionOptimizer(
+            _FOOD_INFORMATION,
+            _OBJECTIVE,
+            [replace(_CONSTRAINTS[0], value=150), _CONSTRAINTS[1]],
+        ).solve()
+    )
+
+
+def test_sweep_updates_pfc_ratio_constraint() -> None:
+    optimizer = NutritionOptimizer(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    sweep_points = optimizer.sweep(1, [20, 70])
+
+    assert [point["result"]["status"] for point in sweep_points] == [
+        "Optimal",
+        "Infeasible",
+    ]
+
+
+def test_fixed_foods_are_folded_into_constants() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=100,
+            maximum_intake_grams=100,
+        ),
+        FoodInformation(
+            name="rice",
+            energy=156,
+            protein=2.6,
+            fat=0.4,
+            carbohydrates=37.2,
+            minimum_intake_grams=0,
+            maximum_intake_grams=300,
+        ),
+    ]
+    constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=500),
+        Constraint(min_max="min", nutrient="fat", unit="pfc_ratio", value=20),
+    ]
+    optimizer = NutritionOptimizer(food_information, _OBJECTIVE, constraints)
+
+    result = optimizer.solve()
+
+    assert [variable.name for variable in optimizer._problem.variables()] == [
+        "rice"
+    ]
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["food_intake_grams"] == {
+        "boiled_egg": 100,
+        "rice": 223,
+    }
+    assert optimal_result["total_nutrient_values"]["energy"] == 481.9
+    assert optimal_result["pfc_composition_ratio"]["fat"] == 20.0
+    model_size = result["solve_metrics"]["model_size"]
+    assert model_size["presolve_fixed_foods"] == 1
+    assert model_size["presolve_zero_nutrient_foods"] == 0
+
+
+def test_fully_fixed_problem_is_checked_without_variables() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=100,
+            maximum_intake_grams=100,
+        )
+    ]
+
+    feasible_result = NutritionOptimizer(
+        food_information, _OBJECTIVE, [replace(_CONSTRAINTS[0], value=150)]
+    ).solve()
+    infeasible_result = NutritionOptimizer(
+        food_information, _OBJECTIVE, [replace(_CONSTRAINTS[0], value=100)]
+    ).solve()
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, feasible_result)
+    assert optimal_result["food_intake_grams"] == {"boiled_egg": 100}
+    assert infeasible_result["status"] == "Infeasible"
+
+
+def test_resolve_keeps_fixed_food_constants() -> None:
+    food_information = [
+        *_FOOD_INFORMATION,
+        FoodInformation(
+            name="water",
+            energy=0,
+            protein=0,
+            fat=0,
+            carbohydrates=0,
+            minimum_intake_grams=200,
+            maximum_intake_grams=500,
+        ),
+        replace(
+            _FOOD_INFORMATION[0],
+            name="fixed_egg",
+            minimum_intake_grams=50,
+            maximum_intake_grams=50,
+        ),
+    ]
+    optimizer = NutritionOptimizer(food_information, _OBJECTIVE, _CONSTRAINTS)
+    optimizer.solve()
+    constraints = [replace(_CONSTRAINTS[0], value=150), _CONSTRAINTS[1]]
+
+    result = optimizer.resolve(food_information, constraints)
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["food_intake_grams"] == {
+        "boiled_egg": 61,
+        "water": 200,
+        "fixed_egg": 50,
+    }
+    assert not optimizer.can_resolve(
+        [
+            *food_information[:2],
+            replace(food_information[2], maximum_intake_grams=60),
+        ],
+        _OBJECTIVE,
+        constraints,
+    )
+
+
+@pytest.mark.parametrize("solve_mode", ["exact", "fast"])
+def test_max_food_count_limits_selected_foods(solve_mode: SolveMode) -> None:
+    food_information = [
+        replace(_FOOD_INFORMATION[0], minimum_intake_grams=0),
+        FoodInformation(
+            name="chicken_breast",
+            energy=105,
+            protein=23.3,
+            fat=1.9,
+            carbohydrates=0.1,
+            minimum_intake_grams=0,
+            maximum_intake_grams=150,
+        ),
+        FoodInformation(
+            name="tofu",
+            energy=73,
+            protein=7.0,
+            fat=4.9,
+            carbohydrates=1.5,
+            minimum_intake_grams=0,
+            maximum_intake_grams=150,
+        ),
+    ]
+    objective = Objective(sense="maximize", nutrient="protein")
+    constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=400)
+    ]
+
+    result = NutritionOptimizer(
+        food_information,
+        objective,
+        constraints,
+        solve_mode,
+        max_food_count=1,
+    ).solve()
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["solution_method"] == "mip"
+    assert optimal_result["food_intake_grams"] == {
+        "boiled_egg": 0,
+        "chicken_breast": 150,
+        "tofu": 0,
+    }
+
+
+def test_max_food_count_counts_fixed_foods() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=100,
+            maximum_intake_grams=100,
+        ),
+        replace(
+            _FOOD_INFORMATION[0], name="egg_white", minimum_intake_grams=0
+        ),
+    ]
+
+    result = NutritionOptimizer(
+        food_information,
+        _OBJECTIVE,
+        [replace(_CONSTRAINTS[0], value=1000)],
+        max_food_count=1,
+    ).solve()
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["food_intake_grams"] == {
+        "boiled_egg": 100,
+        "egg_white": 0,
+    }
+
+
+def test_max_food_count_below_required_foods_reports_food_count() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            name=f"food_{food_index}",
+            minimum_intake_grams=10,
+            maximum_intake_grams=100,
+        )
+        for food_index in range(4)
+    ]
+
+    result = NutritionOptimizer(
+        food_information, _OBJECTIVE, [], max_food_count=2
+    ).solve()
+
+    failed_result = cast(FailedNutritionOptimizerResult, result)
+    assert failed_result["status"] == "Infeasible"
+    assert failed_result["infeasibility_diagnosis"] == {
+        "constraint_violations": [],
+        "food_bound_violations": [],
+        "food_count_violation": {"value": 2, "violation": 2},
+    }
+
+
+@pytest.mark.parametrize(
+    ("relative_gap", "is_proven_optimal"), [(0.01, False), (0, True)]
+)
+def test_max_food_count_is_proven_optimal_only_without_gap(
+    mocker: MockerFixture, relative_gap: float, is_proven_optimal: bool
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.food_count_relative_gap",
+        relative_gap,
+    )
+    food_information = [
+        replace(_FOOD_INFORMATION[0], minimum_intake_grams=0),
+        replace(
+            _FOOD_INFORMATION[0], name="egg_white", minimum_intake_grams=0
+        ),
+    ]
+
+    result = NutritionOptimizer(
+        food_information, _OBJECTIVE, _CONSTRAINTS, max_food_count=1
+    ).solve()
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    assert optimal_result["is_proven_optimal"] is is_proven_optimal
+
+
+def test_solve_food_intake_units_includes_fixed_foods() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=100,
+            maximum_intake_grams=100,
+        ),
+        replace(
+            _FOOD_INFORMATION[0], name="egg_white", minimum_intake_grams=0
+        ),
+    ]
+
+    food_intake_units = NutritionOptimizer(
+        food_information, _OBJECTIVE, [replace(_CONSTRAINTS[0], value=300)]
+    ).solve_food_intake_units(mip=False)
+
+    assert food_intake_units == {
+        "boiled_egg": 100,
+        "egg_white": pytest.approx((300 - 134) / 1.34),
+    }
+
+
+def test_invalid_max_food_count_is_rejected() -> None:
+    with pytest.raises(
+        ValueError, match="Maximum food count must be at least 1"
+    ):
+        NutritionOptimizer(
+            _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, max_food_count=0
+        )
+
+
+@pytest.mark.parametrize(
+    ("solver_name", "warm_start"), [("PULP_CBC_CMD", True), ("HiGHS", None)]
+)
+def test_create_solver_enables_warm_start_for_supported_solvers(
+    mocker: MockerFixture, solver_name: str, warm_start: bool | None
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.solver_name",
+        solver_name,
+    )
+
+    solver = create_solver(warm_start=True)
+
+    assert solver.optionsDict.get("warmStart") is warm_start
+
+
+def test_solve_reports_sensitivity_from_relaxation() -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=0,
+            maximum_intake_grams=400,
+        ),
+        FoodInformation(
+            name="rice",
+            energy=156,
+            protein=2.6,
+            fat=0.4,
+            carbohydrates=37.2,
+            minimum_intake_grams=0,
+            maximum_intake_grams=300,
+        ),
+    ]
+    constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=500),
+        Constraint(min_max="max", nutrient="fat", unit="pfc_ratio", value=30),
+        Constraint(
+            min_max="min", nutrient="carbohydrates", unit="amount", value=10
+        ),
+    ]
+
+    result = NutritionOptimizer(
+        food_information,
+        Objective(sense="maximize", nutrient="protein"),
+        constraints,
+    ).solve(include_sensitivity=True)
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    sensitivity = optimal_result["sensitivity"]
+    energy, fat_ratio, carbohydrates = sensitivity["constraints"]
+    assert (energy["slack"], energy["shadow_price"]) == (0.6, 0.0501)
+    assert (fat_ratio["slack"], fat_ratio["shadow_price"]) == (0.1, 0.6111)
+    assert carbohydrates["shadow_price"] == 0
+    assert carbohydrates["slack"] > 0
+    assert sensitivity["food_reduced_costs"] == {"boiled_egg": 0, "rice": 0}
+    plain_result = cast(
+        OptimalNutritionOptimizerResult,
+        NutritionOptimizer(
+            food_information,
+            Objective(sense="maximize", nutrient="protein"),
+            constraints,
+        ).solve(),
+    )
+    assert (
+        optimal_result["food_intake_grams"]
+        == plain_result["food_intake_grams"]
+    )
+
+
+def test_sensitivity_signs_follow_objective_direction() -> None:
+    constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=500),
+        Constraint(min_max="min", nutrient="protein", unit="amount", value=10),
+    ]
+
+    result = NutritionOptimizer(
+        [replace(_FOOD_INFORMATION[0], minimum_intake_grams=0)],
+        Objective(sense="minimize", nutrient="fat"),
+        constraints,
+    ).solve(include_sensitivity=True)
+
+    optimal_result = cast(OptimalNutritionOptimizerResult, result)
+    energy, protein = optimal_result["sensitivity"]["constraints"]
+    assert energy["shadow_price"] == 0
+    assert protein["shadow_price"] == 0.832
+    assert protein["slack"] == 0
+
+
+@pytest.mark.parametrize(
+    ("objective", "constraints", "expected_sign"),
+    [
+        (
+            Objective(sense="maximize", nutrient="protein"),
+            [
+                Constraint(
+                    min_max="max", nutrient="energy", unit="energy", value=500
+                ),
+            ],
+            1,
+        ),
+        (
+            Objective(sense="maximize", nutrient="protein"),
+            [
+                Constraint(
+                    min_max="min",
+                    nutrient="carbohydrates",
+                    unit="amount",
+                    value=50,
+                ),
+                Constraint(
+                    min_max="max", nutrient="energy", unit="energy", value=500
+                ),
+            ],
+            -1,
+        ),
+        (
+            Objective(sense="minimize", nutrient="energy"),
+            [
+                Constraint(
+                    min_max="min", nutrient="protein", unit="amount", value=20
+                ),
+            ],
+            1,
+        ),
+        (
+            Objective(sense="minimize", nutrient="carbohydrates"),
+            [
+                Constraint(
+                    min_max="max", nutrient="fat", unit="amount", value=15
+                ),
+                Constraint(
+                    min_max="min", nutrient="protein", unit="amount", value=20
+                ),
+            ],
+            -1,
+        ),
+    ],
+)
+def test_shadow_price_is_objective_change_per_unit_of_constraint_value(
+    objective: Objective, constraints: list[Constraint], expected_sign: int
+) -> None:
+    food_information = [
+        replace(
+            _FOOD_INFORMATION[0],
+            minimum_intake_grams=0,
+            maximum_intake_grams=400,
+        ),
+        FoodInformation(
+            name="rice",
+            energy=156,
+            protein=2.6,
+            fat=0.4,
+            carbohydrates=37.2,
+            minimum_intake_grams=0,
+            maximum_intake_grams=300,
+        ),
+    ]
+    raised_constraints = [
+        replace(constraints[0], value=constraints[0].value + 10),
+        *constraints[1:],
+    ]
+
+    result, raised_result = (
+        cast(
+            OptimalNutritionOptimizerResult,
+            NutritionOptimizer(
+                food_information, objective, solve_constraints
+            ).solve(include_sensitivity=True),
+        )
+        for solve_constraints in (constraints, raised_constraints)
+    )
+
+    shadow_price = result["sensitivity"]["constraints"][0]["shadow_price"]
+    objective_change = (
+        raised_result["total_nutrient_values"][objective.nutrient]
+        - result["total_nutrient_values"][objective.nutrient]
+    )
+    assert shadow_price * expected_sign > 0
+    assert objective_change * expected_sign > 0
+
+
+def test_solve_omits_sensitivity_by_default() -> None:
+    result = NutritionOptimizer(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS
+    ).solve()
+
+    assert "sensitivity" not in result
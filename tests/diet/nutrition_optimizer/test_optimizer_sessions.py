@@ -0,0 +1,114 @@
+from dataclasses import replace
+
+from pytest_mock import MockerFixture
+
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    Objective,
+)
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.nutrition_optimizer.optimizer_sessions import OptimizerSessionStore
+
+_FOOD_INFORMATION = [
+    FoodInformation(
+        name="boiled_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=0,
+        maximum_intake_grams=150,
+    ),
+]
+_OBJECTIVE = Objective(sense="maximize", nutrient="protein")
+_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=150),
+]
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_solve_reuses_session_model_for_value_changes(
+    mocker: MockerFixture,
+) -> None:
+    store = OptimizerSessionStore(max_size=2, ttl_seconds=60)
+    solve_spy = mocker.spy(NutritionOptimizer, "solve")
+    resolve_spy = mocker.spy(NutritionOptimizer, "resolve")
+
+    store.solve("session", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    result = store.solve(
+        "session",
+        _FOOD_INFORMATION,
+        _OBJECTIVE,
+        [replace(_CONSTRAINTS[0], value=100)],
+    )
+
+    assert (solve_spy.call_count, resolve_spy.call_count) == (1, 1)
+    assert result["status"] == "Optimal"
+    cold_result = NutritionOptimizer(
+        _FOOD_INFORMATION,
+        _OBJECTIVE,
+        [replace(_CONSTRAINTS[0], value=100)],
+    ).solve()
+    assert "objective_setup" not in result["solve_metrics"]["phase_seconds"]
+    result.pop("solve_metrics")
+    cold_result.pop("solve_metrics")
+    assert result == cold_result
+
+
+def test_solve_rebuilds_model_for_structural_changes(
+    mocker: MockerFixture,
+) -> None:
+    store = OptimizerSessionStore(max_size=2, ttl_seconds=60)
+    resolve_spy = mocker.spy(NutritionOptimizer, "resolve")
+
+    store.solve("session", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    store.solve("session", _FOOD_INFORMATION, _OBJECTIVE, [])
+
+    resolve_spy.assert_not_called()
+    assert len(store) == 1
+
+
+def test_solve_does_not_share_models_between_sessions(
+    mocker: MockerFixture,
+) -> None:
+    store = OptimizerSessionStore(max_size=2, ttl_seconds=60)
+    resolve_spy = mocker.spy(NutritionOptimizer, "resolve")
+
+    store.solve("first", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    store.solve("second", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    resolve_spy.assert_not_called()
+    assert len(store) == 2
+
+
+def test_expired_and_evicted_sessions_are_rebuilt(
+    mocker: MockerFixture,
+) -> None:
+    clock = _FakeClock()
+    store = OptimizerSessionStore(max_size=1, ttl_seconds=10, clock=clock)
+    resolve_spy = mocker.spy(NutritionOptimizer, "resolve")
+
+    store.solve("first", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    clock.now = 10
+    store.solve("first", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    store.solve("second", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+    store.solve("first", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    resolve_spy.assert_not_called()
+    assert len(store) == 1
+
+
+def test_zero_sized_store_keeps_no_sessions() -> None:
+    store = OptimizerSessionStore(max_size=0, ttl_seconds=60)
+
+    store.solve("session", _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS)
+
+    assert len(store) == 0
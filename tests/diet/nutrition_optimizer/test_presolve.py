@@ -0,0 +1,89 @@
+from diet.nutrition_optimizer.models import FoodInformation
+from diet.nutrition_optimizer.presolve import presolve_foods
+
+_BOILED_EGG = FoodInformation(
+    name="boiled_egg",
+    energy=134,
+    protein=12.5,
+    fat=10.4,
+    carbohydrates=0.3,
+    minimum_intake_grams=0,
+    maximum_intake_grams=150,
+)
+
+
+def test_presolve_keeps_foods_with_an_intake_range() -> None:
+    presolved_foods = presolve_foods([_BOILED_EGG])
+
+    assert presolved_foods.variable_foods == [_BOILED_EGG]
+    assert presolved_foods.fixed_food_intake_grams == {}
+    assert presolved_foods.fixed_bound_food_count == 0
+    assert presolved_foods.zero_nutrient_food_count == 0
+
+
+def test_presolve_fixes_foods_with_equal_intake_bounds() -> None:
+    fixed_egg = FoodInformation(
+        name="fixed_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=50,
+        maximum_intake_grams=50,
+    )
+    excluded_egg = FoodInformation(
+        name="excluded_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=0,
+        maximum_intake_grams=0,
+    )
+
+    presolved_foods = presolve_foods([fixed_egg, _BOILED_EGG, excluded_egg])
+
+    assert presolved_foods.variable_foods == [_BOILED_EGG]
+    assert presolved_foods.fixed_food_intake_grams == {
+        "fixed_egg": 50,
+        "excluded_egg": 0,
+    }
+    assert presolved_foods.fixed_bound_food_count == 2
+    assert presolved_foods.zero_nutrient_food_count == 0
+
+
+def test_presolve_fixes_foods_without_nutrients_at_minimum() -> None:
+    water = FoodInformation(
+        name="water",
+        energy=0,
+        protein=0,
+        fat=0,
+        carbohydrates=0,
+        minimum_intake_grams=100,
+        maximum_intake_grams=500,
+    )
+
+    presolved_foods = presolve_foods([water, _BOILED_EGG])
+
+    assert presolved_foods.variable_foods == [_BOILED_EGG]
+    assert presolved_foods.fixed_food_intake_grams == {"water": 100}
+    assert presolved_foods.fixed_bound_food_count == 0
+    assert presolved_foods.zero_nutrient_food_count == 1
+
+
+def test_presolve_fixes_foods_with_a_single_portion() -> None:
+    single_egg = FoodInformation(
+        name="single_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=30,
+        maximum_intake_grams=90,
+        grams_per_unit=50,
+    )
+
+    presolved_foods = presolve_foods([single_egg, _BOILED_EGG])
+
+    assert presolved_foods.variable_foods == [_BOILED_EGG]
+    assert presolved_foods.fixed_food_intake_grams == {"single_egg": 50}
@@ -0,0 +1,99 @@
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+)
+from diet.nutrition_optimizer.result_cache import (
+    ResultCache,
+    create_problem_fingerprint,
+)
+
+_INFEASIBLE_RESULT: NutritionOptimizerResult = {
+    "status": "Infeasible",
+    "error_code": "optimization_infeasible",
+}
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _food(name: str, energy: float = 100) -> FoodInformation:
+    return FoodInformation(
+        name=name,
+        energy=energy,
+        protein=10,
+        fat=5,
+        carbohydrates=1,
+        minimum_intake_grams=0,
+        maximum_intake_grams=100,
+    )
+
+
+def test_problem_fingerprint_ignores_food_order() -> None:
+    objective = Objective(sense="maximize", nutrient="protein")
+    constraints = [
+        Constraint(min_max="max", nutrient="energy", unit="energy", value=1)
+    ]
+
+    assert create_problem_fingerprint(
+        [_food("egg"), _food("rice")], objective, constraints
+    ) == create_problem_fingerprint(
+        [_food("rice"), _food("egg")], objective, constraints
+    )
+
+
+def test_problem_fingerprint_distinguishes_food_values() -> None:
+    objective = Objective(sense="maximize", nutrient="protein")
+
+    assert create_problem_fingerprint(
+        [_food("egg", energy=100)], objective, []
+    ) != create_problem_fingerprint([_food("egg", energy=101)], objective, [])
+
+
+def test_get_counts_hits_and_misses() -> None:
+    cache = ResultCache(max_size=2, ttl_seconds=60)
+    cache.put("problem", _INFEASIBLE_RESULT)
+
+    assert cache.get("problem") == _INFEASIBLE_RESULT
+    assert cache.get("other_problem") is None
+
+    statistics = cache.statistics()
+    assert (statistics.hits, statistics.misses) == (1, 1)
+
+
+def test_put_evicts_least_recently_used_entry() -> None:
+    cache = ResultCache(max_size=2, ttl_seconds=60)
+    cache.put("first", _INFEASIBLE_RESULT)
+    cache.put("second", _INFEASIBLE_RESULT)
+    cache.get("first")
+
+    cache.put("third", _INFEASIBLE_RESULT)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == _INFEASIBLE_RESULT
+    assert cache.statistics().evictions == 1
+
+
+def test_get_expires_entries_after_ttl() -> None:
+    clock = _FakeClock()
+    cache = ResultCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.put("problem", _INFEASIBLE_RESULT)
+
+    clock.now = 10
+
+    assert cache.get("problem") is None
+    statistics = cache.statistics()
+    assert (statistics.size, statistics.evictions) == (0, 1)
+
+
+def test_zero_max_size_disables_cache() -> None:
+    cache = ResultCache(max_size=0, ttl_seconds=60)
+    cache.put("problem", _INFEASIBLE_RESULT)
+
+    assert cache.get("problem") is None
@@ -1,13 +1,73 @@
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import cast
+
+import pytest
 from pytest_mock import MockerFixture
 
-from diet.nutrition_optimizer.service import optimize
+from diet.nutrition_optimizer.jobs import solve_optimization_problem
+from diet.nutrition_optimizer.models import (
+    CatalogOptimizationProblem,
+    Constraint,
+    FoodInformation,
+    NutritionOptimizerResult,
+    Objective,
+    OptimalNutritionOptimizerResult,
+    OptimizationProblem,
+    SolveMode,
+)
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.nutrition_optimizer.service import (
+    _get_batch_executor,
+    clear_result_cache,
+    clear_solve_metrics,
+    get_result_cache_statistics,
+    get_solve_metrics_statistics,
+    optimize,
+    optimize_catalog,
+    optimize_many,
+)
+
+_BOILED_EGG = FoodInformation(
+    name="boiled_egg",
+    energy=134,
+    protein=12.5,
+    fat=10.4,
+    carbohydrates=0.3,
+    minimum_intake_grams=0,
+    maximum_intake_grams=150,
+)
+_RICE = FoodInformation(
+    name="rice",
+    energy=156,
+    protein=2.6,
+    fat=0.4,
+    carbohydrates=37.2,
+    minimum_intake_grams=0,
+    maximum_intake_grams=300,
+)
+_OBJECTIVE = Objective(sense="maximize", nutrient="protein")
+_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=500),
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_result_cache() -> Generator[None, None, None]:
+    clear_result_cache()
+    clear_solve_metrics()
+    yield
+    clear_result_cache()
+    clear_solve_metrics()
 
 
 def test_optimize(mocker: MockerFixture) -> None:
-    food_information = mocker.sentinel.food_information
-    objective = mocker.sentinel.objective
-    constraints = mocker.sentinel.constraints
-    domain_result = {"status": "Optimal", "food_intake_grams": {"egg": 2}}
+    food_information = [_BOILED_EGG]
+    domain_result = {
+        "status": "Infeasible",
+        "error_code": "optimization_infeasible",
+    }
     mock_optimizer = mocker.Mock()
     mock_optimizer.solve.return_value = domain_result
     mock_optimizer_class = mocker.patch(
@@ -15,10 +75,311 @@ def test_optimize(mocker: MockerFixture) -> None:
         return_value=mock_optimizer,
     )
 
-    result = optimize(food_information, objective, constraints)
+    result = optimize(food_information, _OBJECTIVE, _CONSTRAINTS)
 
     assert result == domain_result
     mock_optimizer_class.assert_called_once_with(
-        food_information, objective, constraints
+        food_information, _OBJECTIVE, _CONSTRAINTS, "exact"
+    )
+    mock_optimizer.solve.assert_called_once_with(False)
+
+
+def test_optimize_reuses_cached_result_regardless_of_food_order(
+    mocker: MockerFixture,
+) -> None:
+    spy = mocker.spy(NutritionOptimizer, "solve")
+
+    first_result = optimize([_BOILED_EGG, _RICE], _OBJECTIVE, _CONSTRAINTS)
+    second_result = optimize([_RICE, _BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+
+    assert spy.call_count == 1
+    assert "solve_metrics" not in second_result
+    first_result.pop("solve_metrics")
+    assert second_result == first_result
+    optimal_result = cast(OptimalNutritionOptimizerResult, second_result)
+    assert list(optimal_result["food_intake_grams"]) == ["rice", "boiled_egg"]
+    statistics = get_result_cache_statistics()
+    assert (statistics.hits, statistics.misses, statistics.size) == (1, 1, 1)
+
+
+def test_optimize_does_not_share_mutable_results() -> None:
+    first_result = cast(
+        OptimalNutritionOptimizerResult,
+        optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS),
+    )
+    first_result["food_intake_grams"]["boiled_egg"] = -1
+
+    second_result = cast(
+        OptimalNutritionOptimizerResult,
+        optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS),
+    )
+
+    assert second_result["food_intake_grams"]["boiled_egg"] != -1
+
+
+def test_optimize_solves_again_for_different_constraints(
+    mocker: MockerFixture,
+) -> None:
+    spy = mocker.spy(NutritionOptimizer, "solve")
+
+    optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+    optimize([_BOILED_EGG], _OBJECTIVE, [])
+
+    assert spy.call_count == 2
+
+
+def test_optimize_does_not_cache_time_limited_results(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch.object(
+        NutritionOptimizer, "_is_proven_optimal", return_value=False
+    )
+    spy = mocker.spy(NutritionOptimizer, "solve")
+
+    optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+    optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+
+    assert spy.call_count == 2
+
+
+def test_optimize_many_deduplicates_and_keeps_order(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.service._get_batch_executor",
+        return_value=ThreadPoolExecutor(max_workers=2),
+    )
+    solve = mocker.patch(
+        "diet.nutrition_optimizer.service.solve_optimization_problem",
+        wraps=solve_optimization_problem,
+    )
+    problems = [
+        OptimizationProblem([_BOILED_EGG, _RICE], _OBJECTIVE, _CONSTRAINTS),
+        OptimizationProblem([_BOILED_EGG], _OBJECTIVE, []),
+        OptimizationProblem([_RICE, _BOILED_EGG], _OBJECTIVE, _CONSTRAINTS),
+    ]
+
+    results = [
+        cast(OptimalNutritionOptimizerResult, result)
+        for result in optimize_many(problems)
+    ]
+
+    assert solve.call_count == 2
+    assert list(results[0]["food_intake_grams"]) == ["boiled_egg", "rice"]
+    assert list(results[1]["food_intake_grams"]) == ["boiled_egg"]
+    assert list(results[2]["food_intake_grams"]) == ["rice", "boiled_egg"]
+    first_ratio, _, third_ratio = (
+        result["pfc_composition_ratio"] for result in results
+    )
+    assert first_ratio == third_ratio
+
+
+def test_optimize_many_reuses_one_batch_executor(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch("diet.nutrition_optimizer.service._settings.batch_workers", 3)
+    executor_class = mocker.patch(
+        "diet.nutrition_optimizer.service.ProcessPoolExecutor",
+        side_effect=ThreadPoolExecutor,
+    )
+    _get_batch_executor.cache_clear()
+
+    try:
+        list(
+            optimize_many([OptimizationProblem([_BOILED_EGG], _OBJECTIVE, [])])
+        )
+        list(optimize_many([OptimizationProblem([_RICE], _OBJECTIVE, [])]))
+    finally:
+        _get_batch_executor().shutdown()
+        _get_batch_executor.cache_clear()
+
+    executor_class.assert_called_once_with(max_workers=3)
+
+
+def test_optimize_many_reports_failed_items_in_place(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.service._get_batch_executor",
+        return_value=ThreadPoolExecutor(max_workers=2),
+    )
+
+    def solve(
+        food_information: list[FoodInformation],
+        objective: Objective,
+        constraints: list[Constraint],
+        solve_mode: SolveMode,
+        include_sensitivity: bool,
+    ) -> NutritionOptimizerResult:
+        if food_information == [_RICE]:
+            raise RuntimeError("Solver crashed")
+        return solve_optimization_problem(
+            food_information,
+            objective,
+            constraints,
+            solve_mode,
+            include_sensitivity,
+        )
+
+    mocker.patch(
+        "diet.nutrition_optimizer.service.solve_optimization_problem",
+        side_effect=solve,
+    )
+
+    results = list(
+        optimize_many(
+            [
+                OptimizationProblem([_BOILED_EGG], _OBJECTIVE, []),
+                OptimizationProblem([_RICE], _OBJECTIVE, []),
+                OptimizationProblem([_BOILED_EGG, _RICE], _OBJECTIVE, []),
+            ]
+        )
+    )
+
+    assert [result["status"] for result in results] == [
+        "Optimal",
+        "Error",
+        "Optimal",
+    ]
+    assert results[1] == {
+        "status": "Error",
+        "error_code": "optimization_failed",
+    }
+
+
+def test_optimize_many_replaces_broken_batch_executor(
+    mocker: MockerFixture,
+) -> None:
+    executor_class = mocker.patch(
+        "diet.nutrition_optimizer.service.ProcessPoolExecutor",
+        side_effect=ThreadPoolExecutor,
+    )
+    mocker.patch(
+        "diet.nutrition_optimizer.service.solve_optimization_problem",
+        side_effect=[
+            BrokenProcessPool("A worker process terminated abruptly"),
+            solve_optimization_problem(
+                [_RICE], _OBJECTIVE, [], "exact", False
+            ),
+        ],
+    )
+    _get_batch_executor.cache_clear()
+
+    try:
+        broken_results = list(
+            optimize_many([OptimizationProblem([_BOILED_EGG], _OBJECTIVE, [])])
+        )
+        results = list(
+            optimize_many([OptimizationProblem([_RICE], _OBJECTIVE, [])])
+        )
+    finally:
+        _get_batch_executor().shutdown()
+        _get_batch_executor.cache_clear()
+
+    assert broken_results == [
+        {"status": "Error", "error_code": "optimization_failed"}
+    ]
+    assert [result["status"] for result in results] == ["Optimal"]
+    assert executor_class.call_count == 2
+
+
+def test_optimize_many_uses_result_cache(mocker: MockerFixture) -> None:
+    solve = mocker.patch(
+        "diet.nutrition_optimizer.service.solve_optimization_problem"
+    )
+    expected_result = optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+    expected_result.pop("solve_metrics")
+
+    results = list(
+        optimize_many(
+            [OptimizationProblem([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)]
+        )
+    )
+
+    assert results == [expected_result]
+    solve.assert_not_called()
+
+
+def test_optimize_caches_sensitivity_separately(mocker: MockerFixture) -> None:
+    spy = mocker.spy(NutritionOptimizer, "solve")
+
+    plain_result = optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+    sensitivity_result = optimize(
+        [_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS, include_sensitivity=True
     )
-    mock_optimizer.solve.assert_called_once_with()
+    cached_result = optimize(
+        [_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS, include_sensitivity=True
+    )
+
+    assert spy.call_count == 2
+    assert "sensitivity" not in plain_result
+    assert "sensitivity" in sensitivity_result
+    sensitivity_result.pop("solve_metrics")
+    assert cached_result == sensitivity_result
+
+
+def test_optimize_catalog_returns_selected_foods_and_caches_result(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.food_count_relative_gap",
+        0,
+    )
+    spy = mocker.spy(NutritionOptimizer, "solve")
+    problem = CatalogOptimizationProblem(
+        objective=_OBJECTIVE,
+        constraints=_CONSTRAINTS,
+        maximum_intake_grams=200,
+        max_food_count=2,
+    )
+
+    result = cast(OptimalNutritionOptimizerResult, optimize_catalog(problem))
+    result["food_intake_grams"].clear()
+    cached_result = cast(
+        OptimalNutritionOptimizerResult, optimize_catalog(problem)
+    )
+
+    assert spy.call_count == 1
+    assert 0 < len(cached_result["food_intake_grams"]) <= 2
+    assert all(
+        0 < grams <= 200
+        for grams in cached_result["food_intake_grams"].values()
+    )
+    assert cached_result["total_nutrient_values"]["energy"] <= 500
+
+
+def test_optimize_catalog_caches_results_by_relative_gap(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.food_count_relative_gap",
+        0.01,
+    )
+    spy = mocker.spy(NutritionOptimizer, "solve")
+    problem = CatalogOptimizationProblem(
+        objective=_OBJECTIVE,
+        constraints=_CONSTRAINTS,
+        maximum_intake_grams=200,
+        max_food_count=2,
+    )
+
+    result = cast(OptimalNutritionOptimizerResult, optimize_catalog(problem))
+    optimize_catalog(problem)
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.food_count_relative_gap",
+        0.02,
+    )
+    optimize_catalog(problem)
+
+    assert result["is_proven_optimal"] is False
+    assert spy.call_count == 2
+
+
+def test_optimize_records_solve_metrics_for_fresh_solves_only() -> None:
+    result = optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+    cached_result = optimize([_BOILED_EGG], _OBJECTIVE, _CONSTRAINTS)
+
+    statistics = get_solve_metrics_statistics()
+    assert statistics.solve_count == 1
+    assert "solve_metrics" not in cached_result
+    assert statistics.max_model_size == result["solve_metrics"]["model_size"]
@@ -0,0 +1,137 @@
+from pulp import LpMaximize, LpProblem
+
+from diet.nutrition_optimizer.presolve import PresolvedFoods
+from diet.nutrition_optimizer.solve_metrics import (
+    PhaseTimer,
+    SolveMetricsRecorder,
+    count_model_size,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_phase_timer_accumulates_repeated_phases() -> None:
+    clock = _FakeClock()
+    timer = PhaseTimer(clock)
+
+    with timer.measure("solve"):
+        clock.now += 1.5
+    with timer.measure("result_extraction"):
+        clock.now += 0.25
+    with timer.measure("solve"):
+        clock.now += 0.5
+
+    assert timer.phase_seconds() == {"solve": 2.0, "result_extraction": 0.25}
+
+
+def test_count_model_size() -> None:
+    problem = LpProblem("model_size", LpMaximize)
+    egg = problem.add_variable("egg", lowBound=0)
+    rice = problem.add_variable("rice", lowBound=0)
+    problem += egg + rice
+    problem += egg + 2 * rice <= 10, "energy"
+    problem += egg >= 1, "minimum_egg"
+
+    presolved_foods = PresolvedFoods(
+        variable_foods=[],
+        fixed_food_intake_grams={"water": 100, "fixed_egg": 50},
+        fixed_bound_food_count=1,
+        zero_nutrient_food_count=1,
+    )
+
+    assert count_model_size(problem, presolved_foods) == {
+        "variables": 2,
+        "constraints": 2,
+        "nonzeros": 3,
+        "presolve_fixed_foods": 1,
+        "presolve_zero_nutrient_foods": 1,
+    }
+
+
+def test_recorder_aggregates_solve_metrics() -> None:
+    recorder = SolveMetricsRecorder()
+    recorder.record(
+        {
+            "phase_seconds": {"variable_setup": 0.5, "solve": 2.0},
+            "model_size": {
+                "variables": 10,
+                "constraints": 3,
+                "nonzeros": 30,
+                "presolve_fixed_foods": 2,
+                "presolve_zero_nutrient_foods": 0,
+            },
+        }
+    )
+    recorder.record_result(
+        {
+            "status": "Infeasible",
+            "error_code": "optimization_infeasible",
+            "solve_metrics": {
+                "phase_seconds": {"solve": 1.0},
+                "model_size": {
+                    "variables": 5,
+                    "constraints": 4,
+                    "nonzeros": 20,
+                    "presolve_fixed_foods": 1,
+                    "presolve_zero_nutrient_foods": 3,
+                },
+            },
+        }
+    )
+    recorder.record_result(
+        {"status": "Infeasible", "error_code": "optimization_infeasible"}
+    )
+
+    statistics = recorder.statistics()
+
+    assert statistics.solve_count == 2
+    assert statistics.total_phase_seconds == {
+        "variable_setup": 0.5,
+        "solve": 3.0,
+    }
+    assert statistics.max_phase_seconds == {
+        "variable_setup": 0.5,
+        "solve": 2.0,
+    }
+    assert statistics.max_model_size == {
+        "variables": 10,
+        "constraints": 4,
+        "nonzeros": 30,
+        "presolve_fixed_foods": 2,
+        "presolve_zero_nutrient_foods": 3,
+    }
+
+
+def test_recorder_clear() -> None:
+    recorder = SolveMetricsRecorder()
+    recorder.record(
+        {
+            "phase_seconds": {"solve": 2.0},
+            "model_size": {
+                "variables": 1,
+                "constraints": 1,
+                "nonzeros": 1,
+                "presolve_fixed_foods": 1,
+                "presolve_zero_nutrient_foods": 1,
+            },
+        }
+    )
+
+    recorder.clear()
+
+    statistics = recorder.statistics()
+    assert statistics.solve_count == 0
+    assert statistics.total_phase_seconds == {}
+    assert statistics.max_model_size == {
+        "variables": 0,
+        "constraints": 0,
+        "nonzeros": 0,
+        "presolve_fixed_foods": 0,
+        "presolve_zero_nutrient_foods": 0,
+    }
@@ -0,0 +1,59 @@
+import pytest
+
+from diet.nutrition_optimizer.models import (
+    Constraint,
+    FoodInformation,
+    Objective,
+    SweepProblem,
+)
+
+_FOOD_INFORMATION = [
+    FoodInformation(
+        name="boiled_egg",
+        energy=134,
+        protein=12.5,
+        fat=10.4,
+        carbohydrates=0.3,
+        minimum_intake_grams=0,
+        maximum_intake_grams=150,
+    ),
+]
+_OBJECTIVE = Objective(sense="maximize", nutrient="protein")
+_CONSTRAINTS = [
+    Constraint(min_max="max", nutrient="energy", unit="energy", value=200),
+    Constraint(min_max="min", nutrient="fat", unit="pfc_ratio", value=20),
+]
+
+
+def test_create_constraints_replaces_swept_value() -> None:
+    problem = SweepProblem(
+        _FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, 1, [20, 30]
+    )
+
+    constraints = problem.create_constraints(30)
+
+    assert constraints[0] == _CONSTRAINTS[0]
+    assert constraints[1].value == 30
+    assert problem.constraints[1].value == 20
+
+
+@pytest.mark.parametrize("constraint_index", [-1, 2])
+def test_invalid_constraint_index(constraint_index: int) -> None:
+    with pytest.raises(ValueError, match="Invalid constraint index"):
+        SweepProblem(
+            _FOOD_INFORMATION,
+            _OBJECTIVE,
+            _CONSTRAINTS,
+            constraint_index,
+            [100],
+        )
+
+
+def test_empty_constraint_values() -> None:
+    with pytest.raises(ValueError, match="At least one constraint value"):
+        SweepProblem(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, 0, [])
+
+
+def test_invalid_constraint_value() -> None:
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        SweepProblem(_FOOD_INFORMATION, _OBJECTIVE, _CONSTRAINTS, 1, [120])
@@ -1,10 +1,26 @@
+import gzip
 import json
 import re
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from time import sleep
+from typing import Any
 
+import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 from pytest_mock import MockerFixture
 
+from diet.app import create_app
+from diet.nutrition_optimizer.food_master_asset import (
+    get_food_master_asset,
+    get_food_master_binary_asset,
+)
+from diet.nutrition_optimizer.jobs import OptimizationJobQueue
+from diet.nutrition_optimizer.optimizer import NutritionOptimizer
+from diet.nutrition_optimizer.service import clear_result_cache
+
 _OPTIMIZE_REQUEST_JSON = {
     "foodSelections": [
         {
@@ -38,6 +54,31 @@ _OPTIMIZE_REQUEST_JSON = {
 }
 
 
+@pytest.fixture
+def job_queue(
+    mocker: MockerFixture,
+) -> Generator[OptimizationJobQueue, None, None]:
+    queue = OptimizationJobQueue(
+        max_workers=1,
+        max_queue_depth=1,
+        result_ttl_seconds=60,
+        executor_factory=ThreadPoolExecutor,
+    )
+    mocker.patch("diet.nutrition_optimizer.service._job_queue", queue)
+    yield queue
+    queue.shutdown()
+
+
+def _wait_for_job(client: FlaskClient, job_id: str) -> Any:
+    for _ in range(500):
+        response = client.get(f"/nutrition_optimizer/jobs/{job_id}")
+        assert response.json is not None
+        if response.json["status"] not in ("queued", "running"):
+            return response.json
+        sleep(0.01)
+    raise AssertionError(f"Job did not finish: {job_id}")
+
+
 def _nutrient_definitions(response_data: bytes) -> dict[str, dict[str, str]]:
     match = re.search(
         rb'<script id="nutrient-definition-data"[^>]*>(.*?)</script>',
@@ -50,6 +91,19 @@ def _nutrient_definitions(response_data: bytes) -> dict[str, dict[str, str]]:
     }
 
 
+def test_app_startup_rejects_unavailable_solver(
+    mocker: MockerFixture,
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.optimizer._settings.solver_name",
+        "GLPK_CMD",
+    )
+    mocker.patch("pulp.GLPK_CMD.available", return_value=False)
+
+    with pytest.raises(RuntimeError, match="Solver is not available"):
+        create_app("testing")
+
+
 def test_index_page(client: FlaskClient) -> None:
     response = client.get("/nutrition_optimizer/")
 
@@ -80,9 +134,19 @@ def test_index_page(client: FlaskClient) -> None:
     assert "該当する食品がありません。".encode() in response.data
     assert b'id="food-catalog-data"' not in response.data
     assert (
-        b'data-food-catalog-url="/nutrition_optimizer/static/data/'
-        b'food_master.min.json"' in response.data
+        b'data-food-search-url="/nutrition_optimizer/foods"' in response.data
+    )
+    assert re.search(
+        rb'data-food-catalog-url="/nutrition_optimizer/'
+        rb'food_master\.[0-9a-f]{16}\.json"',
+        response.data,
+    )
+    assert re.search(
+        rb'data-food-binary-catalog-url="/nutrition_optimizer/'
+        rb'food_master\.[0-9a-f]{16}\.bin"',
+        response.data,
     )
+    assert b'data-food-page-size="50"' in response.data
     assert b'id="nutrient-definition-data"' in response.data
     assert b'"identifier": "ENERC_KCAL"' in response.data
     assert b'"identifier": "PROT-"' in response.data
@@ -129,6 +193,135 @@ def test_food_master_is_served_as_static_json(client: FlaskClient) -> None:
     assert first_food_values["VITK"] == "(0)"
 
 
+def test_foods_returns_one_page_of_search_results(
+    client: FlaskClient,
+) -> None:
+    response = client.get(
+        "/nutrition_optimizer/foods",
+        query_string={"query": "玄穀", "sortBy": "PROT-", "order": "desc"},
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["nutrientIdentifiers"] == [
+        "ENERC_KCAL",
+        "PROT-",
+        "FAT-",
+        "CHOCDF-",
+    ]
+    assert response.json["page"] == 1
+    assert 0 < len(response.json["foods"]) == response.json["totalCount"]
+    assert all("玄穀" in food["name"] for food in response.json["foods"])
+    protein_values = [
+        float(food["values"][1].strip("()")) for food in response.json["foods"]
+    ]
+    assert protein_values == sorted(protein_values, reverse=True)
+
+
+def test_foods_without_query_pages_through_the_catalog(
+    client: FlaskClient,
+) -> None:
+    response = client.get("/nutrition_optimizer/foods?page=2")
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["totalCount"] == 2538
+    assert response.json["totalPages"] == 51
+    assert response.json["page"] == 2
+    assert len(response.json["foods"]) == 50
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        {"sortBy": "VITK"},
+        {"order": "up"},
+        {"page": "0"},
+        {"unknown": "1"},
+    ],
+)
+def test_foods_with_invalid_request_returns_bad_request(
+    client: FlaskClient, query_string: dict[str, str]
+) -> None:
+    response = client.get(
+        "/nutrition_optimizer/foods", query_string=query_string
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}
+
+
+def test_food_master_asset_is_served_gzipped_with_long_lived_caching(
+    client: FlaskClient,
+) -> None:
+    digest = get_food_master_asset().digest
+    url = f"/nutrition_optimizer/food_master.{digest}.json"
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    not_modified_response = client.get(
+        url,
+        headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": f'"{digest}-gzip"',
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.content_encoding == "gzip"
+    assert "Accept-Encoding" in response.vary
+    assert response.headers["ETag"] == f'"{digest}-gzip"'
+    assert response.cache_control.immutable
+    assert response.cache_control.public
+    assert response.cache_control.max_age == 31536000
+    food_master = json.loads(gzip.decompress(response.data))
+    assert len(food_master["foods"]) == 2538
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.data == b""
+
+
+def test_food_master_asset_is_served_uncompressed_without_gzip(
+    client: FlaskClient,
+) -> None:
+    digest = get_food_master_asset().digest
+
+    response = client.get(
+        f"/nutrition_optimizer/food_master.{digest}.json",
+        headers={"Accept-Encoding": "gzip;q=0"},
+    )
+
+    assert response.status_code == 200
+    assert response.content_encoding is None
+    assert response.headers["ETag"] == f'"{digest}"'
+    assert response.is_json
+    assert len(response.get_json()["foods"]) == 2538
+
+
+def test_food_master_binary_asset_is_served_gzipped(
+    client: FlaskClient,
+) -> None:
+    asset = get_food_master_binary_asset()
+
+    response = client.get(
+        f"/nutrition_optimizer/food_master.{asset.digest}.bin",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
+    assert response.content_encoding == "gzip"
+    assert response.cache_control.immutable
+    assert response.headers["ETag"] == f'"{asset.digest}-gzip"'
+    assert gzip.decompress(response.data) == asset.path.read_bytes()
+
+
+def test_food_master_asset_with_stale_digest_returns_not_found(
+    client: FlaskClient,
+) -> None:
+    response = client.get("/nutrition_optimizer/food_master.0123abcd.json")
+
+    assert response.status_code == 404
+
+
 def test_index_page_translates_nutrient_names(client: FlaskClient) -> None:
     response = client.get("/nutrition_optimizer/?lang=en")
 
@@ -150,9 +343,81 @@ def test_optimize(client: FlaskClient) -> None:
     assert response.json is not None
     assert response.json["status"] == "Optimal"
     assert response.json["foodIntakeGrams"]["アマランサス　玄穀"] == 291
+    assert response.json["solutionMethod"] == "mip"
     assert "pfcCompositionRatio" in response.json
 
 
+def test_metrics(client: FlaskClient) -> None:
+    client.post("/nutrition_optimizer/optimize", json=_OPTIMIZE_REQUEST_JSON)
+
+    response = client.get("/nutrition_optimizer/metrics")
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert set(response.json["resultCache"]) == {
+        "hits",
+        "misses",
+        "evictions",
+        "size",
+        "maxSize",
+    }
+    solves = response.json["solves"]
+    assert solves["solveCount"] >= 1
+    assert solves["totalPhaseSeconds"]["solve"] > 0
+    assert solves["maxModelSize"]["variables"] >= 1
+    assert solves["maxModelSize"]["presolveFixedFoods"] >= 0
+    assert solves["maxModelSize"]["presolveZeroNutrientFoods"] >= 0
+
+
+def test_optimize_reuses_session_model_when_a_constraint_changes(
+    client: FlaskClient, mocker: MockerFixture
+) -> None:
+    clear_result_cache()
+    resolve_spy = mocker.spy(NutritionOptimizer, "resolve")
+    updated_request: dict[str, Any] = deepcopy(_OPTIMIZE_REQUEST_JSON)
+    updated_request["constraints"][0]["value"] = 900
+
+    client.post("/nutrition_optimizer/optimize", json=_OPTIMIZE_REQUEST_JSON)
+    response = client.post(
+        "/nutrition_optimizer/optimize", json=updated_request
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["status"] == "Optimal"
+    assert response.json["totalNutrientValues"]["energy"] <= 900
+    resolve_spy.assert_called_once()
+
+
+def test_optimize_with_sensitivity(client: FlaskClient) -> None:
+    response = client.post(
+        "/nutrition_optimizer/optimize",
+        json={**_OPTIMIZE_REQUEST_JSON, "includeSensitivity": True},
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    sensitivity = response.json["sensitivity"]
+    assert [item["nutrient"] for item in sensitivity["constraints"]] == [
+        "energy",
+        "fat",
+    ]
+    assert sensitivity["constraints"][0]["shadowPrice"] > 0
+    assert "アマランサス　玄穀" in sensitivity["foodReducedCosts"]
+
+
+def test_optimize_with_fast_solve_mode(client: FlaskClient) -> None:
+    response = client.post(
+        "/nutrition_optimizer/optimize",
+        json={**_OPTIMIZE_REQUEST_JSON, "solveMode": "fast"},
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["status"] == "Optimal"
+    assert response.json["solutionMethod"] == "lp_rounding"
+
+
 def test_optimize_with_manual_food_input(client: FlaskClient) -> None:
     response = client.post(
         "/nutrition_optimizer/optimize",
@@ -281,3 +546,249 @@ def test_optimize_with_internal_value_error_returns_server_error(
         "status": "Error",
         "errorCode": "unexpected_response",
     }
+
+
+def test_submit_and_poll_job(
+    client: FlaskClient, job_queue: OptimizationJobQueue
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/jobs",
+        json=_OPTIMIZE_REQUEST_JSON,
+    )
+
+    assert response.status_code == 202
+    assert response.json is not None
+    job = _wait_for_job(client, response.json["jobId"])
+    assert job["status"] == "completed"
+    assert job["result"]["status"] == "Optimal"
+    assert job["result"]["foodIntakeGrams"]["アマランサス　玄穀"] == 291
+
+
+def test_submit_job_with_invalid_request_returns_bad_request(
+    client: FlaskClient, job_queue: OptimizationJobQueue
+) -> None:
+    response = client.post("/nutrition_optimizer/jobs", json={})
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}
+
+
+def test_submit_job_when_queue_is_full_returns_service_unavailable(
+    client: FlaskClient, job_queue: OptimizationJobQueue, mocker: MockerFixture
+) -> None:
+    mocker.patch.object(job_queue, "_count_unfinished_jobs", return_value=1)
+
+    response = client.post(
+        "/nutrition_optimizer/jobs",
+        json=_OPTIMIZE_REQUEST_JSON,
+    )
+
+    assert response.status_code == 503
+    assert response.json == {"status": "Error", "errorCode": "job_queue_full"}
+
+
+def test_unknown_job_returns_not_found(
+    client: FlaskClient, job_queue: OptimizationJobQueue
+) -> None:
+    get_response = client.get("/nutrition_optimizer/jobs/unknown")
+    delete_response = client.delete("/nutrition_optimizer/jobs/unknown")
+
+    for response in (get_response, delete_response):
+        assert response.status_code == 404
+        assert response.json == {
+            "status": "Error",
+            "errorCode": "job_not_found",
+        }
+
+
+def test_cancel_finished_job_keeps_its_status(
+    client: FlaskClient, job_queue: OptimizationJobQueue
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/jobs",
+        json=_OPTIMIZE_REQUEST_JSON,
+    )
+    assert response.json is not None
+    job_id = response.json["jobId"]
+    _wait_for_job(client, job_id)
+
+    cancel_response = client.delete(f"/nutrition_optimizer/jobs/{job_id}")
+
+    assert cancel_response.status_code == 200
+    assert cancel_response.json is not None
+    assert cancel_response.json["status"] == "completed"
+
+
+def test_optimize_batch_streams_results_in_order(
+    client: FlaskClient, mocker: MockerFixture
+) -> None:
+    mocker.patch(
+        "diet.nutrition_optimizer.service.ProcessPoolExecutor",
+        ThreadPoolExecutor,
+    )
+    infeasible_request = {
+        **_OPTIMIZE_REQUEST_JSON,
+        "constraints": [
+            {
+                "minMax": "max",
+                "nutrient": "energy",
+                "unit": "energy",
+                "value": 1,
+            }
+        ],
+    }
+
+    response = client.post(
+        "/nutrition_optimizer/optimize_batch",
+        json={
+            "requests": [
+                _OPTIMIZE_REQUEST_JSON,
+                infeasible_request,
+                _OPTIMIZE_REQUEST_JSON,
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    results = [json.loads(line) for line in response.data.splitlines()]
+    assert [result["status"] for result in results] == [
+        "Optimal",
+        "Infeasible",
+        "Optimal",
+    ]
+    assert results[0] == results[2]
+
+
+def test_optimize_batch_with_invalid_request_returns_bad_request(
+    client: FlaskClient,
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/optimize_batch", json={"requests": []}
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}
+
+
+def test_optimize_catalog(client: FlaskClient) -> None:
+    response = client.post(
+        "/nutrition_optimizer/optimize_catalog",
+        json={
+            "objective": {"sense": "maximize", "nutrient": "protein"},
+            "constraints": _OPTIMIZE_REQUEST_JSON["constraints"],
+            "maxFoodCount": 3,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["status"] == "Optimal"
+    assert 0 < len(response.json["foodIntakeGrams"]) <= 3
+    assert response.json["totalNutrientValues"]["energy"] <= 1000
+
+
+def test_optimize_catalog_with_invalid_request_returns_bad_request(
+    client: FlaskClient,
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/optimize_catalog",
+        json=_OPTIMIZE_REQUEST_JSON,
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}
+
+
+def test_sweep(client: FlaskClient) -> None:
+    response = client.post(
+        "/nutrition_optimizer/sweep",
+        json={
+            **_OPTIMIZE_REQUEST_JSON,
+            "constraintIndex": 0,
+            "start": 300,
+            "stop": 1000,
+            "points": 3,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    points = response.json["points"]
+    assert [point["constraintValue"] for point in points] == [300, 650, 1000]
+    assert [point["objectiveValue"] for point in points] == [
+        None,
+        648.3,
+        998.1,
+    ]
+    assert points[0]["result"]["errorCode"] == "optimization_infeasible"
+    assert points[0]["result"]["infeasibilityDiagnosis"] == {
+        "constraintViolations": [],
+        "foodBoundViolations": [
+            {
+                "foodName": "アマランサス　玄穀",
+                "bound": "minimum",
+                "value": 100,
+                "violation": 13,
+            }
+        ],
+        "foodCountViolation": None,
+    }
+    assert points[2]["result"]["foodIntakeGrams"]["アマランサス　玄穀"] == 291
+
+
+def test_sweep_with_invalid_constraint_index_returns_bad_request(
+    client: FlaskClient,
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/sweep",
+        json={
+            **_OPTIMIZE_REQUEST_JSON,
+            "constraintIndex": 2,
+            "start": 300,
+            "stop": 1000,
+            "points": 3,
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}
+
+
+def test_meal_plan(client: FlaskClient) -> None:
+    response = client.post(
+        "/nutrition_optimizer/meal_plan",
+        json={
+            "foodSelections": _OPTIMIZE_REQUEST_JSON["foodSelections"],
+            "objective": _OPTIMIZE_REQUEST_JSON["objective"],
+            "dailyConstraints": _OPTIMIZE_REQUEST_JSON["constraints"],
+            "planConstraints": [
+                {
+                    "minMax": "max",
+                    "nutrient": "energy",
+                    "unit": "energy",
+                    "value": 2500,
+                }
+            ],
+            "days": 3,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json is not None
+    assert response.json["status"] == "Optimal"
+    assert len(response.json["dailyPlans"]) == 3
+    assert response.json["totalNutrientValues"]["energy"] <= 2500
+    assert "foodIntakeGrams" in response.json["dailyPlans"][0]
+
+
+def test_meal_plan_with_invalid_request_returns_bad_request(
+    client: FlaskClient,
+) -> None:
+    response = client.post(
+        "/nutrition_optimizer/meal_plan",
+        json={**_OPTIMIZE_REQUEST_JSON, "days": 3},
+    )
+
+    assert response.status_code == 400
+    assert response.json == {"status": "Error", "errorCode": "invalid_input"}